@@ -0,0 +1,50 @@
+"""Benchmark of the serialization of a large polygon feature, as GeoJSON nested lists against an ArrayGeometry.
+
+Builds one polygon with many vertices from a NumPy array, the way it comes out of a processing pipeline, and times
+what the upsert of the feature costs on the client side: building the geometry value and serializing the request
+body, which is what dominates the upsert of big multipolygons.
+
+Usage:
+    python benchmarks/geospatial_array_geometry.py [number of vertices]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from cognite.client.data_classes.geospatial import Feature
+from cognite.client.utils import _json
+from cognite.experimental.data_classes.geospatial import ArrayGeometry
+
+
+def time_call(call: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(vertices: int) -> None:
+    angles = np.linspace(0, 2 * np.pi, vertices)
+    ring = np.column_stack([10 + np.cos(angles), 60 + np.sin(angles) / 2])
+    ring[-1] = ring[0]
+
+    def geojson_body() -> str:
+        outline = {"type": "Polygon", "coordinates": [ring.tolist()]}
+        return _json.dumps({"items": [Feature(external_id="area", outline=outline).dump(camel_case=True)]})
+
+    def array_geometry_body() -> str:
+        outline = ArrayGeometry("Polygon", ring, offsets=[[0, len(ring)]])
+        return _json.dumps({"items": [Feature(external_id="area", outline=outline).dump(camel_case=True)]})
+
+    for name, call in [("GeoJSON lists", geojson_body), ("ArrayGeometry", array_geometry_body)]:
+        print(f"{name:>14}: {time_call(call) * 1e3:8.1f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
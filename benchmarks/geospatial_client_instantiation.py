@@ -0,0 +1,65 @@
+"""Benchmark of the per-call overhead of the domain-aware methods of ExperimentalGeospatialAPI across instantiations.
+
+Creates many geospatial APIs, as services creating short-lived clients do, and measures at checkpoints the cost of
+calling an inherited method wrapped to send the cognite domain, with the request itself stubbed out. The overhead and
+the depth of wrappers must not depend on the number of instantiations.
+
+Usage:
+    python benchmarks/geospatial_client_instantiation.py [number of instantiations]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from cognite.client import ClientConfig, global_config
+from cognite.client.credentials import Token
+from cognite.experimental import CogniteClient
+from cognite.experimental._api.geospatial import ExperimentalGeospatialAPI
+
+CALLS = 10_000
+
+
+def make_api() -> ExperimentalGeospatialAPI:
+    config = ClientConfig(
+        client_name="benchmark", project="benchmark", credentials=Token("benchmark"), base_url="http://127.0.0.1"
+    )
+    return ExperimentalGeospatialAPI(config, api_version="v1", cognite_client=CogniteClient(config))
+
+
+def wrapper_depth(func: object) -> int:
+    depth = 0
+    while hasattr(func, "__wrapped__"):
+        func = func.__wrapped__
+        depth += 1
+    return depth
+
+
+def time_calls(api: ExperimentalGeospatialAPI) -> float:
+    api._delete_multiple = lambda *args, **kwargs: None
+    api.set_current_cognite_domain("benchmark")
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        api.delete_features("benchmark", external_id="feature")
+    return (time.perf_counter() - start) / CALLS
+
+
+def main(n_instantiations: int) -> None:
+    global_config.disable_pypi_version_check = True
+    checkpoints = sorted({0, n_instantiations // 10, n_instantiations // 2, n_instantiations})
+    created = 0
+    start = time.perf_counter()
+    for checkpoint in checkpoints:
+        while created < checkpoint:
+            make_api()
+            created += 1
+        per_call = time_calls(make_api())
+        print(  # noqa: T201
+            f"after {created:>6} instantiations: {per_call * 1e6:6.2f} us/call, "
+            f"wrapper depth {wrapper_depth(ExperimentalGeospatialAPI.delete_features)}"
+        )
+    print(f"{time.perf_counter() - start:.1f} s in total")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,101 @@
+"""Benchmark of the per-call overhead of compute against a compiled ComputeTemplate.
+
+Runs the same aggregation with a filter value changing on each call, with the HTTP request stubbed out, so that only
+the client-side cost is measured: of the request body alone, then of whole calls including headers, compression and
+loading the result.
+
+Usage:
+    python benchmarks/geospatial_compute_template.py [number of calls]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Callable
+
+from requests import Request, Response
+
+from cognite.client import ClientConfig, global_config
+from cognite.client.credentials import Token
+from cognite.client.utils import _json
+from cognite.experimental import CogniteClient
+from cognite.experimental.data_classes.geospatial import ComputeOrder, ComputeParameter
+
+QUERY: dict[str, Any] = dict(
+    from_feature_type="wells",
+    left_joins=[{"featureType": "fields", "on": {"equals": {"property": "field", "value": {"property": "name"}}}}],
+    group_by=[{"property": "operator"}, {"property": "field"}],
+    order_by=[ComputeOrder({"property": "operator"}, "ASC"), ComputeOrder({"property": "field"}, "DESC")],
+    output={
+        "operator": {"property": "operator"},
+        "field": {"property": "field"},
+        "count": {"count": {"property": "operator"}},
+        "depth": {"avg": {"property": "depth"}},
+    },
+)
+
+
+def area_filter(area: str | ComputeParameter, min_depth: float | ComputeParameter) -> dict[str, Any]:
+    return {
+        "and": [
+            {"stWithin": {"property": "location", "value": {"wkt": area}}},
+            {"range": {"property": "depth", "gte": min_depth}},
+            {"in": {"property": "status", "values": ["ACTIVE", "SUSPENDED"]}},
+        ]
+    }
+
+
+def make_client() -> CogniteClient:
+    config = ClientConfig(
+        client_name="benchmark", project="benchmark", credentials=Token("benchmark"), base_url="http://127.0.0.1"
+    )
+    client = CogniteClient(config)
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = b'{"items": []}'
+    response.request = Request("POST", "http://127.0.0.1/geospatial/compute").prepare()
+    for http_client in (client.geospatial._http_client, client.geospatial._http_client_with_retry):
+        http_client.request = lambda *args, **kwargs: response
+    return client
+
+
+def time_calls(call: Callable[[int], Any], calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        call(i)
+    return (time.perf_counter() - start) / calls
+
+
+def main(calls: int) -> None:
+    global_config.disable_pypi_version_check = True
+    client = make_client()
+    template = client.geospatial.compile_compute(
+        **QUERY, filter=area_filter(ComputeParameter("area"), ComputeParameter("min_depth"))
+    )
+
+    def compute(i: int) -> Any:
+        return client.geospatial.compute(**QUERY, filter=area_filter(f"POLYGON(({i} 0,{i} 1,1 1,{i} 0))", i / 2))
+
+    def compute_template(i: int) -> Any:
+        return template(area=f"POLYGON(({i} 0,{i} 1,1 1,{i} 0))", min_depth=i / 2)
+
+    def build_body(i: int) -> str:
+        return _json.dumps(
+            client.geospatial._compute_body(**QUERY, filter=area_filter(f"POLYGON(({i} 0,{i} 1,1 1,{i} 0))", i / 2))
+        )
+
+    def render_body(i: int) -> str:
+        return template.render(area=f"POLYGON(({i} 0,{i} 1,1 1,{i} 0))", min_depth=i / 2)
+
+    for name, call in [
+        ("build body", build_body),
+        ("render template", render_body),
+        ("compute", compute),
+        ("compiled template", compute_template),
+    ]:
+        print(f"{name:>17}: {time_calls(call, calls) * 1e6:7.2f} us/call")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,89 @@
+"""Benchmark of feature streaming in ExperimentalGeospatialAPI against a local stand-in for the search-streaming endpoint.
+
+Serves a synthetic new-line delimited stream of point features from a local HTTP server and reports how many
+lines per second stream_features and stream_feature_batches deliver for different JSON decoders and read chunk sizes.
+
+Usage:
+    python benchmarks/geospatial_stream_features.py [number of features]
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cognite.client import ClientConfig, global_config
+from cognite.client.credentials import Token
+from cognite.experimental import CogniteClient
+from cognite.experimental._api.geospatial_streaming import default_json_decoder
+
+
+def make_payload(n_features: int) -> bytes:
+    return b"".join(
+        json.dumps(
+            {
+                "externalId": f"feature_{i}",
+                "position": {"wkt": f"POINT({i % 360 - 180} {i % 180 - 90})"},
+                "temperature": i * 0.1,
+                "tag": f"tag_{i % 100}",
+            }
+        ).encode()
+        + b"\n"
+        for i in range(n_features)
+    )
+
+
+def serve(payload: bytes) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            view = memoryview(payload)
+            for start in range(0, len(payload), 1 << 20):
+                self.wfile.write(view[start : start + (1 << 20)])
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(n_features: int) -> None:
+    global_config.disable_pypi_version_check = True
+    server = serve(make_payload(n_features))
+    client = CogniteClient(
+        ClientConfig(
+            client_name="benchmark",
+            project="benchmark",
+            credentials=Token("benchmark"),
+            base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        )
+    )
+
+    decoders = {"json": json.loads, "default": default_json_decoder()}
+    cases = [("json", 512), ("json", 256 * 1024), ("default", 512), ("default", 256 * 1024)]
+    print(f"{n_features} features, default decoder is {decoders['default'].__module__}")  # noqa: T201
+    for method in ("stream_features", "stream_feature_batches"):
+        for decoder, read_chunk_size in cases:
+            start = time.perf_counter()
+            stream = getattr(client.geospatial, method)(
+                "benchmark", filter={}, json_decoder=decoders[decoder], read_chunk_size=read_chunk_size
+            )
+            count = sum(len(item["externalId"]) if isinstance(item, dict) else 1 for item in stream)
+            elapsed = time.perf_counter() - start
+            print(  # noqa: T201
+                f"{method:<22} decoder={decoder:<8} read_chunk_size={read_chunk_size:>7}: "
+                f"{count / elapsed:>10,.0f} lines/sec"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
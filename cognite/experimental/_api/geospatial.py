@@ -1,73 +1,198 @@
 from __future__ import annotations
 
+import copy
 import functools
-import json
+import gzip
+import time
 import types
-from typing import Any, Generator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    BinaryIO,
+    Callable,
+    Collection,
+    Generator,
+    Iterable,
+    Iterator,
+    Sequence,
+)
 
+from requests import Response
 from requests.exceptions import ChunkedEncodingError
+from requests.exceptions import ConnectionError as RequestsConnectionError
 
+from cognite.client import global_config
 from cognite.client._api.geospatial import GeospatialAPI
-from cognite.client.data_classes.geospatial import Feature, FeatureList, FeatureTypeWrite
-from cognite.client.exceptions import CogniteConnectionError
+from cognite.client.data_classes.geospatial import (
+    Feature,
+    FeatureList,
+    FeatureTypePatch,
+    FeatureTypeWrite,
+    _is_geometry_type,
+    _to_feature_property_name,
+)
+from cognite.client.exceptions import CogniteConnectionError, CogniteReadTimeout
 from cognite.client.utils._identifier import IdentifierSequence
+from cognite.client.utils._retry import Backoff
+from cognite.experimental._api.geospatial_cache import ComputeCache, compute_cache_key, referenced_feature_types
+from cognite.experimental._api.geospatial_compute import ComputeTemplate, pack_compute_batch, unpack_compute_batch
+from cognite.experimental._api.geospatial_crs import is_supported, split_ewkt, transform_coordinates, transform_wkts
+from cognite.experimental._api.geospatial_feature_types import FeatureTypeCache
+from cognite.experimental._api.geospatial_files import (
+    default_geometry_property,
+    detect_file_format,
+    read_csv,
+    read_geojson,
+    read_geoparquet,
+    read_ndjson,
+)
+from cognite.experimental._api.geospatial_index import FeatureIndex
+from cognite.experimental._api.geospatial_mirror import FeatureMirror
+from cognite.experimental._api.geospatial_streaming import (
+    DEFAULT_READ_CHUNK_SIZE,
+    FeatureStreamCheckpoint,
+    build_feature_batch,
+    default_json_decoder,
+    iter_ndjson_line_batches,
+    leading_external_id,
+    merge_streams,
+    validate_batch_formats,
+)
+from cognite.experimental._api.geospatial_tasks import TERMINAL_TASK_STATES, GeospatialTaskWaiter
+from cognite.experimental._api.geospatial_tiles import VectorTiler
+from cognite.experimental._api.geospatial_upload import (
+    AdaptiveChunker,
+    call_with_retries,
+    iter_async,
+    iter_chunks,
+    map_bounded,
+)
+from cognite.experimental._api.geospatial_validation import FeatureValidator, feature_validator
 from cognite.experimental.data_classes.geospatial import (
+    ArrayGeometry,
+    ComputedColumns,
     ComputedItemList,
     ComputeOrder,
+    FeaturePartitioning,
     FeatureType,
     FeatureTypeList,
+    FeatureUpsertChunk,
+    FeatureUpsertReport,
     GeospatialTask,
     GeospatialTaskList,
+    LazyFeature,
     MvpMappingsDefinition,
     MvpMappingsDefinitionList,
+    _to_snake_case,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
+
+# The cognite domain of the current thread or asyncio task, set by ExperimentalGeospatialAPI.cognite_domain_scope
+_COGNITE_DOMAIN_SCOPE: ContextVar[str | None] = ContextVar("cognite_domain_scope")
+
+_UNBOUND = object()
+
+
+def _combine_filters(filter: dict[str, Any], partition_filter: dict[str, Any]) -> dict[str, Any]:
+    return {"and": [filter, partition_filter]} if filter and partition_filter else filter or partition_filter
+
 
 def _with_cognite_domain(func):
     @functools.wraps(func)
     def wrapper_with_cognite_domain(self, *args, **kwargs):
-        if self._cognite_domain is not None:
-            self._config.headers.update({self.X_COGNITE_DOMAIN: self._cognite_domain})
-        else:
-            self._config.headers.pop(self.X_COGNITE_DOMAIN, None)
-        res = func(self, *args, **kwargs)
-        return res
+        if self._bound_cognite_domain is not _UNBOUND:
+            return func(self, *args, **kwargs)
+        # Bind the domain of the caller to a copy of the API, so that the requests made on worker threads (which
+        # don't inherit the context of the caller) use it too, without touching the headers shared by all APIs
+        bound = copy.copy(self)
+        bound._bound_cognite_domain = self.get_current_cognite_domain()
+        return func(bound, *args, **kwargs)
 
     return wrapper_with_cognite_domain
 
 
+def _with_cognite_domain_on_inherited_methods(cls):
+    # Wrap the public methods inherited from GeospatialAPI once, when the class is created. The coordinate
+    # reference systems are not scoped by domains.
+    for name, attr in GeospatialAPI.__dict__.items():
+        if (
+            isinstance(attr, types.FunctionType)
+            and not name.startswith("_")
+            and name not in cls.__dict__
+            and "coordinate_reference_systems" not in name
+        ):
+            setattr(cls, name, _with_cognite_domain(attr))
+    return cls
+
+
+@_with_cognite_domain_on_inherited_methods
 class ExperimentalGeospatialAPI(GeospatialAPI):
     X_COGNITE_DOMAIN = "x-cognite-domain"
     _MVT_RESOURCE_PATH = GeospatialAPI._RESOURCE_PATH + "/mvts"
+    _UPSERT_MAX_BYTES = 8 * 1024 * 1024
 
     _cognite_domain = None
+    _bound_cognite_domain: Any = _UNBOUND
+    _compute_cache: ComputeCache | None = None
+    _feature_type_cache: FeatureTypeCache | None = None
 
-    def set_current_cognite_domain(self, cognite_domain: str):
+    def set_current_cognite_domain(self, cognite_domain: str | None):
         self._cognite_domain = cognite_domain
 
-    def get_current_cognite_domain(self):
-        return self._cognite_domain
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # https://stackoverflow.com/questions/6034662/python-method-overriding-does-signature-matter
-        # skip these methods from parent
-        skip_methods = [
-            "create_feature_types",
-            "list_feature_types",
-            "retrieve_feature_types",
-            "coordinate_reference_systems",
-            "stream_features",
-            "compute",
-        ]
-        for attr_name in GeospatialAPI.__dict__:
-            if any([method in attr_name for method in skip_methods]):
-                continue
-            attr = getattr(self, attr_name)
-            if isinstance(attr, types.MethodType):
-                wrapped = _with_cognite_domain(getattr(GeospatialAPI, attr_name))
-                setattr(ExperimentalGeospatialAPI, attr_name, wrapped)
+    def get_current_cognite_domain(self) -> str | None:
+        if self._bound_cognite_domain is not _UNBOUND:
+            return self._bound_cognite_domain
+        return _COGNITE_DOMAIN_SCOPE.get(self._cognite_domain)
+
+    @contextmanager
+    def cognite_domain_scope(self, cognite_domain: str | None) -> Iterator[None]:
+        """Use a cognite domain for the geospatial calls made by the current thread or asyncio task.
+
+        The scope takes precedence over :meth:`set_current_cognite_domain`, and is not seen by other threads, so
+        calls for different domains can run in parallel on the same client.
+
+        Args:
+            cognite_domain (str | None): the domain, or None to not send any domain.
+
+        Examples:
+
+            Count features of two domains in parallel:
+
+                >>> from concurrent.futures import ThreadPoolExecutor
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> def count_wells(domain):
+                ...     with client.geospatial.cognite_domain_scope(domain):
+                ...         return len(client.geospatial.list_features("wells", limit=None))
+                >>> with ThreadPoolExecutor() as executor:
+                ...     counts = list(executor.map(count_wells, ["domain_a", "domain_b"]))
+        """
+        token = _COGNITE_DOMAIN_SCOPE.set(cognite_domain)
+        try:
+            yield
+        finally:
+            _COGNITE_DOMAIN_SCOPE.reset(token)
+
+    def _do_request(
+        self,
+        method: str,
+        url_path: str,
+        accept: str = "application/json",
+        api_subversion: str | None = None,
+        **kwargs: Any,
+    ) -> Response:
+        cognite_domain = self.get_current_cognite_domain()
+        if cognite_domain is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), self.X_COGNITE_DOMAIN: cognite_domain}
+        return super()._do_request(method, url_path, accept=accept, api_subversion=api_subversion, **kwargs)
 
     @_with_cognite_domain
     def create_feature_types(self, feature_type: FeatureType | Sequence[FeatureType]) -> FeatureType | FeatureTypeList:
@@ -97,13 +222,91 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
                 ... ]
                 >>> res = client.geospatial.create_feature_types(feature_types)
         """
-        return self._create_multiple(
+        created = self._create_multiple(
             list_cls=FeatureTypeList,
             resource_cls=FeatureType,
             items=feature_type,
             resource_path=f"{self._RESOURCE_PATH}/featuretypes",
             input_resource_cls=FeatureTypeWrite,
         )
+        created_list = created if isinstance(created, FeatureTypeList) else [created]
+        self._invalidate_cached_feature_types([it.external_id for it in created_list])
+        self._store_cached_feature_types(created_list)
+        return created
+
+    @_with_cognite_domain
+    def delete_feature_types(self, external_id: str | Sequence[str], recursive: bool = False) -> None:
+        """`Delete one or more feature type`
+        <https://developer.cognite.com/api#tag/Geospatial/operation/GeospatialDeleteFeatureTypes>
+
+        Args:
+            external_id (str | Sequence[str]): External ID or list of external ids
+            recursive (bool): if `true` the features will also be dropped
+
+        Examples:
+
+            Delete feature type definitions external id:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> client.geospatial.delete_feature_types(external_id=["wells", "cities"])
+        """
+        try:
+            super().delete_feature_types(external_id, recursive=recursive)
+        finally:
+            self._invalidate_cached_feature_types([external_id] if isinstance(external_id, str) else external_id)
+
+    @_with_cognite_domain
+    def patch_feature_types(self, patch: FeatureTypePatch | Sequence[FeatureTypePatch]) -> FeatureTypeList:
+        """`Patch feature types`
+        <https://developer.cognite.com/api#tag/Geospatial/operation/updateFeatureTypes>
+
+        Args:
+            patch (FeatureTypePatch | Sequence[FeatureTypePatch]): the patch to apply
+
+        Returns:
+            FeatureTypeList: The patched feature types.
+
+        Examples:
+
+            Add one property to a feature type:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> from cognite.client.data_classes.geospatial import FeatureTypePatch, Patches
+                >>> client = CogniteClient()
+                >>> res = client.geospatial.patch_feature_types(
+                ...    patch=FeatureTypePatch(
+                ...       external_id="wells",
+                ...       property_patches=Patches(add={"altitude": {"type": "DOUBLE"}}),
+                ...    )
+                ... )
+        """
+        patches = [patch] if isinstance(patch, FeatureTypePatch) else patch
+        payload = {
+            "items": [
+                {
+                    "externalId": it.external_id,
+                    "update": {"properties": it.property_patches, "searchSpec": it.search_spec_patches},
+                }
+                for it in patches
+            ]
+        }
+        try:
+            res = self._post(url_path=f"{self._RESOURCE_PATH}/featuretypes/update", json=payload)
+        finally:
+            self._invalidate_cached_feature_types([it.external_id for it in patches])
+        patched = FeatureTypeList._load(res.json()["items"], cognite_client=self._cognite_client)
+        self._store_cached_feature_types(patched)
+        return patched
+
+    def _invalidate_cached_feature_types(self, external_ids: Sequence[str]) -> None:
+        # Written feature types are outdated in the cache, and so are the listings of their domain
+        if self._feature_type_cache is not None:
+            self._feature_type_cache.invalidate(external_ids, self.get_current_cognite_domain())
+
+    def _store_cached_feature_types(self, feature_types: Sequence[FeatureType]) -> None:
+        if self._feature_type_cache is not None:
+            self._feature_type_cache.store(self.get_current_cognite_domain(), feature_types)
 
     @_with_cognite_domain
     def list_feature_types(self) -> FeatureTypeList:
@@ -122,13 +325,23 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
                 >>> for feature_type in client.geospatial.list_feature_types():
                 ...     feature_type # do something with the feature type definition
         """
-        return self._list(
+        cache = self._feature_type_cache
+        cognite_domain = self.get_current_cognite_domain()
+        if cache is not None:
+            cached = cache.listing(cognite_domain)
+            if cached is not None:
+                return FeatureTypeList(cached, cognite_client=self._cognite_client)
+        feature_types = self._list(
             list_cls=FeatureTypeList,
             resource_cls=FeatureType,
             method="POST",
             resource_path=f"{self._RESOURCE_PATH}/featuretypes",
         )
+        if cache is None:
+            return feature_types
+        return FeatureTypeList(cache.store_listing(cognite_domain, feature_types), cognite_client=self._cognite_client)
 
+    @_with_cognite_domain
     def retrieve_feature_types(self, external_id: str | list[str]) -> FeatureType | FeatureTypeList:
         """`Retrieve feature types`
         <https://developer.cognite.com/api#tag/Geospatial/operation/getFeatureTypesByIds>
@@ -147,6 +360,22 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
                 >>> client = CogniteClient()
                 >>> res = client.geospatial.retrieve_feature_types(external_id="1")
         """
+        cache = self._feature_type_cache
+        if cache is None:
+            return self._retrieve_feature_types(external_id)
+        cognite_domain = self.get_current_cognite_domain()
+        external_ids = [external_id] if isinstance(external_id, str) else list(external_id)
+        found, to_retrieve = cache.lookup(cognite_domain, external_ids)
+        if to_retrieve:
+            retrieved = self._retrieve_feature_types(to_retrieve)
+            found.update(
+                (feature_type.external_id, feature_type) for feature_type in cache.store(cognite_domain, retrieved)
+            )
+        if isinstance(external_id, str):
+            return found[external_id]
+        return FeatureTypeList([found[it] for it in external_ids], cognite_client=self._cognite_client)
+
+    def _retrieve_feature_types(self, external_id: str | list[str]) -> FeatureType | FeatureTypeList:
         identifiers = IdentifierSequence.load(ids=None, external_ids=external_id)
         return self._retrieve_multiple(
             list_cls=FeatureTypeList,
@@ -155,14 +384,14 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
             resource_path=f"{self._RESOURCE_PATH}/featuretypes",
         )
 
-    @_with_cognite_domain
-    def stream_features(
+    def _stream_feature_lines(
         self,
         feature_type_external_id: str,
         filter: dict[str, Any],
         properties: dict[str, Any] | None = None,
         allow_crs_transformation: bool = False,
-    ) -> Generator[Feature, None, None]:
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
         resource_path = self._feature_resource_path(feature_type_external_id) + "/search-streaming"
         body = {"filter": filter, "output": {"properties": properties, "jsonStreamFormat": "NEW_LINE_DELIMITED"}}
         params = {"allowCrsTransformation": "true"} if allow_crs_transformation else None
@@ -174,15 +403,319 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
             timeout=self._config.timeout,
             stream=True,
             params=params,
-            headers={self.X_COGNITE_DOMAIN: self._cognite_domain},
         )
 
         try:
-            for line in res.iter_lines():
-                yield Feature._load(json.loads(line))
-        except (ChunkedEncodingError, ConnectionError) as e:
+            for lines in iter_ndjson_line_batches(res.iter_content(read_chunk_size)):
+                yield from lines
+        except (ChunkedEncodingError, ConnectionError, RequestsConnectionError) as e:
             raise CogniteConnectionError(e)
 
+    @_with_cognite_domain
+    def stream_features(
+        self,
+        feature_type_external_id: str,
+        filter: dict[str, Any],
+        properties: dict[str, Any] | None = None,
+        allow_crs_transformation: bool = False,
+        partitioning: FeaturePartitioning | None = None,
+        max_workers: int | None = None,
+        max_buffered: int = 10_000,
+        json_decoder: Callable[[bytes], Any] | None = None,
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+        lazy: bool = False,
+        array_geometries: bool = False,
+    ) -> Generator[Feature | LazyFeature, None, None]:
+        """`Stream features`
+        <https://developer.cognite.com/api#tag/Geospatial/operation/searchFeaturesStreaming>
+
+        With a partitioning, one `search-streaming` request is issued per partition, on up to `max_workers`
+        concurrent connections, and the partitions are merged into a single generator. Features of one partition are
+        yielded in the order the server streams them, but partitions are interleaved in no particular order. At most
+        `max_buffered` features are held in memory ahead of the consumer. Deduplicating partitions also hold the
+        external ids of all the yielded features, see :class:`FeaturePartitioning`.
+
+        Args:
+            feature_type_external_id (str): the feature type to search for
+            filter (Dict[str, Any]): the search filter
+            properties (Dict[str, Any]): the output property selection
+            allow_crs_transformation (bool): If true, then input geometries will be transformed into the Coordinate
+                Reference System defined in the feature type specification.
+            partitioning (FeaturePartitioning): optional split of the stream into partitions streamed concurrently
+            max_workers (int): maximum number of concurrent streams, defaults to the client max_workers
+            max_buffered (int): maximum number of features buffered between the streams and the consumer
+            json_decoder (Callable[[bytes], Any]): function decoding one streamed line, defaults to orjson or ujson
+                when installed and to the standard library json module otherwise
+            read_chunk_size (int): number of bytes read from the connection at a time
+            lazy (bool): yield `LazyFeature` objects that keep the raw streamed line and only decode it when a
+                property is accessed, instead of `Feature` objects
+            array_geometries (bool): load the WKT geometries into `ArrayGeometry` objects, holding their coordinates in
+                NumPy arrays. Geometries that `ArrayGeometry` does not support, such as geometry collections or M
+                coordinates, are left as is. Requires numpy, and can't be combined with `lazy`.
+
+        Yields:
+            Feature | LazyFeature: the filtered features
+
+        Examples:
+
+            Read a couple of properties of a wide feature type:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> for f in client.geospatial.stream_features("my_feature_type", filter={}, lazy=True):
+                ...     if f.temperature > 12.0:
+                ...         location = f.geometry("location")
+
+            Stream features over 8 connections:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> from cognite.experimental.data_classes.geospatial import FeaturePartitioning
+                >>> client = CogniteClient()
+                >>> features = client.geospatial.stream_features(
+                ...     feature_type_external_id="my_feature_type",
+                ...     filter={},
+                ...     partitioning=FeaturePartitioning.by_external_id_ranges(["2", "4", "6", "8", "a", "c", "e"]),
+                ...     max_workers=8,
+                ... )
+                >>> for f in features:
+                ...     # do something with the features
+        """
+        decode = json_decoder or default_json_decoder()
+        if lazy and array_geometries:
+            raise ValueError("array_geometries can't be combined with lazy")
+        if lazy:
+            load = functools.partial(LazyFeature, json_decoder=decode, cognite_client=self._cognite_client)
+        elif array_geometries:
+
+            def load(line: bytes) -> Feature:
+                resource = decode(line)
+                for key, value in resource.items():
+                    if isinstance(value, dict) and "wkt" in value:
+                        try:
+                            resource[key] = ArrayGeometry.from_wkt(value["wkt"])
+                        except ValueError:
+                            pass
+                return Feature._load(resource)
+
+        else:
+
+            def load(line: bytes) -> Feature:
+                return Feature._load(decode(line))
+
+        if partitioning is None:
+            for line in self._stream_feature_lines(
+                feature_type_external_id, filter, properties, allow_crs_transformation, read_chunk_size
+            ):
+                yield load(line)
+            return
+
+        def stream_partition(partition_filter: dict[str, Any]) -> Iterator[Feature | LazyFeature]:
+            combined_filter = _combine_filters(filter, partition_filter)
+            for line in self._stream_feature_lines(
+                feature_type_external_id, combined_filter, properties, allow_crs_transformation, read_chunk_size
+            ):
+                yield load(line)
+
+        features = merge_streams(
+            [functools.partial(stream_partition, partition_filter) for partition_filter in partitioning.filters],
+            max_workers=max_workers or self._config.max_workers,
+            max_buffered=max_buffered,
+        )
+        if not partitioning.deduplicate:
+            yield from features
+            return
+        # Grows with the stream: a feature can come from any partition, at any time
+        seen = set()
+        for feature in features:
+            if feature.external_id not in seen:
+                seen.add(feature.external_id)
+                yield feature
+
+    @_with_cognite_domain
+    def stream_features_resumable(
+        self,
+        feature_type_external_id: str,
+        filter: dict[str, Any],
+        properties: dict[str, Any] | None = None,
+        allow_crs_transformation: bool = False,
+        checkpoint_path: str | Path | None = None,
+        max_reconnects: int = 5,
+        json_decoder: Callable[[bytes], Any] | None = None,
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+        partitioning: FeaturePartitioning | None = None,
+    ) -> Generator[Feature, None, None]:
+        """`Stream features, reconnecting when the connection is lost`
+        <https://developer.cognite.com/api#tag/Geospatial/operation/searchFeaturesStreaming>
+
+        Same as `stream_features`, but connection errors do not end the stream. With a partitioning, the partitions
+        are streamed one after the other, and a completed partition is never streamed again. Within the partition
+        being streamed, the external ids of the delivered features are tracked, and on failure its `search-streaming`
+        request is re-issued and features that were already delivered are skipped. Since the streaming order is not
+        deterministic, the server is asked for the whole partition again and the skipping happens client side, by
+        reading the external id at the start of each line without decoding the rest of it.
+
+        Partitions of :meth:`FeaturePartitioning.by_external_id_ranges` bound what is streamed again after a failure,
+        and the memory and checkpoint file used to track the delivered features, to a single partition. Restarting
+        from a checkpoint file requires the same filter and partitioning.
+
+        A feature counts as delivered once the consumer asks for the next one, so a feature being processed when the
+        job crashes is delivered again on resume.
+
+        Args:
+            feature_type_external_id (str): the feature type to search for
+            filter (Dict[str, Any]): the search filter
+            properties (Dict[str, Any]): the output property selection
+            allow_crs_transformation (bool): If true, then input geometries will be transformed into the Coordinate
+                Reference System defined in the feature type specification.
+            checkpoint_path (str | Path): optional file where the completed partitions and the delivered external
+                ids of the current partition are recorded. If the file exists, the partitions and features it lists
+                are not delivered again. Delete the file to start over.
+            max_reconnects (int): maximum number of consecutive reconnects without receiving any new feature
+            json_decoder (Callable[[bytes], Any]): function decoding one streamed line, see `stream_features`
+            read_chunk_size (int): number of bytes read from the connection at a time
+            partitioning (FeaturePartitioning): optional split of the stream into disjoint partitions, streamed and
+                checkpointed one after the other
+
+        Yields:
+            Feature: the filtered features
+
+        Examples:
+
+            Export a feature type in a job that can be restarted:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> features = client.geospatial.stream_features_resumable(
+                ...     feature_type_external_id="my_feature_type",
+                ...     filter={},
+                ...     checkpoint_path="my_feature_type.checkpoint",
+                ...     partitioning=FeaturePartitioning.by_external_id_ranges(["2", "4", "6", "8", "a", "c", "e"]),
+                ... )
+                >>> for f in features:
+                ...     # do something with the features
+        """
+        if partitioning is not None and partitioning.deduplicate:
+            raise ValueError("Resumable streaming requires disjoint partitions, such as by_external_id_ranges")
+        decode = json_decoder or default_json_decoder()
+        checkpoint = FeatureStreamCheckpoint(checkpoint_path)
+        backoff = Backoff(max_wait=30)
+        partition_filters = partitioning.filters if partitioning is not None else [{}]
+        try:
+            for index, partition_filter in enumerate(partition_filters):
+                if index in checkpoint.completed:
+                    continue
+                combined_filter = _combine_filters(filter, partition_filter)
+                reconnects = 0
+                while True:
+                    try:
+                        for line in self._stream_feature_lines(
+                            feature_type_external_id,
+                            combined_filter,
+                            properties,
+                            allow_crs_transformation,
+                            read_chunk_size,
+                        ):
+                            # Delivered features are skipped without decoding them when possible
+                            external_id = leading_external_id(line)
+                            if external_id is not None and external_id in checkpoint:
+                                continue
+                            item = decode(line)
+                            external_id = item.get("externalId")
+                            if external_id is None:
+                                raise ValueError("Resumable streaming requires the externalId of each streamed feature")
+                            if external_id in checkpoint:
+                                continue
+                            yield Feature._load(item)
+                            checkpoint.add(external_id)
+                            reconnects = 0
+                            backoff.reset()
+                        checkpoint.complete(index)
+                        break
+                    except (CogniteConnectionError, CogniteReadTimeout):
+                        if reconnects >= max_reconnects:
+                            raise
+                        reconnects += 1
+                        time.sleep(next(backoff))
+        finally:
+            checkpoint.flush()
+
+    @_with_cognite_domain
+    def stream_feature_batches(
+        self,
+        feature_type_external_id: str,
+        filter: dict[str, Any],
+        properties: dict[str, Any] | None = None,
+        allow_crs_transformation: bool = False,
+        batch_size: int = 10_000,
+        output_format: str = "numpy",
+        geometry_format: str = "wkt",
+        json_decoder: Callable[[bytes], Any] | None = None,
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+    ) -> Generator[dict[str, np.ndarray] | pa.RecordBatch, None, None]:
+        """`Stream features as column-oriented batches`
+        <https://developer.cognite.com/api#tag/Geospatial/operation/searchFeaturesStreaming>
+
+        Same as `stream_features`, but the stream is parsed into batches of columns instead of one `Feature` object
+        per feature. Geometries are kept as WKT strings or WKB buffers, which can be handed directly to pandas,
+        geopandas or pyarrow.
+
+        Args:
+            feature_type_external_id (str): the feature type to search for
+            filter (Dict[str, Any]): the search filter
+            properties (Dict[str, Any]): the output property selection
+            allow_crs_transformation (bool): If true, then input geometries will be transformed into the Coordinate
+                Reference System defined in the feature type specification.
+            batch_size (int): maximum number of features in each yielded batch
+            output_format (str): "numpy" to yield a dict of NumPy arrays per property, "arrow" to yield
+                pyarrow RecordBatches
+            geometry_format (str): "wkt" to keep geometries as WKT strings, "wkb" to convert them to WKB
+                (requires shapely)
+            json_decoder (Callable[[bytes], Any]): function decoding one streamed line, see `stream_features`
+            read_chunk_size (int): number of bytes read from the connection at a time
+
+        Yields:
+            Dict[str, np.ndarray] | pa.RecordBatch: the filtered features, one batch at a time
+
+        Examples:
+
+            Stream features into a pandas dataframe:
+
+                >>> import pandas as pd
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> batches = client.geospatial.stream_feature_batches(
+                ...     feature_type_external_id="my_feature_type",
+                ...     filter={"range": {"property": "temperature", "gt": 12.0}}
+                ... )
+                >>> df = pd.concat([pd.DataFrame(batch) for batch in batches])
+
+            Stream features as arrow record batches with WKB geometries:
+
+                >>> import pyarrow as pa
+                >>> batches = client.geospatial.stream_feature_batches(
+                ...     feature_type_external_id="my_feature_type",
+                ...     filter={},
+                ...     output_format="arrow",
+                ...     geometry_format="wkb",
+                ... )
+                >>> table = pa.Table.from_batches(list(batches))
+        """
+        if batch_size < 1:
+            raise ValueError("The batch_size must be strictly positive")
+        validate_batch_formats(output_format, geometry_format)
+
+        decode = json_decoder or default_json_decoder()
+        features: list[dict[str, Any]] = []
+        for line in self._stream_feature_lines(
+            feature_type_external_id, filter, properties, allow_crs_transformation, read_chunk_size
+        ):
+            features.append(decode(line))
+            if len(features) == batch_size:
+                yield build_feature_batch(features, output_format, geometry_format)
+                features = []
+        if features:
+            yield build_feature_batch(features, output_format, geometry_format)
+
     @_with_cognite_domain
     def create_mvt_mappings_definitions(
         self,
@@ -309,6 +842,134 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
             resource_path=resource_path,
         )
 
+    @_with_cognite_domain
+    def write_mbtiles(
+        self,
+        mappings_definition: MvpMappingsDefinition,
+        path: str | Path,
+        filter: dict[str, Any] | None = None,
+        extent: int = 4096,
+        buffer: int = 64,
+        max_workers: int | None = None,
+    ) -> int:
+        """Encode the vector tiles of MVT mappings locally, into an MBTiles file
+
+        The features of each feature type of the mappings are streamed, with their geometries in SRID 4326, and cut
+        into Mapbox Vector Tiles at the zoom levels of their mappings by a pool of worker processes, see
+        `VectorTiler`. This produces tiles for offline use without the MVT endpoints of the service.
+
+        Args:
+            mappings_definition (MvpMappingsDefinition): the mappings of the feature types to the zoom levels.
+            path (str | Path): the MBTiles file to write, replaced only once complete.
+            filter (dict[str, Any] | None): the search filter of the features of each feature type.
+            extent (int): number of units per tile side.
+            buffer (int): number of units around each tile in which geometries are kept.
+            max_workers (int | None): number of worker processes, defaults to the number of CPUs.
+
+        Returns:
+            int: the number of tiles written
+
+        Examples:
+
+            Write the tiles of the surveys for offline use:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> surveys = client.geospatial.retrieve_mvt_mappings_definitions("surveys")[0]
+                >>> client.geospatial.write_mbtiles(surveys, "surveys.mbtiles")
+        """
+        mappings = mappings_definition.mappings or []
+        with VectorTiler(mappings, extent=extent, buffer=buffer, max_workers=max_workers) as tiler:
+            for feature_type_external_id in dict.fromkeys(mapping["featureTypeExternalId"] for mapping in mappings):
+                properties: dict[str, Any] = {}
+                for mapping in mappings:
+                    if mapping["featureTypeExternalId"] == feature_type_external_id:
+                        properties.update({name: {} for name in mapping.get("featureProperties", [])})
+                        properties[mapping["geometryProperty"]] = {"srid": 4326}
+                features = self.stream_features(feature_type_external_id, filter or {}, properties=properties)
+                tiler.add_features(feature_type_external_id, features)
+            return tiler.write_mbtiles(path, name=mappings_definition.external_id or "tiles")
+
+    @_with_cognite_domain
+    def build_feature_index(
+        self,
+        feature_type_external_id: str,
+        geometry_property: str,
+        filter: dict[str, Any] | None = None,
+        properties: dict[str, Any] | None = None,
+        node_capacity: int = 16,
+    ) -> FeatureIndex:
+        """Stream features into an in-memory spatial index, to query them locally
+
+        The bounding boxes of the geometries are packed in an R-tree, so that repeated `intersects`, `within` and
+        `nearest` queries, such as point-in-polygon lookups, don't scan all the features. The index keeps the
+        latest `lastUpdatedTime` of the features, and :meth:`FeatureIndex.refresh` only streams the features updated
+        since, from the cognite domain current when the index is built. Requires numpy and shapely.
+
+        Args:
+            feature_type_external_id (str): the feature type to index.
+            geometry_property (str): the property holding the geometry to index.
+            filter (dict[str, Any] | None): the search filter of the features to index.
+            properties (dict[str, Any] | None): the output property selection, the geometry and `lastUpdatedTime`
+                are always selected.
+            node_capacity (int): maximum number of children of a node of the tree.
+
+        Returns:
+            FeatureIndex: the index of the features
+
+        Examples:
+
+            Find the fields containing each well:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> fields = client.geospatial.build_feature_index("fields", "outline")
+                >>> for well in wells:
+                ...     containing = fields.intersects(well.location)
+
+            Catch up with the fields updated since:
+
+                >>> fields.refresh()
+        """
+        if properties is not None:
+            properties = {**properties, geometry_property: properties.get(geometry_property, {}), "lastUpdatedTime": {}}
+
+        def stream_updated(last_updated_time: int | None) -> Iterator[Feature]:
+            updated_filter = filter or {}
+            if last_updated_time is not None:
+                since = {"range": {"property": "lastUpdatedTime", "gte": last_updated_time}}
+                updated_filter = {"and": [updated_filter, since]} if updated_filter else since
+            return self.stream_features(feature_type_external_id, updated_filter, properties=properties)
+
+        return FeatureIndex(
+            stream_updated(None), geometry_property, node_capacity=node_capacity, stream_updated=stream_updated
+        )
+
+    @_with_cognite_domain
+    def feature_mirror(self, path: str | Path) -> FeatureMirror:
+        """Open a local SQLite copy of feature types, synchronized by transferring only the changed features
+
+        Each sync of a feature type streams the features updated since the high-water mark of its previous sync, see
+        `FeatureMirror`. The features are mirrored from and to the cognite domain current when the mirror is opened.
+
+        Args:
+            path (str | Path): the SQLite database, created if missing.
+
+        Returns:
+            FeatureMirror: the mirror, to sync, read or export feature types
+
+        Examples:
+
+            Keep a local copy of the wells, and export it for analytics:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> with client.geospatial.feature_mirror("mirror.sqlite") as mirror:
+                ...     mirror.sync("wells")
+                ...     mirror.to_geoparquet("wells", "wells.parquet")
+        """
+        return FeatureMirror(self, path)
+
     @_with_cognite_domain
     def compute(
         self,
@@ -321,7 +982,10 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
         output: dict[str, Any] | None = None,
         into_feature_type: str | None = None,
         binary_output: dict[str, Any] | None = None,
-    ) -> bytes | ComputedItemList | None:
+        binary_output_file: str | Path | BinaryIO | None = None,
+        read_chunk_size: int = 1024 * 1024,
+        columnar: bool = False,
+    ) -> bytes | ComputedItemList | ComputedColumns | None:
         """`Compute something`
         <https://pr-1717.specs.preview.cogniteapp.com/v1.json.html#operation/compute>
 
@@ -335,9 +999,16 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
             output (Dict[str, Any]): the output json spec
             into_feature_type (str): the feature type where to store the result
             binary_output (Dict[str, Any]): the binary output computation to execute
+            binary_output_file (str | Path | BinaryIO): a path or a writable binary file to stream the binary output
+                to, `read_chunk_size` bytes at a time, instead of returning it. The file at a path is only replaced
+                once the whole output is received. Streamed outputs bypass the compute cache.
+            read_chunk_size (int): number of bytes read from the connection at a time when streaming binary output
+            columnar (bool): return the computed items as `ComputedColumns`, with one NumPy array per output property,
+                which is much faster to load and convert than `ComputedItem` objects for large results.
 
         Returns:
-            bytes | List[ComputedItem] | None
+            bytes | List[ComputedItem] | ComputedColumns | None: the computed items, the binary output, or None when
+            computing into a feature type or streaming to a file
 
         Examples:
 
@@ -417,8 +1088,60 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
                 ...         "myCount": {"count": {"function": {"property": "tag"}}}
                 ...     }
                 ... )
-                :param into_feature_type:
+
+            Load a large aggregation into a DataFrame
+
+                >>> df = client.geospatial.compute(
+                ...     from_feature_type="someFeatureType",
+                ...     group_by=[{"property": "tag"}],
+                ...     output={"tag": {"property": "tag"}, "count": {"count": {"function": {"property": "tag"}}}},
+                ...     columnar=True,
+                ... ).to_pandas()
+
+            Export a large raster to a file without holding it in memory
+
+                >>> client.geospatial.compute(
+                ...     from_feature_type="windspeed",
+                ...     binary_output={"stAsGeotiff": {"raster": {"stUnion": {"raster": {"property": "rast"}}}}},
+                ...     binary_output_file="windspeed.tiff",
+                ... )
         """
+        body = self._compute_body(
+            sub_computes=sub_computes,
+            from_feature_type=from_feature_type,
+            left_joins=left_joins,
+            filter=filter,
+            group_by=group_by,
+            order_by=order_by,
+            output=output,
+            into_feature_type=into_feature_type,
+            binary_output=binary_output,
+        )
+        if binary_output_file is not None:
+            if binary_output is None:
+                raise ValueError("binary_output_file requires a binary_output")
+            self._compute_to_file(body, binary_output_file, read_chunk_size)
+            return None
+        if columnar:
+            res = self._compute_raw(body)
+            if isinstance(res, list):
+                columns = build_feature_batch(res, output_format="numpy", geometry_format="wkt")
+                return ComputedColumns({_to_snake_case(name): values for name, values in columns.items()})
+            return res
+        return self._compute(body)
+
+    @staticmethod
+    def _compute_body(
+        sub_computes: dict[str, Any] | None = None,
+        from_feature_type: str | None = None,
+        left_joins: Sequence[dict[str, Any]] | None = None,
+        filter: dict[str, Any] | None = None,
+        group_by: Sequence[dict[str, Any]] | None = None,
+        order_by: Sequence[ComputeOrder] | None = None,
+        output: dict[str, Any] | None = None,
+        into_feature_type: str | None = None,
+        binary_output: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
         sub_computes_json = {"subComputes": sub_computes} if sub_computes is not None else {}
         from_feature_type_json = {"fromFeatureType": from_feature_type} if from_feature_type is not None else {}
         left_joins_json = {"leftJoins": left_joins} if left_joins is not None else {}
@@ -432,50 +1155,371 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
         output_json = {"output": output} if output is not None else {}
         binary_output_json = {"binaryOutput": binary_output} if binary_output is not None else {}
         into_feature_type_json = {"intoFeatureType": into_feature_type} if into_feature_type is not None else {}
-        res = self._post(
-            url_path=GeospatialAPI._RESOURCE_PATH + "/compute",
-            json={
-                **sub_computes_json,
-                **from_feature_type_json,
-                **left_joins_json,
-                **filter_json,
-                **group_by_json,
-                **order_by_json,
-                **output_json,
-                **into_feature_type_json,
-                **binary_output_json,
-            },
-        )
+        return {
+            **sub_computes_json,
+            **from_feature_type_json,
+            **left_joins_json,
+            **filter_json,
+            **group_by_json,
+            **order_by_json,
+            **output_json,
+            **into_feature_type_json,
+            **binary_output_json,
+        }
+
+    def _compute(self, body: dict[str, Any]) -> bytes | ComputedItemList | None:
+        res = self._compute_raw(body)
+        if isinstance(res, list):
+            return ComputedItemList._load(res, cognite_client=self._cognite_client)
+        return res
+
+    def _compute_raw(self, body: dict[str, Any]) -> list[dict[str, Any]] | bytes | None:
+        return self._send_compute(body, "intoFeatureType" in body, referenced_feature_types(body))
+
+    def _send_compute(
+        self, body: dict[str, Any] | str, into_feature_type: bool, feature_types: set[str]
+    ) -> list[dict[str, Any]] | bytes | None:
+        # The body is already serialized when it comes from a ComputeTemplate
+        # Computing into a feature type writes to it, only read-only computations are cached
+        cache = self._compute_cache if not into_feature_type else None
+        key = None
+        if cache is not None:
+            key = compute_cache_key(body, self._config.project, self.get_current_cognite_domain())
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        url_path = GeospatialAPI._RESOURCE_PATH + "/compute"
+        if isinstance(body, str):
+            data = body.encode()
+            headers = {}
+            if not global_config.disable_gzip:
+                data = gzip.compress(data)
+                headers["Content-Encoding"] = "gzip"
+            res = self._do_request("POST", url_path, data=data, headers=headers, timeout=self._config.timeout)
+        else:
+            res = self._post(url_path=url_path, json=body)
         content_type = res.headers["Content-Type"].split(";")[0]
-        if into_feature_type is not None:
+        if into_feature_type:
             return None
         if content_type == "application/json":
-            return ComputedItemList._load(res.json()["items"], cognite_client=self._cognite_client)
+            items = res.json()["items"]
+            if cache is not None:
+                cache.put(key, items, len(res.content), feature_types)
+            return items
         if content_type == "image/tiff":
+            if cache is not None:
+                cache.put(key, res.content, len(res.content), feature_types)
             return res.content
         raise ValueError(f"unsupported content type ${content_type}")
 
+    def _compute_to_file(self, body: dict[str, Any], file: str | Path | BinaryIO, read_chunk_size: int) -> None:
+        res = self._do_request(
+            "POST",
+            url_path=GeospatialAPI._RESOURCE_PATH + "/compute",
+            json=body,
+            timeout=self._config.timeout,
+            stream=True,
+        )
+        try:
+            if isinstance(file, (str, Path)):
+                path = Path(file)
+                partial_path = path.with_name(path.name + ".partial")
+                try:
+                    with partial_path.open("wb") as f:
+                        self._write_response_content(res, f, read_chunk_size)
+                    partial_path.replace(path)
+                finally:
+                    partial_path.unlink(missing_ok=True)
+            else:
+                self._write_response_content(res, file, read_chunk_size)
+        finally:
+            res.close()
+
+    @staticmethod
+    def _write_response_content(res: Response, file: BinaryIO, read_chunk_size: int) -> None:
+        try:
+            for chunk in res.iter_content(read_chunk_size):
+                file.write(chunk)
+        except (ChunkedEncodingError, ConnectionError, RequestsConnectionError) as e:
+            raise CogniteConnectionError(e)
+
+    @_with_cognite_domain
+    def compute_batch(
+        self,
+        outputs: Sequence[dict[str, Any]],
+        sub_computes: Sequence[dict[str, Any] | None] | None = None,
+        shared_sub_computes: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        max_workers: int | None = None,
+    ) -> list[Any]:
+        """`Compute many independent expressions`
+        <https://developer.cognite.com/api#tag/Geospatial/operation/compute>
+
+        The expressions are packed `batch_size` at a time into the output of a single compute request, and the packed
+        requests are sent concurrently. The sub computes of each expression get generated names in the packed request,
+        so that expressions can reuse the same names, while the `shared_sub_computes` are sent once per request and
+        can be referenced by all expressions.
+
+        Args:
+            outputs (Sequence[dict[str, Any]]): the expressions to compute, each as the value of an output property.
+            sub_computes (Sequence[dict[str, Any] | None] | None): the sub computes of each expression, in the same
+                order as the expressions.
+            shared_sub_computes (dict[str, Any] | None): sub computes referenced by any expression.
+            batch_size (int): maximum number of expressions in a single request.
+            max_workers (int | None): number of concurrent requests, defaults to the client max_workers.
+
+        Returns:
+            list[Any]: the computed value of each expression, in the order of the expressions.
+
+        Examples:
+
+            Transform many points to Web Mercator with few requests:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> points = [f"SRID=4326;POINT({lon} {lat})" for lon, lat in [(2.35, 48.85), (10.75, 59.91)]]
+                >>> res = client.geospatial.compute_batch(
+                ...     [{"stTransform": {"geometry": {"ref": "point"}, "srid": 3857}} for _ in points],
+                ...     sub_computes=[{"point": {"ewkt": point}} for point in points],
+                ... )
+        """
+        if sub_computes is not None and len(sub_computes) != len(outputs):
+            raise ValueError("sub_computes must have one item per output")
+        if batch_size < 1:
+            raise ValueError("batch_size must be strictly positive")
+        max_workers = max_workers or self._config.max_workers
+        bodies = [
+            pack_compute_batch(
+                outputs[start : start + batch_size],
+                sub_computes[start : start + batch_size] if sub_computes is not None else None,
+                shared_sub_computes,
+            )
+            for start in range(0, len(outputs), batch_size)
+        ]
+
+        def compute_packed(indexed_body: tuple[int, dict[str, Any]]) -> tuple[int, list[dict[str, Any]]]:
+            index, body = indexed_body
+            return index, self._compute_raw(body)
+
+        results: list[Any] = [None] * len(outputs)
+        for index, items in map_bounded(
+            compute_packed, enumerate(bodies), max_workers=max_workers, max_in_flight=max_workers
+        ):
+            start = index * batch_size
+            results[start : start + len(bodies[index]["output"])] = unpack_compute_batch(items, bodies[index])
+        return results
+
+    @_with_cognite_domain
+    def compile_compute(
+        self,
+        sub_computes: dict[str, Any] | None = None,
+        from_feature_type: str | None = None,
+        left_joins: Sequence[dict[str, Any]] | None = None,
+        filter: dict[str, Any] | None = None,
+        group_by: Sequence[dict[str, Any]] | None = None,
+        order_by: Sequence[ComputeOrder] | None = None,
+        output: dict[str, Any] | None = None,
+        into_feature_type: str | None = None,
+        binary_output: dict[str, Any] | None = None,
+    ) -> ComputeTemplate:
+        """Compile a compute request to run many times with different values
+
+        The request is built and serialized once. Any value of it can be a `ComputeParameter`, whose value is given as
+        a keyword argument each time the returned template is called. Calls of the template only serialize the
+        parameter values, and are sent to the cognite domain current at the time of the call.
+
+        Args:
+            sub_computes (Dict[str, Any]): the sub-computed data for the main compute
+            from_feature_type (str): the main feature type external id to compute from
+            left_joins (Sequence[Dict[str, Any]]): the feature type to left join with
+            filter (Dict[str, Any]): the filter for the main feature type
+            group_by (List[Dict[str, Any]]): the list of group by expressions
+            order_by (List[ComputeOrder]): the list of order by expressions and direction
+            output (Dict[str, Any]): the output json spec
+            into_feature_type (str): the feature type where to store the result
+            binary_output (Dict[str, Any]): the binary output computation to execute
+
+        Returns:
+            ComputeTemplate: the compiled request, to call with the parameter values
+
+        Examples:
+
+            Count the wells of each operator in many areas:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> from cognite.experimental.data_classes.geospatial import ComputeParameter
+                >>> client = CogniteClient()
+                >>> count_wells = client.geospatial.compile_compute(
+                ...     from_feature_type="wells",
+                ...     filter={"stWithin": {"property": "location", "value": {"wkt": ComputeParameter("area")}}},
+                ...     group_by=[{"property": "operator"}],
+                ...     order_by=[ComputeOrder({"property": "operator"}, "ASC")],
+                ...     output={"operator": {"property": "operator"}, "count": {"count": {"property": "operator"}}},
+                ... )
+                >>> counts = [count_wells(area=area) for area in ["POLYGON((0 0,0 1,1 1,0 0))", "POLYGON((1 1,1 2,2 2,1 1))"]]
+        """
+        body = self._compute_body(
+            sub_computes=sub_computes,
+            from_feature_type=from_feature_type,
+            left_joins=left_joins,
+            filter=filter,
+            group_by=group_by,
+            order_by=order_by,
+            output=output,
+            into_feature_type=into_feature_type,
+            binary_output=binary_output,
+        )
+        # The template uses the domain current at each call, rather than the one bound for the compilation
+        geospatial = copy.copy(self)
+        geospatial._bound_cognite_domain = _UNBOUND
+        return ComputeTemplate(geospatial, body)
+
+    def enable_compute_cache(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float | None = 3600,
+        directory: str | Path | None = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ) -> ComputeCache:
+        """Cache the results of :meth:`compute`
+
+        Results are keyed by a hash of the canonical compute request body, the project and the cognite domain, and
+        evicted least recently used first beyond the byte caps, or once older than `ttl`. Computations into a feature
+        type are never cached. Call :meth:`invalidate_compute_cache` after writing to the feature types computed from.
+
+        Args:
+            max_bytes (int): maximum size of the results kept in memory.
+            ttl (float | None): number of seconds a result stays valid, forever if None.
+            directory (str | Path | None): directory where binary (GeoTIFF) results are persisted across processes,
+                they are kept in memory if None.
+            max_disk_bytes (int): maximum size of the binary results persisted to `directory`.
+
+        Returns:
+            ComputeCache: the cache, which counts its hits and misses
+
+        Examples:
+
+            Cache computations for ten minutes and persist computed rasters:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> cache = client.geospatial.enable_compute_cache(ttl=600, directory="/tmp/geotiffs")
+        """
+        self._compute_cache = ComputeCache(
+            max_bytes=max_bytes, ttl=ttl, directory=directory, max_disk_bytes=max_disk_bytes
+        )
+        return self._compute_cache
+
+    def disable_compute_cache(self) -> None:
+        """Stop caching the results of :meth:`compute`. Binary results persisted to disk are kept."""
+        self._compute_cache = None
+
+    def invalidate_compute_cache(self, feature_type_external_id: str | None = None) -> int:
+        """Drop the cached compute results read from a feature type.
+
+        Args:
+            feature_type_external_id (str | None): the feature type that changed, or None to drop all results.
+
+        Returns:
+            int: the number of results dropped
+
+        Examples:
+
+            Recompute from the wells after upserting some:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> client.geospatial.enable_compute_cache()
+                >>> client.geospatial.invalidate_compute_cache("wells")
+        """
+        if self._compute_cache is None:
+            return 0
+        return self._compute_cache.invalidate(feature_type_external_id)
+
+    def enable_feature_type_cache(self, ttl: float | None = 300) -> FeatureTypeCache:
+        """Cache the feature types retrieved by :meth:`retrieve_feature_types` and :meth:`list_feature_types`
+
+        Feature types are cached by cognite domain and external id, and served without a request for `ttl` seconds.
+        Expired ones are retrieved again, all those of a call in one request, and kept when their
+        `last_updated_time` is unchanged. Feature types created, patched or deleted through this API are updated in the
+        cache, call :meth:`invalidate_feature_type_cache` after changes made by other clients. The upserts validating
+        features against their feature type use the cache too.
+
+        Args:
+            ttl (float | None): number of seconds a feature type stays valid, until invalidated if None.
+
+        Returns:
+            FeatureTypeCache: the cache, which counts its hits, misses and revalidations
+
+        Examples:
+
+            Retrieve the schema of the wells once for many upserts:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> client.geospatial.enable_feature_type_cache(ttl=600)
+                >>> wells = client.geospatial.retrieve_feature_types("wells")
+        """
+        self._feature_type_cache = FeatureTypeCache(ttl=ttl)
+        return self._feature_type_cache
+
+    def disable_feature_type_cache(self) -> None:
+        """Stop caching feature types."""
+        self._feature_type_cache = None
+
+    def invalidate_feature_type_cache(self, external_id: str | Sequence[str] | None = None) -> int:
+        """Drop cached feature types in all cognite domains.
+
+        Args:
+            external_id (str | Sequence[str] | None): the feature type(s) to drop, or None to drop all.
+
+        Returns:
+            int: the number of feature types dropped
+
+        Examples:
+
+            Retrieve the wells again after another client changed them:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> client.geospatial.enable_feature_type_cache()
+                >>> client.geospatial.invalidate_feature_type_cache("wells")
+        """
+        if self._feature_type_cache is None:
+            return 0
+        return self._feature_type_cache.invalidate([external_id] if isinstance(external_id, str) else external_id)
+
+    @_with_cognite_domain
     def upsert_features(
         self,
         feature_type_external_id: str,
-        feature: Feature | Sequence[Feature] | FeatureList,
+        feature: Feature | Sequence[Feature] | FeatureList | Iterable[Feature] | AsyncIterable[Feature],
         allow_crs_transformation: bool = False,
         chunk_size: int | None = None,
-    ) -> Feature | FeatureList:
+        return_features: bool = True,
+        local_crs_transformation: bool = False,
+    ) -> Feature | FeatureList | None:
         """`Upsert features`
         <https://pr-1814.specs.preview.cogniteapp.com/v1.json.html#tag/Geospatial/operation/upsertFeatures>
 
         Args:
             feature_type_external_id: Feature type definition for the features to upsert.
-            feature: one feature or a list of features to upsert or a FeatureList object
+            feature: one feature or a list of features to upsert or a FeatureList object. Any other iterable or async
+                iterable, like a generator, is consumed lazily: only the chunks being upserted are held in memory.
             allow_crs_transformation: If true, then input geometries will be transformed into the Coordinate Reference
                 System defined in the feature type specification. When it is false, then requests with geometries in
                 Coordinate Reference System different from the ones defined in the feature type will result in
                 CogniteAPIError exception.
             chunk_size: maximum number of items in a single request to the api
+            return_features: whether to return the upserted features. Set it to False when upserting from a large
+                iterable, to avoid collecting all upserted features in memory.
+            local_crs_transformation: If true, then input geometries given in another SRID than the one of their
+                property are transformed before they are sent, see `transform_geometries`. The features given are
+                not modified.
 
         Returns:
-            Feature | FeatureList: Upserted features
+            Feature | FeatureList | None: Upserted features, or None if return_features is False
 
         Examples:
 
@@ -501,22 +1545,367 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
                 ...         temperature=12.4
                 ...     )
                 ... )
+
+            Upsert features read lazily from a new-line delimited GeoJSON file:
+
+                >>> import json
+                >>> def read_features(path):
+                ...     with open(path) as f:
+                ...         for line in f:
+                ...             geojson = json.loads(line)
+                ...             yield Feature(external_id=geojson["id"], location=geojson["geometry"])
+                >>> c.geospatial.upsert_features("my_feature_type", read_features("wells.ndjson"), return_features=False)
+
+            Upsert a large polygon from an array of coordinates, without nested lists:
+
+                >>> import numpy as np
+                >>> from cognite.experimental.data_classes.geospatial import ArrayGeometry
+                >>> ring = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]])
+                >>> outline = ArrayGeometry("Polygon", ring, offsets=[[0, len(ring)]])
+                >>> res = c.geospatial.upsert_features("my_feature_type", Feature(external_id="area", outline=outline))
         """
         if chunk_size is not None and (chunk_size < 1 or chunk_size > self._CREATE_LIMIT):
             raise ValueError(f"The chunk_size must be strictly positive and not exceed {self._CREATE_LIMIT}")
-        if isinstance(feature, FeatureList):
-            feature = list(feature)
         resource_path = self._feature_resource_path(feature_type_external_id) + "/upsert"
         extra_body_fields = {"allowCrsTransformation": "true"} if allow_crs_transformation else {}
-        return self._create_multiple(
-            list_cls=FeatureList,
-            resource_cls=Feature,
-            items=feature,
-            resource_path=resource_path,
-            extra_body_fields=extra_body_fields,
-            limit=chunk_size,
+        transform = (
+            self._local_crs_transformer(feature_type_external_id) if local_crs_transformation else lambda items: items
+        )
+        if isinstance(feature, (Feature, Sequence)):
+            if isinstance(feature, FeatureList):
+                feature = list(feature)
+            feature = transform([feature])[0] if isinstance(feature, Feature) else transform(list(feature))
+            res = self._create_multiple(
+                list_cls=FeatureList,
+                resource_cls=Feature,
+                items=feature,
+                resource_path=resource_path,
+                extra_body_fields=extra_body_fields,
+                limit=chunk_size,
+            )
+            return res if return_features else None
+
+        # Read as many features as can be upserted concurrently, and no more
+        features = iter_async(feature) if isinstance(feature, AsyncIterable) else feature
+        upserted: list[Feature] = []
+        for items in iter_chunks(features, (chunk_size or self._CREATE_LIMIT) * self._config.max_workers):
+            res = self._create_multiple(
+                list_cls=FeatureList,
+                resource_cls=Feature,
+                items=transform(items),
+                resource_path=resource_path,
+                extra_body_fields=extra_body_fields,
+                limit=chunk_size,
+            )
+            if return_features:
+                upserted.extend(res)
+        return FeatureList(upserted, cognite_client=self._cognite_client) if return_features else None
+
+    def _local_crs_transformer(self, feature_type_external_id: str) -> Callable[[list[Feature]], list[Feature]]:
+        properties = self.retrieve_feature_types(feature_type_external_id).properties or {}
+        geometry_srids = {
+            name: spec["srid"]
+            for name, spec in properties.items()
+            if _is_geometry_type(spec["type"]) and spec.get("srid") is not None
+        }
+
+        def transform(features: list[Feature]) -> list[Feature]:
+            transformed = list(features)
+            for name, srid in geometry_srids.items():
+                attribute = _to_feature_property_name(name)
+                # Only the geometries with an SRID prefix in another SRID are transformed, on copies of their features
+                targets = []
+                for i, feature in enumerate(transformed):
+                    value = getattr(feature, attribute, None)
+                    if isinstance(value, ArrayGeometry) and value.srid is not None and value.srid != srid:
+                        if is_supported(value.srid) and is_supported(srid):
+                            # The coordinates are transformed as they are, without going through WKT
+                            coordinates = transform_coordinates(value.coordinates, value.srid, srid)
+                            transformed[i] = copy.copy(feature)
+                            setattr(transformed[i], attribute, value.with_coordinates(coordinates, srid))
+                        else:
+                            targets.append((i, value.dump()))
+                    elif isinstance(value, dict) and ("wkt" in value or "ewkt" in value):
+                        value_srid, _ = split_ewkt(value)
+                        if value_srid is not None and value_srid != srid:
+                            targets.append((i, value))
+                if not targets:
+                    continue
+                geometries = self.transform_geometries([value for _, value in targets], srid)
+                for (i, _), geometry in zip(targets, geometries):
+                    transformed[i] = copy.copy(transformed[i])
+                    setattr(transformed[i], attribute, geometry)
+            return transformed
+
+        return transform
+
+    @_with_cognite_domain
+    def transform_geometries(
+        self, geometries: Sequence[str | dict[str, Any]], srid: int, batch_size: int = 1000
+    ) -> list[dict[str, str]]:
+        """Transform geometries to another coordinate reference system, locally when possible
+
+        The geometries between WGS84 (4326), Web Mercator (3857) and the WGS84 UTM zones (32601 to 32660 and 32701 to
+        32760) are transformed locally, the coordinates of all those of a source SRID at once, with numpy and shapely.
+        The others are transformed with `stTransform` by `compute_batch`, `batch_size` geometries per request.
+
+        Args:
+            geometries (Sequence[str | dict[str, Any]]): the geometries, as EWKT strings or `{"ewkt": ...}` or
+                `{"wkt": ...}` values with an SRID prefix. Geometries without SRID are assumed to be in the target SRID.
+            srid (int): the SRID to transform the geometries to.
+            batch_size (int): maximum number of geometries in a single compute request.
+
+        Returns:
+            list[dict[str, str]]: the transformed geometries, as `{"wkt": ...}` values, in the order of the geometries
+
+        Examples:
+
+            Transform points to UTM zone 31N without requests:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> points = [f"SRID=4326;POINT({lon} {lat})" for lon, lat in [(2.35, 48.85), (4.83, 45.76)]]
+                >>> res = client.geospatial.transform_geometries(points, 32631)
+        """
+
+        def compute_fallback(ewkts: list[str], to_srid: int) -> list[str]:
+            results = self.compute_batch(
+                [{"stTransform": {"geometry": {"ref": "geometry"}, "srid": to_srid}}] * len(ewkts),
+                sub_computes=[{"geometry": {"ewkt": ewkt}} for ewkt in ewkts],
+                batch_size=batch_size,
+            )
+            return [split_ewkt(result)[1] for result in results]
+
+        return [{"wkt": wkt} for wkt in transform_wkts(geometries, srid, compute_fallback)]
+
+    @_with_cognite_domain
+    def upsert_features_bulk(
+        self,
+        feature_type_external_id: str,
+        features: Iterable[Feature | dict[str, Any]] | AsyncIterable[Feature | dict[str, Any]],
+        allow_crs_transformation: bool = False,
+        chunk_size: int | None = None,
+        max_chunk_bytes: int | None = None,
+        max_workers: int | None = None,
+        max_retries: int = 3,
+        progress_callback: Callable[[FeatureUpsertReport], None] | None = None,
+        validate: bool = False,
+    ) -> FeatureUpsertReport:
+        """`Upsert a large number of features`
+        <https://pr-1814.specs.preview.cogniteapp.com/v1.json.html#tag/Geospatial/operation/upsertFeatures>
+
+        The features are read lazily from the iterable, split in chunks and upserted on a pool of `max_workers`
+        threads. At most two chunks per worker are read ahead of the upload, so memory use does not depend on the
+        number of features. Chunks failing with a transient error (connection errors, 429 and 5xx responses) are
+        retried with exponential backoff. A chunk that still fails does not stop the upload, it is recorded in the
+        returned report instead.
+
+        Chunks are bounded by `max_chunk_bytes` of serialized features on top of the item limit of the API. Unless
+        `chunk_size` is given, their size adapts to the latency of the completed requests, aiming at requests of about
+        two seconds. The chosen sizes are reported in :attr:`FeatureUpsertReport.stats`.
+
+        With `validate=True`, the features are checked against the properties of the feature type (types, string
+        sizes, geometry types and SRIDs) as they are dumped. Invalid features are not sent, they are collected in
+        the `rejected` dead-letter list of the report so that one malformed feature doesn't fail its whole chunk.
+
+        Args:
+            feature_type_external_id (str): Feature type definition for the features to upsert.
+            features (Iterable[Feature | dict[str, Any]] | AsyncIterable[Feature | dict[str, Any]]): the features to
+                upsert, for example a generator. Features can also be given as dictionaries in the API format.
+            allow_crs_transformation (bool): If true, then input geometries will be transformed into the Coordinate
+                Reference System defined in the feature type specification.
+            chunk_size (int): fixed maximum number of features in a single request to the api, by default the chunks
+                are sized adaptively
+            max_chunk_bytes (int): maximum serialized size of a single request to the api
+            max_workers (int): number of concurrent requests, defaults to the client max_workers
+            max_retries (int): maximum number of retries of a chunk failing with a transient error
+            progress_callback (Callable[[FeatureUpsertReport], None]): called with the report so far each time a
+                chunk is done
+            validate (bool): validate the features against the feature type before sending them.
+
+        Returns:
+            FeatureUpsertReport: the succeeded and failed chunks, and the rejected features
+
+        Examples:
+
+            Upsert features from a generator and retry the failed ones:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> features = (
+                ...     Feature(external_id=f"well_{i}", location={"wkt": f"POINT({i % 90} {i % 45})"})
+                ...     for i in range(10_000_000)
+                ... )
+                >>> report = client.geospatial.upsert_features_bulk(
+                ...     "wells", features, max_workers=8, progress_callback=lambda r: print(r.upserted_count)
+                ... )
+                >>> failed = [Feature._load(item) for chunk in report.failed for item in chunk.items]
+        """
+        if chunk_size is not None and (chunk_size < 1 or chunk_size > self._CREATE_LIMIT):
+            raise ValueError(f"The chunk_size must be strictly positive and not exceed {self._CREATE_LIMIT}")
+        validator = None
+        if validate:
+            properties = self.retrieve_feature_types(external_id=feature_type_external_id).properties
+            validator = feature_validator(properties, allow_crs_transformation)
+        return self._upsert_feature_chunks(
+            feature_type_external_id,
+            features,
+            allow_crs_transformation=allow_crs_transformation,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            max_workers=max_workers or self._config.max_workers,
+            max_retries=max_retries,
+            progress_callback=progress_callback,
+            validator=validator,
+        )
+
+    def _upsert_feature_chunks(
+        self,
+        feature_type_external_id: str,
+        features: Iterable[Feature | dict[str, Any]] | AsyncIterable[Feature | dict[str, Any]],
+        allow_crs_transformation: bool,
+        chunk_size: int | None,
+        max_chunk_bytes: int | None,
+        max_workers: int,
+        max_retries: int,
+        progress_callback: Callable[[FeatureUpsertReport], None] | None,
+        validator: FeatureValidator | None,
+    ) -> FeatureUpsertReport:
+        resource_path = self._feature_resource_path(feature_type_external_id) + "/upsert"
+        extra_body_fields = {"allowCrsTransformation": "true"} if allow_crs_transformation else {}
+        chunker = AdaptiveChunker(
+            max_items=chunk_size or self._CREATE_LIMIT,
+            max_bytes=max_chunk_bytes or self._UPSERT_MAX_BYTES,
+            adaptive=chunk_size is None,
         )
 
+        def upsert_chunk(indexed_chunk: tuple[int, tuple[list[dict[str, Any]], int]]) -> FeatureUpsertChunk:
+            index, (chunk, chunk_bytes) = indexed_chunk
+            items, rejected = validator.encode(chunk) if validator is not None else (chunk, [])
+            error, attempts, latency = None, 0, None
+            if items:
+                # Only the latency of the last attempt is representative of the chunk size
+                def post() -> Any:
+                    nonlocal latency
+                    start = time.perf_counter()
+                    res = self._post(resource_path, json={"items": items, **extra_body_fields})
+                    latency = time.perf_counter() - start
+                    return res
+
+                _, error, attempts = call_with_retries(post, max_retries)
+                if error is None:
+                    chunker.record(chunk_bytes, latency)
+            return FeatureUpsertChunk(
+                index=index,
+                external_ids=[item.get("externalId") for item in items],
+                attempts=attempts,
+                error=error,
+                items=items if error is not None else None,
+                rejected=rejected,
+                byte_size=chunk_bytes,
+                latency=latency,
+            )
+
+        if isinstance(features, AsyncIterable):
+            features = iter_async(features)
+        report = FeatureUpsertReport()
+        chunks = enumerate(chunker.split(features))
+        for chunk_result in map_bounded(upsert_chunk, chunks, max_workers=max_workers, max_in_flight=2 * max_workers):
+            report.add(chunk_result)
+            if progress_callback is not None:
+                progress_callback(report)
+        return report
+
+    @_with_cognite_domain
+    def upsert_features_from_file(
+        self,
+        feature_type_external_id: str,
+        path: str | Path,
+        file_format: str | None = None,
+        geometry_property: str | None = None,
+        geometry_column: str | None = None,
+        external_id_column: str = "externalId",
+        allow_crs_transformation: bool = False,
+        chunk_size: int | None = None,
+        max_chunk_bytes: int | None = None,
+        max_workers: int | None = None,
+        max_retries: int = 3,
+        read_batch_size: int = 50_000,
+        progress_callback: Callable[[FeatureUpsertReport], None] | None = None,
+        validate: bool = True,
+    ) -> FeatureUpsertReport:
+        """`Upsert the features of a file`
+        <https://pr-1814.specs.preview.cogniteapp.com/v1.json.html#tag/Geospatial/operation/upsertFeatures>
+
+        Reads GeoJSON, new-line delimited GeoJSON, CSV with WKT geometries or GeoParquet files and upserts their
+        features with :meth:`upsert_features_bulk`. New-line delimited GeoJSON, CSV and GeoParquet files are memory
+        mapped and read in batches, while GeoJSON files are decoded at once, so prefer new-line delimited GeoJSON for
+        large files. The values are converted to the property types of the feature type one column at a time, without
+        creating `Feature` objects.
+        Values which can't be converted are kept as they are, so that the validation rejects their feature.
+
+        Args:
+            feature_type_external_id (str): Feature type definition for the features to upsert.
+            path (str | Path): the file to read.
+            file_format (str): one of "geojson", "ndjson", "csv" and "geoparquet", detected from the file extension by
+                default.
+            geometry_property (str): the feature type property receiving the geometry, defaults to the only geometry
+                property of the feature type.
+            geometry_column (str): the column holding the geometry in CSV and GeoParquet files, defaults to the
+                geometry property, then "wkt" for CSV and the primary geometry column for GeoParquet.
+            external_id_column (str): the column holding the external ids in CSV and GeoParquet files.
+            allow_crs_transformation (bool): If true, then input geometries will be transformed into the Coordinate
+                Reference System defined in the feature type specification.
+            chunk_size (int): fixed maximum number of features in a single request to the api, by default the chunks
+                are sized adaptively
+            max_chunk_bytes (int): maximum serialized size of a single request to the api
+            max_workers (int): number of concurrent requests, defaults to the client max_workers
+            max_retries (int): maximum number of retries of a chunk failing with a transient error
+            read_batch_size (int): number of rows converted at once for CSV and GeoParquet files.
+            progress_callback (Callable[[FeatureUpsertReport], None]): called with the report so far each time a
+                chunk is done
+            validate (bool): validate the features against the feature type before sending them, invalid features
+                are collected in the `rejected` list of the report.
+
+        Returns:
+            FeatureUpsertReport: the succeeded and failed chunks, and the rejected features
+
+        Examples:
+
+            Upsert the wells of a CSV file with a "wkt" column:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> report = client.geospatial.upsert_features_from_file("wells", "wells.csv")
+        """
+        path = Path(path)
+        file_format = detect_file_format(path, file_format)
+        if chunk_size is not None and (chunk_size < 1 or chunk_size > self._CREATE_LIMIT):
+            raise ValueError(f"The chunk_size must be strictly positive and not exceed {self._CREATE_LIMIT}")
+        schema = self.retrieve_feature_types(external_id=feature_type_external_id).properties
+        geometry_property = geometry_property or default_geometry_property(schema)
+        if file_format == "geojson":
+            features = read_geojson(path, geometry_property, schema)
+        elif file_format == "ndjson":
+            features = read_ndjson(path, geometry_property, schema)
+        else:
+            read_table = read_csv if file_format == "csv" else read_geoparquet
+            features = read_table(
+                path, geometry_property, geometry_column, external_id_column, schema, batch_size=read_batch_size
+            )
+        return self._upsert_feature_chunks(
+            feature_type_external_id,
+            features,
+            allow_crs_transformation=allow_crs_transformation,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            max_workers=max_workers or self._config.max_workers,
+            max_retries=max_retries,
+            progress_callback=progress_callback,
+            validator=feature_validator(schema, allow_crs_transformation) if validate else None,
+        )
+
+    @_with_cognite_domain
     def create_tasks(
         self,
         session_nonce: str,
@@ -560,6 +1949,7 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
             extra_body_fields={"sessionNonce": session_nonce},
         )
 
+    @_with_cognite_domain
     def get_tasks(self, external_id: str | list[str]) -> GeospatialTask | GeospatialTaskList:
         """`Retrieve tasks`
         <https://pr-1916.specs.preview.cogniteapp.com/v1.json.html#tag/Geospatial/operation/getTasksByIds>
@@ -585,3 +1975,50 @@ class ExperimentalGeospatialAPI(GeospatialAPI):
             identifiers=identifiers.as_singleton() if identifiers.is_singleton() else identifiers,
             resource_path=f"{GeospatialAPI._RESOURCE_PATH}/tasks",
         )
+
+    @_with_cognite_domain
+    def task_waiter(
+        self,
+        task: str | GeospatialTask | Sequence[str | GeospatialTask],
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        terminal_states: Collection[str] = TERMINAL_TASK_STATES,
+    ) -> GeospatialTaskWaiter:
+        """Wait for tasks to reach a terminal state
+
+        All the pending tasks are retrieved by each poll, and the delay between polls grows exponentially with random
+        jitter, so that waiting for hundreds of tasks costs few requests. The tasks are retrieved from the cognite
+        domain current when the waiter is created.
+
+        Args:
+            task (str | GeospatialTask | Sequence[str | GeospatialTask]): the task(s), or their external id(s).
+            poll_interval (float): number of seconds before the second poll, the first one is immediate.
+            max_poll_interval (float): maximum number of seconds between polls.
+            terminal_states (Collection[str]): the states in which a task is done.
+
+        Returns:
+            GeospatialTaskWaiter: the waiter, to iterate over the tasks as they are done or to wait for all of them
+
+        Examples:
+
+            Report ingestion tasks as they complete:
+
+                >>> from cognite.client import CogniteClient
+                >>> c = CogniteClient()
+                >>> tasks = c.geospatial.create_tasks(session_nonce, tasks)
+                >>> for task in c.geospatial.task_waiter(tasks):
+                ...     print(task.external_id, task.state)
+
+            Wait at most an hour for all of them:
+
+                >>> done = c.geospatial.task_waiter(tasks).wait_all(timeout=3600)
+        """
+        tasks = [task] if isinstance(task, (str, GeospatialTask)) else task
+        external_ids = [item if isinstance(item, str) else item.external_id for item in tasks]
+        return GeospatialTaskWaiter(
+            self,
+            external_ids,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            terminal_states=terminal_states,
+        )
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+    TypeVar,
+)
+
+from cognite.client.data_classes.geospatial import Feature, FeatureList
+from cognite.experimental._api.geospatial_streaming import DEFAULT_READ_CHUNK_SIZE
+from cognite.experimental.data_classes.geospatial import (
+    ComputedColumns,
+    ComputedItemList,
+    ComputeOrder,
+    FeaturePartitioning,
+    LazyFeature,
+)
+
+if TYPE_CHECKING:
+    from cognite.experimental._api.geospatial import ExperimentalGeospatialAPI
+
+T = TypeVar("T")
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _shared_executor(max_workers: int) -> ThreadPoolExecutor:
+    # One pool for the process, the coroutines waiting for a request don't hold a thread
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geospatial-async")
+        return _EXECUTOR
+
+
+def _take(iterator: Iterator[T], count: int) -> list[T]:
+    return list(itertools.islice(iterator, count))
+
+
+async def _aiter_chunks(items: Iterable[T] | AsyncIterable[T], chunk_size: int) -> AsyncIterator[list[T]]:
+    if not isinstance(items, AsyncIterable):
+        iterator = iter(items)
+        while chunk := _take(iterator, chunk_size):
+            yield chunk
+        return
+    chunk: list[T] = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class AsyncExperimentalGeospatialAPI:
+    """Asyncio variant of the experimental geospatial API.
+
+    The requests are made by the geospatial API of the client, so they share its connection pool, retries and
+    cognite domain, on a small thread pool shared by the process. A coroutine awaiting a request doesn't hold a
+    thread, so thousands of concurrent calls cost no more threads than the pool has. The domain scoped with
+    :meth:`ExperimentalGeospatialAPI.cognite_domain_scope` is local to each asyncio task.
+
+    Args:
+        geospatial (ExperimentalGeospatialAPI): the synchronous API making the requests.
+        max_workers (int | None): number of threads of the shared pool, defaults to the client max_workers. Only the
+            first API created in the process sizes the pool.
+    """
+
+    def __init__(self, geospatial: ExperimentalGeospatialAPI, max_workers: int | None = None):
+        self._geospatial = geospatial
+        self._max_workers = max_workers or geospatial._config.max_workers
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # Like asyncio.to_thread (python 3.9+), the call sees the context of the task, including its cognite domain
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(_shared_executor(self._max_workers), call)
+
+    async def compute(
+        self,
+        sub_computes: dict[str, Any] | None = None,
+        from_feature_type: str | None = None,
+        left_joins: Sequence[dict[str, Any]] | None = None,
+        filter: dict[str, Any] | None = None,
+        group_by: Sequence[dict[str, Any]] | None = None,
+        order_by: Sequence[ComputeOrder] | None = None,
+        output: dict[str, Any] | None = None,
+        into_feature_type: str | None = None,
+        binary_output: dict[str, Any] | None = None,
+        binary_output_file: str | Path | BinaryIO | None = None,
+        columnar: bool = False,
+    ) -> bytes | ComputedItemList | ComputedColumns | None:
+        """`Compute something`, see :meth:`ExperimentalGeospatialAPI.compute`
+
+        Examples:
+
+            Compute the transformation of an ewkt geometry from one SRID to another:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> async def transform():
+                ...     geometry = {"ewkt": "SRID=4326;POINT(1 1)"}
+                ...     return await client.geospatial_async.compute(
+                ...         output={"geometry": {"stTransform": {"geometry": geometry, "srid": 23031}}}
+                ...     )
+        """
+        return await self._run(
+            self._geospatial.compute,
+            sub_computes=sub_computes,
+            from_feature_type=from_feature_type,
+            left_joins=left_joins,
+            filter=filter,
+            group_by=group_by,
+            order_by=order_by,
+            output=output,
+            into_feature_type=into_feature_type,
+            binary_output=binary_output,
+            binary_output_file=binary_output_file,
+            columnar=columnar,
+        )
+
+    async def stream_features(
+        self,
+        feature_type_external_id: str,
+        filter: dict[str, Any],
+        properties: dict[str, Any] | None = None,
+        allow_crs_transformation: bool = False,
+        partitioning: FeaturePartitioning | None = None,
+        json_decoder: Callable[[bytes], Any] | None = None,
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+        lazy: bool = False,
+        batch_size: int = 1000,
+        array_geometries: bool = False,
+    ) -> AsyncIterator[Feature | LazyFeature]:
+        """`Stream features`, see :meth:`ExperimentalGeospatialAPI.stream_features`
+
+        The features are read from the connection by the shared thread pool, `batch_size` features at a time, and
+        yielded from the event loop.
+
+        Args:
+            feature_type_external_id (str): the feature type to search for
+            filter (dict[str, Any]): the search filter
+            properties (dict[str, Any] | None): the output property selection
+            allow_crs_transformation (bool): If true, then input geometries will be transformed into the Coordinate
+                Reference System defined in the feature type specification.
+            partitioning (FeaturePartitioning | None): split the search into partitions streamed concurrently
+            json_decoder (Callable[[bytes], Any] | None): function decoding one line of the stream
+            read_chunk_size (int): number of bytes read from the connection at a time
+            lazy (bool): yield `LazyFeature` objects decoded on first access
+            batch_size (int): number of features read by the thread pool at a time
+            array_geometries (bool): load the WKT geometries into `ArrayGeometry` objects
+
+        Yields:
+            Feature | LazyFeature: the features matching the filter
+
+        Examples:
+
+            Stream features in a coroutine:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> async def count_wells():
+                ...     count = 0
+                ...     async for feature in client.geospatial_async.stream_features("wells", filter={}):
+                ...         count += 1
+                ...     return count
+        """
+        features = self._geospatial.stream_features(
+            feature_type_external_id,
+            filter,
+            properties=properties,
+            allow_crs_transformation=allow_crs_transformation,
+            partitioning=partitioning,
+            json_decoder=json_decoder,
+            read_chunk_size=read_chunk_size,
+            lazy=lazy,
+            array_geometries=array_geometries,
+        )
+        try:
+            while batch := await self._run(_take, features, batch_size):
+                for feature in batch:
+                    yield feature
+        finally:
+            await self._run(features.close)
+
+    async def upsert_features(
+        self,
+        feature_type_external_id: str,
+        features: Feature | Sequence[Feature] | Iterable[Feature] | AsyncIterable[Feature],
+        allow_crs_transformation: bool = False,
+        chunk_size: int | None = None,
+        max_concurrency: int | None = None,
+        return_features: bool = True,
+    ) -> Feature | FeatureList | None:
+        """`Upsert features`, see :meth:`ExperimentalGeospatialAPI.upsert_features`
+
+        The features are split in chunks, and at most `max_concurrency` chunks are upserted at a time. Features are
+        read from the (async) iterable only as chunks complete.
+
+        Args:
+            feature_type_external_id (str): Feature type definition for the features to create.
+            features (Feature | Sequence[Feature] | Iterable[Feature] | AsyncIterable[Feature]): the features to upsert
+            allow_crs_transformation (bool): If true, then input geometries will be transformed into the Coordinate
+                Reference System defined in the feature type specification.
+            chunk_size (int): maximum number of features in a single request to the api
+            max_concurrency (int): maximum number of concurrent requests, defaults to the client max_workers
+            return_features (bool): return the upserted features, or None to avoid collecting them
+
+        Returns:
+            Feature | FeatureList | None: the upserted feature(s)
+
+        Examples:
+
+            Upsert features from an async generator:
+
+                >>> from cognite.experimental import CogniteClient
+                >>> client = CogniteClient()
+                >>> async def upsert_wells(wells):
+                ...     features = (Feature(external_id=well.id, location=well.location) async for well in wells)
+                ...     await client.geospatial_async.upsert_features("wells", features, return_features=False)
+        """
+        geospatial = self._geospatial
+        if chunk_size is not None and (chunk_size < 1 or chunk_size > geospatial._CREATE_LIMIT):
+            raise ValueError(f"The chunk_size must be strictly positive and not exceed {geospatial._CREATE_LIMIT}")
+        if isinstance(features, Feature):
+            res = await self.upsert_features(
+                feature_type_external_id, [features], allow_crs_transformation, return_features=return_features
+            )
+            return res[0] if res is not None else None
+
+        resource_path = geospatial._feature_resource_path(feature_type_external_id) + "/upsert"
+        extra_body_fields = {"allowCrsTransformation": "true"} if allow_crs_transformation else {}
+
+        def upsert_chunk(chunk: list[Feature]) -> list[dict[str, Any]]:
+            items = [feature.dump(camel_case=True) for feature in chunk]
+            return geospatial._post(resource_path, json={"items": items, **extra_body_fields}).json()["items"]
+
+        max_concurrency = max_concurrency or self._max_workers
+        # The chunks complete in any order, their items are returned in the order of the chunks
+        upserted: dict[int, list[dict[str, Any]]] = {}
+        in_flight: dict[asyncio.Future, int] = {}
+
+        async def collect(return_when: str) -> None:
+            done, _ = await asyncio.wait(in_flight, return_when=return_when)
+            for task in done:
+                index = in_flight.pop(task)
+                items = task.result()
+                if return_features:
+                    upserted[index] = items
+
+        try:
+            index = 0
+            async for chunk in _aiter_chunks(features, chunk_size or geospatial._CREATE_LIMIT):
+                if len(in_flight) >= max_concurrency:
+                    await collect(asyncio.FIRST_COMPLETED)
+                in_flight[asyncio.ensure_future(self._run(upsert_chunk, chunk))] = index
+                index += 1
+            if in_flight:
+                await collect(asyncio.ALL_COMPLETED)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        if not return_features:
+            return None
+        items = [item for index in sorted(upserted) for item in upserted[index]]
+        return FeatureList._load(items, cognite_client=geospatial._cognite_client)
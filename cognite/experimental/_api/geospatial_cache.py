@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterator
+
+_FEATURE_TYPE_KEYS = ("fromFeatureType", "featureType")
+
+
+def compute_cache_key(body: dict[str, Any] | str, project: str, cognite_domain: str | None) -> str:
+    """A content address of a compute request: the hash of its canonical JSON body, project and domain.
+
+    A body already serialized is hashed as is, so it only matches the same serialization.
+    """
+    canonical = json.dumps(
+        {"project": project, "domain": cognite_domain, "body": body},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def referenced_feature_types(body: Any) -> set[str]:
+    """The feature types read by a compute request, at any depth of its body."""
+    found: set[str] = set()
+    stack = [body]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in _FEATURE_TYPE_KEYS and isinstance(item, str):
+                    found.add(item)
+                else:
+                    stack.append(item)
+        elif isinstance(value, list):
+            stack.extend(value)
+    return found
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires", "feature_types", "path")
+
+    def __init__(self, value: Any, size: int, expires: float | None, feature_types: set[str], path: Path | None = None):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.feature_types = feature_types
+        self.path = path
+
+
+class ComputeCache:
+    """A least recently used cache of compute results, with a time to live and a size cap in bytes.
+
+    JSON results are kept in memory. Binary results (GeoTIFF) are written to `directory` when one is given, and can be
+    reused by later processes, otherwise they are kept in memory too. Each storage evicts its least recently used
+    entries beyond its byte cap.
+
+    Args:
+        max_bytes (int): maximum size of the results kept in memory.
+        ttl (float | None): number of seconds a result stays valid, forever if None.
+        directory (str | Path | None): directory where binary results are persisted.
+        max_disk_bytes (int): maximum size of the binary results persisted to `directory`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float | None = None,
+        directory: str | Path | None = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, _Entry] = OrderedDict()
+        self._disk: OrderedDict[str, _Entry] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load_directory()
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._disk)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._memory_bytes + self._disk_bytes
+
+    def get(self, key: str) -> Any | None:
+        """The cached result for the key, or None. Binary results are returned as bytes, JSON results as a copy."""
+        with self._lock:
+            for storage in (self._memory, self._disk):
+                entry = storage.get(key)
+                if entry is None:
+                    continue
+                if entry.expires is not None and entry.expires < time.time():
+                    self._remove(storage, key)
+                    break
+                storage.move_to_end(key)
+                self.hits += 1
+                if entry.path is not None:
+                    try:
+                        return entry.path.read_bytes()
+                    except OSError:
+                        self._remove(storage, key)
+                        self.hits -= 1
+                        break
+                return copy.deepcopy(entry.value)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: bytes | list[dict[str, Any]], size: int, feature_types: set[str]) -> None:
+        """Cache the result of a compute request, `size` being its size in bytes."""
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._remove(self._memory, key)
+            self._remove(self._disk, key)
+            if isinstance(value, bytes) and self.directory is not None:
+                if size > self.max_disk_bytes:
+                    return
+                path = self.directory / f"{key}.tiff"
+                path.write_bytes(value)
+                self._metadata_path(key).write_text(
+                    json.dumps({"featureTypes": sorted(feature_types), "expires": expires})
+                )
+                self._disk[key] = _Entry(None, size, expires, feature_types, path)
+                self._disk_bytes += size
+                self._evict(self._disk, self.max_disk_bytes)
+            elif size <= self.max_bytes:
+                # Copied, as the caller keeps the value
+                self._memory[key] = _Entry(copy.deepcopy(value), size, expires, feature_types)
+                self._memory_bytes += size
+                self._evict(self._memory, self.max_bytes)
+
+    def invalidate(self, feature_type: str | None = None) -> int:
+        """Drop the results computed from the feature type, or all results if None. Returns the number dropped."""
+        with self._lock:
+            dropped = 0
+            for storage in (self._memory, self._disk):
+                keys = [
+                    key for key, entry in storage.items() if feature_type is None or feature_type in entry.feature_types
+                ]
+                for key in keys:
+                    self._remove(storage, key)
+                dropped += len(keys)
+            return dropped
+
+    def clear(self) -> None:
+        self.invalidate()
+        self.hits = self.misses = 0
+
+    def _metadata_path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.json"
+
+    def _remove(self, storage: OrderedDict[str, _Entry], key: str) -> None:
+        entry = storage.pop(key, None)
+        if entry is None:
+            return
+        if storage is self._memory:
+            self._memory_bytes -= entry.size
+            return
+        self._disk_bytes -= entry.size
+        for path in (entry.path, self._metadata_path(key)):
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+    def _evict(self, storage: OrderedDict[str, _Entry], max_bytes: int) -> None:
+        while (self._memory_bytes if storage is self._memory else self._disk_bytes) > max_bytes:
+            self._remove(storage, next(iter(storage)))
+
+    def _iter_persisted(self) -> Iterator[tuple[str, Path, dict[str, Any]]]:
+        assert self.directory is not None
+        # Oldest first, so that the most recently written results are evicted last
+        for path in sorted(self.directory.glob("*.tiff"), key=lambda p: p.stat().st_mtime):
+            try:
+                metadata = json.loads(self._metadata_path(path.stem).read_text())
+            except (OSError, ValueError):
+                continue
+            yield path.stem, path, metadata
+
+    def _load_directory(self) -> None:
+        now = time.time()
+        for key, path, metadata in self._iter_persisted():
+            entry = _Entry(None, path.stat().st_size, metadata.get("expires"), set(metadata["featureTypes"]), path)
+            self._disk[key] = entry
+            self._disk_bytes += entry.size
+            if entry.expires is not None and entry.expires < now:
+                self._remove(self._disk, key)
+        self._evict(self._disk, self.max_disk_bytes)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import TYPE_CHECKING, Any, Sequence
+
+from cognite.client.utils import _json
+from cognite.experimental._api.geospatial_cache import referenced_feature_types
+from cognite.experimental.data_classes.geospatial import ComputedItemList, ComputeParameter
+
+if TYPE_CHECKING:
+    from cognite.experimental._api.geospatial import ExperimentalGeospatialAPI
+
+# Parameters are serialized as a string delimited by NUL characters, then the serialized body is split around them
+_PARAMETER_MARK = "\x00"
+_PARAMETER_TOKEN = re.compile(r'"\\u0000(\w+)\\u0000"')
+
+
+def _output_name(index: int) -> str:
+    return f"r{index}"
+
+
+def _sub_compute_name(index: int, name: str) -> str:
+    return f"s{index}_{name}"
+
+
+def _rename_refs(expression: Any, renames: dict[str, str]) -> Any:
+    if isinstance(expression, dict):
+        ref = expression.get("ref")
+        if len(expression) == 1 and isinstance(ref, str) and ref in renames:
+            return {"ref": renames[ref]}
+        return {key: _rename_refs(value, renames) for key, value in expression.items()}
+    if isinstance(expression, list):
+        return [_rename_refs(value, renames) for value in expression]
+    return expression
+
+
+def pack_compute_batch(
+    outputs: Sequence[dict[str, Any]],
+    sub_computes: Sequence[dict[str, Any] | None] | None,
+    shared_sub_computes: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """Pack independent compute expressions into the body of one compute request.
+
+    Expression i becomes the output property "r{i}". Its sub computes are renamed "s{i}_{name}", and the references
+    to them in the expression and in its other sub computes follow, so that expressions can't see each other's.
+    """
+    packed_outputs: dict[str, Any] = {}
+    packed_sub_computes: dict[str, Any] = dict(shared_sub_computes or {})
+    for index, output in enumerate(outputs):
+        own = sub_computes[index] if sub_computes is not None else None
+        if own:
+            renames = {name: _sub_compute_name(index, name) for name in own}
+            for name, sub_compute in own.items():
+                packed_sub_computes[renames[name]] = _rename_refs(sub_compute, renames)
+            output = _rename_refs(output, renames)
+        packed_outputs[_output_name(index)] = output
+    body: dict[str, Any] = {"output": packed_outputs}
+    if packed_sub_computes:
+        body["subComputes"] = packed_sub_computes
+    return body
+
+
+def unpack_compute_batch(items: list[dict[str, Any]], body: dict[str, Any]) -> list[Any]:
+    """The value of each packed expression, in the order they were packed."""
+    if len(items) != 1:
+        raise ValueError(f"Expected one computed item for a packed compute request, got {len(items)}")
+    (item,) = items
+    return [item.get(_output_name(index)) for index in range(len(body["output"]))]
+
+
+def _dump_parameter(value: Any) -> str:
+    if isinstance(value, ComputeParameter):
+        return f"{_PARAMETER_MARK}{value.name}{_PARAMETER_MARK}"
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ComputeTemplate:
+    """A compute request serialized once, with :class:`ComputeParameter` placeholders substituted on each call.
+
+    Calling the template only serializes the parameter values and joins them with the pre-serialized parts of the
+    body, instead of rebuilding and serializing the whole body. Create it with
+    :meth:`ExperimentalGeospatialAPI.compile_compute`.
+
+    Args:
+        geospatial (ExperimentalGeospatialAPI): the API making the requests.
+        body (dict[str, Any]): the compute request body, with parameters at any depth.
+    """
+
+    def __init__(self, geospatial: ExperimentalGeospatialAPI, body: dict[str, Any]):
+        self._geospatial = geospatial
+        serialized = json.dumps(body, separators=(",", ":"), allow_nan=False, default=_dump_parameter)
+        parts = _PARAMETER_TOKEN.split(serialized)
+        # Literal parts at even indexes, parameter names at odd indexes
+        self._literals = parts[::2]
+        self._names = parts[1::2]
+        self.parameters = frozenset(self._names)
+        self._into_feature_type = "intoFeatureType" in body
+        self._feature_types = referenced_feature_types(body)
+
+    def __repr__(self) -> str:
+        return f"ComputeTemplate(parameters={sorted(self.parameters)})"
+
+    def render(self, **parameters: Any) -> str:
+        """The JSON body of the request with the given parameter values."""
+        if parameters.keys() != self.parameters:
+            missing = sorted(self.parameters - parameters.keys())
+            unknown = sorted(parameters.keys() - self.parameters)
+            raise ValueError(f"Compute parameters mismatch, missing: {missing}, unknown: {unknown}")
+        literals = self._literals
+        chunks = [literals[0]]
+        for name, literal in zip(self._names, literals[1:]):
+            chunks.append(_json.dumps(parameters[name], allow_nan=False))
+            chunks.append(literal)
+        return "".join(chunks)
+
+    def __call__(self, **parameters: Any) -> bytes | ComputedItemList | None:
+        """Compute with the given parameter values, see :meth:`ExperimentalGeospatialAPI.compute`
+
+        Returns:
+            bytes | ComputedItemList | None: the computed items, the binary output, or None when computing into a
+            feature type
+        """
+        geospatial = self._geospatial
+        res = geospatial._send_compute(self.render(**parameters), self._into_feature_type, self._feature_types)
+        if isinstance(res, list):
+            return ComputedItemList._load(res, cognite_client=geospatial._cognite_client)
+        return res
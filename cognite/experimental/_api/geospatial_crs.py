@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+from cognite.client.utils._importing import local_import
+
+if TYPE_CHECKING:
+    import numpy as np
+
+WGS84 = 4326
+WEB_MERCATOR = 3857
+
+_SRID_PREFIX = re.compile(r"^\s*SRID=(\d+)\s*;", re.IGNORECASE)
+
+# WGS84 ellipsoid, and the radius of the sphere of Web Mercator
+_A = 6378137.0
+_F = 1 / 298.257223563
+_E = math.sqrt(_F * (2 - _F))
+_N = _F / (2 - _F)
+
+# Universal Transverse Mercator, with the 6th order series of Krüger (Karney, 2011), accurate to a few nanometers
+_UTM_SCALE = 0.9996
+_UTM_FALSE_EASTING = 500_000.0
+_UTM_FALSE_NORTHING_SOUTH = 10_000_000.0
+_RECTIFYING_RADIUS = _A / (1 + _N) * (1 + _N**2 / 4 + _N**4 / 64 + _N**6 / 256)
+_ALPHA = (
+    _N / 2 - 2 * _N**2 / 3 + 5 * _N**3 / 16 + 41 * _N**4 / 180 - 127 * _N**5 / 288 + 7891 * _N**6 / 37800,
+    13 * _N**2 / 48 - 3 * _N**3 / 5 + 557 * _N**4 / 1440 + 281 * _N**5 / 630 - 1983433 * _N**6 / 1935360,
+    61 * _N**3 / 240 - 103 * _N**4 / 140 + 15061 * _N**5 / 26880 + 167603 * _N**6 / 181440,
+    49561 * _N**4 / 161280 - 179 * _N**5 / 168 + 6601661 * _N**6 / 7257600,
+    34729 * _N**5 / 80640 - 3418889 * _N**6 / 1995840,
+    212378941 * _N**6 / 319334400,
+)
+_BETA = (
+    _N / 2 - 2 * _N**2 / 3 + 37 * _N**3 / 96 - _N**4 / 360 - 81 * _N**5 / 512 + 96199 * _N**6 / 604800,
+    _N**2 / 48 + _N**3 / 15 - 437 * _N**4 / 1440 + 46 * _N**5 / 105 - 1118711 * _N**6 / 3870720,
+    17 * _N**3 / 480 - 37 * _N**4 / 840 - 209 * _N**5 / 4480 + 5569 * _N**6 / 90720,
+    4397 * _N**4 / 161280 - 11 * _N**5 / 504 - 830251 * _N**6 / 7257600,
+    4583 * _N**5 / 161280 - 108847 * _N**6 / 3991680,
+    20648693 * _N**6 / 638668800,
+)
+
+
+def utm_zone(srid: int) -> tuple[int, bool] | None:
+    """The zone and hemisphere, True for north, of a WGS84 UTM SRID, or None for other SRIDs."""
+    if 32601 <= srid <= 32660:
+        return srid - 32600, True
+    if 32701 <= srid <= 32760:
+        return srid - 32700, False
+    return None
+
+
+def is_supported(srid: int) -> bool:
+    """Whether coordinates can be transformed locally from and to the SRID."""
+    return srid in (WGS84, WEB_MERCATOR) or utm_zone(srid) is not None
+
+
+def _central_meridian(zone: int) -> float:
+    return math.radians(zone * 6 - 183)
+
+
+def _mercator_forward(lon: np.ndarray, lat: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    np = local_import("numpy")
+    return _A * lon, _A * np.arcsinh(np.tan(lat))
+
+
+def _mercator_inverse(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    np = local_import("numpy")
+    return x / _A, np.arctan(np.sinh(y / _A))
+
+
+def _utm_forward(lon: np.ndarray, lat: np.ndarray, zone: int, north: bool) -> tuple[np.ndarray, np.ndarray]:
+    np = local_import("numpy")
+    # Longitude from the central meridian, in [-pi, pi) for the zones next to the antimeridian
+    dlon = (lon - _central_meridian(zone) + math.pi) % (2 * math.pi) - math.pi
+    sin_lat = np.sin(lat)
+    # Conformal latitude, as its tangent
+    tau = np.sinh(np.arctanh(sin_lat) - _E * np.arctanh(_E * sin_lat))
+    xi_prime = np.arctan2(tau, np.cos(dlon))
+    eta_prime = np.arctanh(np.sin(dlon) / np.sqrt(1 + tau**2))
+    xi, eta = xi_prime.copy(), eta_prime.copy()
+    for j, alpha in enumerate(_ALPHA, start=1):
+        xi += alpha * np.sin(2 * j * xi_prime) * np.cosh(2 * j * eta_prime)
+        eta += alpha * np.cos(2 * j * xi_prime) * np.sinh(2 * j * eta_prime)
+    easting = _UTM_FALSE_EASTING + _UTM_SCALE * _RECTIFYING_RADIUS * eta
+    northing = _UTM_SCALE * _RECTIFYING_RADIUS * xi
+    return easting, northing if north else northing + _UTM_FALSE_NORTHING_SOUTH
+
+
+def _utm_inverse(easting: np.ndarray, northing: np.ndarray, zone: int, north: bool) -> tuple[np.ndarray, np.ndarray]:
+    np = local_import("numpy")
+    if not north:
+        northing = northing - _UTM_FALSE_NORTHING_SOUTH
+    xi = northing / (_UTM_SCALE * _RECTIFYING_RADIUS)
+    eta = (easting - _UTM_FALSE_EASTING) / (_UTM_SCALE * _RECTIFYING_RADIUS)
+    xi_prime, eta_prime = xi.copy(), eta.copy()
+    for j, beta in enumerate(_BETA, start=1):
+        xi_prime -= beta * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+        eta_prime -= beta * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+    tau_prime = np.sin(xi_prime) / np.sqrt(np.sinh(eta_prime) ** 2 + np.cos(xi_prime) ** 2)
+    # Newton iterations from the conformal latitude to the geodetic latitude, which converge in 2 or 3 steps
+    tau = tau_prime.copy()
+    for _ in range(4):
+        sigma = np.sinh(_E * np.arctanh(_E * tau / np.sqrt(1 + tau**2)))
+        tau_i = tau * np.sqrt(1 + sigma**2) - sigma * np.sqrt(1 + tau**2)
+        tau += (
+            (tau_prime - tau_i)
+            / np.sqrt(1 + tau_i**2)
+            * (1 + (1 - _E**2) * tau**2)
+            / ((1 - _E**2) * np.sqrt(1 + tau**2))
+        )
+    lon = _central_meridian(zone) + np.arctan2(np.sinh(eta_prime), np.cos(xi_prime))
+    return (lon + math.pi) % (2 * math.pi) - math.pi, np.arctan(tau)
+
+
+def _to_radians(x: np.ndarray, y: np.ndarray, srid: int) -> tuple[np.ndarray, np.ndarray]:
+    np = local_import("numpy")
+    if srid == WGS84:
+        return np.radians(x), np.radians(y)
+    if srid == WEB_MERCATOR:
+        return _mercator_inverse(x, y)
+    zone = utm_zone(srid)
+    if zone is None:
+        raise ValueError(f"SRID {srid} is not supported locally")
+    return _utm_inverse(x, y, *zone)
+
+
+def _from_radians(lon: np.ndarray, lat: np.ndarray, srid: int) -> tuple[np.ndarray, np.ndarray]:
+    np = local_import("numpy")
+    if srid == WGS84:
+        return np.degrees(lon), np.degrees(lat)
+    if srid == WEB_MERCATOR:
+        return _mercator_forward(lon, lat)
+    zone = utm_zone(srid)
+    if zone is None:
+        raise ValueError(f"SRID {srid} is not supported locally")
+    return _utm_forward(lon, lat, *zone)
+
+
+def transform_coordinates(coordinates: np.ndarray, from_srid: int, to_srid: int) -> np.ndarray:
+    """Transform coordinates between WGS84 (4326), Web Mercator (3857) and WGS84 UTM zones (326xx and 327xx).
+
+    Longitudes are the x coordinates. The transformation goes through geographic coordinates, and other dimensions
+    are kept as they are.
+
+    Args:
+        coordinates (np.ndarray): the coordinates, of shape (n, 2) or (n, 3).
+        from_srid (int): the SRID of the coordinates.
+        to_srid (int): the SRID to transform the coordinates to.
+
+    Returns:
+        np.ndarray: the transformed coordinates, of the same shape
+    """
+    np = local_import("numpy")
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    if from_srid == to_srid:
+        return coordinates.copy()
+    transformed = coordinates.copy()
+    lon, lat = _to_radians(coordinates[:, 0], coordinates[:, 1], from_srid)
+    transformed[:, 0], transformed[:, 1] = _from_radians(lon, lat, to_srid)
+    return transformed
+
+
+def split_ewkt(geometry: str | dict[str, Any]) -> tuple[int | None, str]:
+    """The SRID of an EWKT geometry, None if it has none, and its WKT."""
+    if isinstance(geometry, dict):
+        geometry = geometry["ewkt"] if "ewkt" in geometry else geometry["wkt"]
+    match = _SRID_PREFIX.match(geometry)
+    if match is None:
+        return None, geometry
+    return int(match.group(1)), geometry[match.end() :]
+
+
+def transform_wkts(
+    geometries: Sequence[str | dict[str, Any]],
+    to_srid: int,
+    fallback: Callable[[list[str], int], list[str]],
+) -> list[str]:
+    """Transform EWKT geometries to an SRID, all those of each source SRID at once.
+
+    Geometries in supported SRIDs are parsed with shapely, and the coordinates of all the geometries of a source SRID
+    are transformed as one array. The others are passed as EWKT to `fallback`, which returns their WKT in the target
+    SRID.
+
+    Args:
+        geometries (Sequence[str | dict[str, Any]]): EWKT strings, or `{"ewkt": ...}` or `{"wkt": ...}` values.
+            Geometries without SRID are assumed to be in the target SRID.
+        to_srid (int): the SRID to transform the geometries to.
+        fallback (Callable[[list[str], int], list[str]]): transforms the EWKT of the other geometries.
+
+    Returns:
+        list[str]: the WKT of the transformed geometries, without SRID
+    """
+    np, shapely = local_import("numpy", "shapely")
+    wkts: list[str] = []
+    by_srid: dict[int, list[int]] = {}
+    for i, geometry in enumerate(geometries):
+        srid, wkt = split_ewkt(geometry)
+        wkts.append(wkt)
+        if srid is not None and srid != to_srid:
+            by_srid.setdefault(srid, []).append(i)
+
+    for from_srid, indices in by_srid.items():
+        if is_supported(from_srid) and is_supported(to_srid):
+            geometry_array = shapely.from_wkt(np.array([wkts[i] for i in indices], dtype=object))
+            has_z = shapely.has_z(geometry_array)
+            for include_z in (False, True):
+                # Transformed in two arrays, as the coordinates of all the geometries have 2 or 3 dimensions
+                selected = has_z == include_z
+                if selected.any():
+                    geometry_array[selected] = shapely.transform(
+                        geometry_array[selected],
+                        lambda coordinates: transform_coordinates(coordinates, from_srid, to_srid),
+                        include_z=include_z,
+                    )
+            results = shapely.to_wkt(geometry_array, rounding_precision=-1).tolist()
+        else:
+            results = fallback([f"SRID={from_srid};{wkts[i]}" for i in indices], to_srid)
+        for i, result in zip(indices, results):
+            wkts[i] = result
+    return wkts
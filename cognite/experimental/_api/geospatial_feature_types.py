@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from typing import Any, Iterable
+
+from cognite.experimental.data_classes.geospatial import FeatureType
+
+# Selects the feature types of all domains, None being the default domain
+ALL_DOMAINS = object()
+
+
+def _copy(feature_type: FeatureType) -> FeatureType:
+    return type(feature_type)._load(copy.deepcopy(feature_type.dump(camel_case=True)), feature_type._cognite_client)
+
+
+class _Entry:
+    __slots__ = ("feature_type", "expires")
+
+    def __init__(self, feature_type: FeatureType, expires: float | None):
+        self.feature_type = feature_type
+        self.expires = expires
+
+
+class FeatureTypeCache:
+    """A cache of feature types, by cognite domain and external id, valid for a time to live.
+
+    Expired feature types are kept to be revalidated: when the service returns a feature type with the same
+    `last_updated_time`, the cached feature type is kept and only its time to live renewed. The cache holds copies of
+    the feature types it is given and returns copies of them, so callers may modify the objects they get.
+
+    Args:
+        ttl (float | None): number of seconds a feature type stays valid, until invalidated if None.
+    """
+
+    def __init__(self, ttl: float | None = 300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: dict[tuple[str | None, str], _Entry] = {}
+        self._listings: dict[str | None, tuple[list[str], float | None]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expires(self) -> float | None:
+        return time.time() + self.ttl if self.ttl is not None else None
+
+    @staticmethod
+    def _is_fresh(expires: float | None) -> bool:
+        return expires is None or expires >= time.time()
+
+    def lookup(
+        self, cognite_domain: str | None, external_ids: Iterable[str]
+    ) -> tuple[dict[str, FeatureType], list[str]]:
+        """The valid feature types among the external ids, and the external ids to retrieve."""
+        found: dict[str, FeatureType] = {}
+        to_retrieve: dict[str, None] = {}
+        with self._lock:
+            for external_id in external_ids:
+                entry = self._entries.get((cognite_domain, external_id))
+                if entry is not None and self._is_fresh(entry.expires):
+                    found[external_id] = _copy(entry.feature_type)
+                    self.hits += 1
+                elif external_id not in to_retrieve:
+                    to_retrieve[external_id] = None
+                    self.misses += 1
+        return found, list(to_retrieve)
+
+    def store(self, cognite_domain: str | None, feature_types: Iterable[FeatureType]) -> list[FeatureType]:
+        """Cache retrieved feature types, returning copies of the cached ones, which are kept for unchanged feature types."""
+        expires = self._expires()
+        stored = []
+        with self._lock:
+            for feature_type in feature_types:
+                key = (cognite_domain, feature_type.external_id)
+                entry = self._entries.get(key)
+                if (
+                    entry is not None
+                    and feature_type.last_updated_time is not None
+                    and entry.feature_type.last_updated_time == feature_type.last_updated_time
+                ):
+                    self.revalidations += 1
+                    entry.expires = expires
+                else:
+                    entry = self._entries[key] = _Entry(_copy(feature_type), expires)
+                stored.append(_copy(entry.feature_type))
+        return stored
+
+    def listing(self, cognite_domain: str | None) -> list[FeatureType] | None:
+        """All the feature types of the domain, if they were listed within the time to live."""
+        with self._lock:
+            listing = self._listings.get(cognite_domain)
+            if listing is None or not self._is_fresh(listing[1]):
+                self.misses += 1
+                return None
+            external_ids, _ = listing
+            entries = [self._entries.get((cognite_domain, external_id)) for external_id in external_ids]
+            if any(entry is None for entry in entries):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [_copy(entry.feature_type) for entry in entries if entry is not None]
+
+    def store_listing(self, cognite_domain: str | None, feature_types: Iterable[FeatureType]) -> list[FeatureType]:
+        """Cache all the feature types of the domain, dropping the ones which no longer exist."""
+        stored = self.store(cognite_domain, feature_types)
+        external_ids = [feature_type.external_id for feature_type in stored]
+        with self._lock:
+            listed = set(external_ids)
+            for key in [key for key in self._entries if key[0] == cognite_domain and key[1] not in listed]:
+                del self._entries[key]
+            self._listings[cognite_domain] = (external_ids, self._expires())
+        return stored
+
+    def invalidate(self, external_ids: Iterable[str] | None = None, cognite_domain: Any = ALL_DOMAINS) -> int:
+        """Drop feature types, all of them if `external_ids` is None, and the listings of their domains.
+
+        Args:
+            external_ids (Iterable[str] | None): the feature types to drop, or None for all.
+            cognite_domain (str | None): the domain of the feature types, all domains by default.
+
+        Returns:
+            int: the number of feature types dropped
+        """
+        selected = set(external_ids) if external_ids is not None else None
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if (cognite_domain is ALL_DOMAINS or key[0] == cognite_domain)
+                and (selected is None or key[1] in selected)
+            ]
+            for key in keys:
+                del self._entries[key]
+            for domain in list(self._listings):
+                if cognite_domain is ALL_DOMAINS or domain == cognite_domain:
+                    del self._listings[domain]
+            return len(keys)
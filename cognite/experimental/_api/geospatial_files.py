@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+import mmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from cognite.client.data_classes.geospatial import _is_geometry_type
+from cognite.client.utils._importing import local_import
+from cognite.experimental._api.geospatial_streaming import default_json_decoder
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FILE_FORMATS = {
+    ".geojson": "geojson",
+    ".json": "geojson",
+    ".ndjson": "ndjson",
+    ".geojsonl": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "geoparquet",
+    ".geoparquet": "geoparquet",
+}
+
+_GENERATED_PROPERTIES = {"externalId", "dataSetId", "assetIds", "createdTime", "lastUpdatedTime"}
+
+
+def detect_file_format(path: Path, file_format: str | None) -> str:
+    if file_format is not None:
+        if file_format not in set(FILE_FORMATS.values()):
+            raise ValueError(f"file_format must be one of {sorted(set(FILE_FORMATS.values()))}, got {file_format!r}")
+        return file_format
+    try:
+        return FILE_FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Can't detect the format of {path.name}, pass file_format explicitly") from None
+
+
+def geometry_properties(schema: dict[str, Any]) -> list[str]:
+    return [name for name, spec in schema.items() if _is_geometry_type(spec["type"])]
+
+
+def default_geometry_property(schema: dict[str, Any]) -> str:
+    candidates = geometry_properties(schema)
+    if len(candidates) != 1:
+        raise ValueError(f"Can't choose the geometry property among {candidates}, pass geometry_property explicitly")
+    return candidates[0]
+
+
+def _wkt_value(wkt: str) -> dict[str, str]:
+    return {"ewkt": wkt} if wkt.startswith("SRID=") else {"wkt": wkt}
+
+
+def _to_bool(value: Any) -> Any:
+    if isinstance(value, str):
+        return {"true": True, "false": False, "1": True, "0": False}.get(value.strip().lower(), value)
+    return value
+
+
+def _to_float(value: Any) -> Any:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        # Kept as it is, for the validation to reject the feature
+        return value
+
+
+def _to_int(value: Any) -> Any:
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _convert_numbers(series: pd.Series, integer: bool) -> pd.Series:
+    pd = local_import("pandas")
+    numbers = pd.to_numeric(series, errors="coerce")
+    valid = numbers.notna()
+    if integer:
+        valid &= numbers % 1 == 0
+    if valid.sum() == series.notna().sum():
+        return numbers.astype("Int64" if integer else "float64")
+    # The cells which aren't numbers are kept as they are, for the validation to reject their feature
+    converted = series.astype(object)
+    converted[valid] = numbers[valid].map(int if integer else float).astype(object)
+    return converted
+
+
+def _convert_column(series: pd.Series, property_type: str) -> pd.Series:
+    if property_type in ("DOUBLE", "FLOAT"):
+        return _convert_numbers(series, integer=False)
+    if property_type in ("LONG", "INT"):
+        return _convert_numbers(series, integer=True)
+    if property_type == "BOOLEAN":
+        return series.map(_to_bool, na_action="ignore")
+    if property_type == "JSON":
+        return series.map(json.loads, na_action="ignore")
+    if _is_geometry_type(property_type):
+        return series.map(_wkt_value, na_action="ignore")
+    return series
+
+
+def _is_missing(value: Any) -> bool:
+    # Only scalars are tested, the cells of list columns are arrays
+    np, pd = local_import("numpy", "pandas")
+    return value is None or value is pd.NA or (np.isscalar(value) and pd.isna(value))
+
+
+def _cell_value(value: Any) -> Any:
+    # The cells of list columns read from Parquet are NumPy arrays, of arrays for nested lists
+    np = local_import("numpy")
+    if isinstance(value, np.ndarray):
+        return [_cell_value(element) for element in value] if value.dtype == object else value.tolist()
+    return value
+
+
+def frame_to_items(frame: pd.DataFrame, schema: dict[str, Any], external_id_column: str) -> list[dict[str, Any]]:
+    """Convert a dataframe to features in the API format, converting each column at once according to the schema."""
+    frame = frame.rename(columns={external_id_column: "externalId"})
+    for name in frame.columns:
+        if name in schema and name not in _GENERATED_PROPERTIES:
+            frame[name] = _convert_column(frame[name], schema[name]["type"])
+    return [
+        {key: _cell_value(value) for key, value in row.items() if not _is_missing(value)}
+        for row in frame.to_dict("records")
+    ]
+
+
+def make_record_converter(schema: dict[str, Any]) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Build a function converting the properties of one JSON feature according to the schema."""
+    converters: dict[str, Callable[[Any], Any]] = {}
+    for name, spec in schema.items():
+        if spec["type"] in ("DOUBLE", "FLOAT"):
+            converters[name] = _to_float
+        elif spec["type"] in ("LONG", "INT"):
+            converters[name] = _to_int
+        elif spec["type"] == "BOOLEAN":
+            converters[name] = _to_bool
+        elif _is_geometry_type(spec["type"]):
+            converters[name] = lambda value: _wkt_value(value) if isinstance(value, str) else value
+
+    def convert(properties: dict[str, Any]) -> dict[str, Any]:
+        return {
+            key: converters[key](value) if key in converters else value
+            for key, value in properties.items()
+            if value is not None
+        }
+
+    return convert
+
+
+def geojson_feature_to_item(
+    feature: dict[str, Any], geometry_property: str, convert: Callable[[dict[str, Any]], dict[str, Any]]
+) -> dict[str, Any]:
+    if feature.get("type") != "Feature":
+        # Already in the API format, like the output of stream_features
+        return convert(feature)
+    item = convert(feature.get("properties") or {})
+    if "externalId" not in item and feature.get("id") is not None:
+        item["externalId"] = str(feature["id"])
+    if feature.get("geometry") is not None:
+        item[geometry_property] = feature["geometry"]
+    return item
+
+
+def read_geojson(path: Path, geometry_property: str, schema: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    # A GeoJSON document is decoded at once, new-line delimited GeoJSON is read one feature at a time
+    convert = make_record_converter(schema)
+    collection = default_json_decoder()(path.read_bytes())
+    features = collection["features"] if collection.get("type") == "FeatureCollection" else [collection]
+    for feature in features:
+        yield geojson_feature_to_item(feature, geometry_property, convert)
+
+
+def read_ndjson(path: Path, geometry_property: str, schema: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    convert = make_record_converter(schema)
+    decode = default_json_decoder()
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in iter(mm.readline, b""):
+            if line.strip():
+                yield geojson_feature_to_item(decode(line), geometry_property, convert)
+
+
+def read_csv(
+    path: Path,
+    geometry_property: str,
+    geometry_column: str | None,
+    external_id_column: str,
+    schema: dict[str, Any],
+    batch_size: int,
+) -> Iterator[dict[str, Any]]:
+    pd = local_import("pandas")
+    reader = pd.read_csv(path, chunksize=batch_size, memory_map=True, dtype=str, keep_default_na=False, na_values=[""])
+    for frame in reader:
+        source_column = geometry_column or (geometry_property if geometry_property in frame.columns else "wkt")
+        frame = frame.rename(columns={source_column: geometry_property})
+        yield from frame_to_items(frame, schema, external_id_column)
+
+
+def read_geoparquet(
+    path: Path,
+    geometry_property: str,
+    geometry_column: str | None,
+    external_id_column: str,
+    schema: dict[str, Any],
+    batch_size: int,
+) -> Iterator[dict[str, Any]]:
+    pq, shapely = local_import("pyarrow.parquet", "shapely")
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    geo_metadata = json.loads((parquet_file.schema_arrow.metadata or {}).get(b"geo", b"{}"))
+    source_column = geometry_column or geo_metadata.get("primary_column", "geometry")
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        frame = batch.to_pandas()
+        if source_column in frame.columns:
+            wkt = shapely.to_wkt(shapely.from_wkb(frame.pop(source_column).to_numpy()), rounding_precision=-1)
+            frame[geometry_property] = wkt
+        yield from frame_to_items(frame, schema, external_id_column)
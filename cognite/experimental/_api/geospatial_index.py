@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from cognite.client.data_classes.geospatial import Feature, FeatureList, _to_feature_property_name
+from cognite.client.utils._importing import local_import
+
+if TYPE_CHECKING:
+    import numpy as np
+    import shapely
+
+_SRID_PREFIX = re.compile(r"^\s*SRID=\d+\s*;", re.IGNORECASE)
+
+
+def to_shapely(geometry: Any) -> Any:
+    """A shapely geometry from a geometry value: shapely, `ArrayGeometry`, (E)WKT, `{"wkt": ...}`, GeoJSON or (x, y)."""
+    shapely = local_import("shapely")
+    if isinstance(geometry, shapely.Geometry):
+        return geometry
+    if hasattr(geometry, "__geo_interface__"):
+        return shapely.geometry.shape(geometry)
+    if isinstance(geometry, dict):
+        wkt = geometry.get("wkt", geometry.get("ewkt"))
+        if wkt is None:
+            return shapely.geometry.shape(geometry)
+        geometry = wkt
+    if isinstance(geometry, str):
+        return shapely.from_wkt(_SRID_PREFIX.sub("", geometry))
+    if isinstance(geometry, (tuple, list)) and len(geometry) == 2:
+        return shapely.Point(*geometry)
+    raise TypeError(f"Unsupported geometry: {geometry!r}")
+
+
+class FeatureIndex:
+    """An in-memory spatial index of features, answering spatial queries without requests to the service.
+
+    The geometries are packed in a `shapely.STRtree`, which selects the candidates of a query by their bounding boxes
+    and evaluates the exact predicates on the candidates only. Queries are in the coordinate reference system of the
+    indexed geometries. Create it from a feature type with :meth:`ExperimentalGeospatialAPI.build_feature_index`,
+    which can then :meth:`refresh` it.
+
+    Features without geometry are kept, but never returned by queries. The tree is rebuilt as a whole when features
+    are updated, and replaced at once, so that queries running meanwhile see either the old or the new index.
+
+    Args:
+        features (Iterable[Feature]): the features to index.
+        geometry_property (str): the property holding the geometry of the features.
+        node_capacity (int): maximum number of children of a node of the tree.
+        stream_updated (Callable[[int | None], Iterable[Feature]] | None): function streaming the features
+            updated at or after a `lastUpdatedTime`, or all of them for None, used by :meth:`refresh`.
+    """
+
+    def __init__(
+        self,
+        features: Iterable[Feature],
+        geometry_property: str,
+        node_capacity: int = 16,
+        stream_updated: Callable[[int | None], Iterable[Feature]] | None = None,
+    ):
+        self.geometry_property = geometry_property
+        self.node_capacity = node_capacity
+        self.high_water_mark: int | None = None
+        self._stream_updated = stream_updated
+        self._features: dict[Any, Feature] = {}
+        self._state: tuple[list[Feature], np.ndarray, shapely.STRtree] = self._build([])
+        self.update(features)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __repr__(self) -> str:
+        return f"FeatureIndex(geometry_property={self.geometry_property!r}, features={len(self)})"
+
+    def _build(self, features: list[Feature]) -> tuple[list[Feature], np.ndarray, shapely.STRtree]:
+        np, shapely = local_import("numpy", "shapely")
+        attribute = _to_feature_property_name(self.geometry_property)
+        indexed, geometries = [], []
+        for feature in features:
+            value = getattr(feature, attribute, None)
+            geometry = to_shapely(value) if value is not None else None
+            if geometry is not None and not geometry.is_empty:
+                indexed.append(feature)
+                geometries.append(geometry)
+        geometry_array = np.empty(len(geometries), dtype=object)
+        geometry_array[:] = geometries
+        return indexed, geometry_array, shapely.STRtree(geometry_array, node_capacity=self.node_capacity)
+
+    def update(self, features: Iterable[Feature]) -> int:
+        """Add features, replacing the indexed features with the same external ids, and rebuild the tree.
+
+        Args:
+            features (Iterable[Feature]): the new or updated features.
+
+        Returns:
+            int: the number of features added or replaced
+        """
+        count = 0
+        for feature in features:
+            self._features[feature.external_id] = feature
+            last_updated_time = getattr(feature, "last_updated_time", None)
+            if last_updated_time is not None and (
+                self.high_water_mark is None or last_updated_time > self.high_water_mark
+            ):
+                self.high_water_mark = last_updated_time
+            count += 1
+        if count:
+            self._state = self._build(list(self._features.values()))
+        return count
+
+    def refresh(self) -> int:
+        """Index the features updated since the latest `lastUpdatedTime` indexed.
+
+        Only the features updated since are streamed, or all of them when no `lastUpdatedTime` is known. Deleted
+        features can't be told apart this way, and remain in the index until it is built again.
+
+        Returns:
+            int: the number of features added or replaced
+        """
+        if self._stream_updated is None:
+            raise ValueError("This index has no source of features to refresh from")
+        return self.update(self._stream_updated(self.high_water_mark))
+
+    def _query(self, geometry: Any, predicate: str | None) -> FeatureList:
+        features, _, tree = self._state
+        return FeatureList([features[i] for i in tree.query(to_shapely(geometry), predicate=predicate).tolist()])
+
+    def query_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> FeatureList:
+        """The features whose bounding box intersects a box.
+
+        Args:
+            min_x (float): the minimum x of the box.
+            min_y (float): the minimum y of the box.
+            max_x (float): the maximum x of the box.
+            max_y (float): the maximum y of the box.
+
+        Returns:
+            FeatureList: the features, in no particular order
+        """
+        shapely = local_import("shapely")
+        return self._query(shapely.box(min_x, min_y, max_x, max_y), predicate=None)
+
+    def intersects(self, geometry: Any) -> FeatureList:
+        """The features whose geometry intersects a geometry, such as the polygons containing a point.
+
+        Args:
+            geometry (Any): a shapely geometry, (E)WKT string, `{"wkt": ...}`, GeoJSON geometry or (x, y) point.
+
+        Returns:
+            FeatureList: the features, in no particular order
+        """
+        return self._query(geometry, predicate="intersects")
+
+    def within(self, geometry: Any) -> FeatureList:
+        """The features whose geometry is within a geometry.
+
+        Args:
+            geometry (Any): a shapely geometry, (E)WKT string, `{"wkt": ...}`, GeoJSON geometry or (x, y) point.
+
+        Returns:
+            FeatureList: the features, in no particular order
+        """
+        # The predicates of STRtree test the query against the indexed geometries
+        return self._query(geometry, predicate="contains")
+
+    def nearest(self, geometry: Any, k: int = 1, max_distance: float | None = None) -> FeatureList:
+        """The features nearest to a geometry.
+
+        Args:
+            geometry (Any): a shapely geometry, (E)WKT string, `{"wkt": ...}`, GeoJSON geometry or (x, y) point.
+            k (int): the number of features to return.
+            max_distance (float | None): the distance beyond which features are not returned.
+
+        Returns:
+            FeatureList: at most k features, by increasing distance
+        """
+        np, shapely = local_import("numpy", "shapely")
+        features, geometries, tree = self._state
+        query = to_shapely(geometry)
+        hits, distances = tree.query_nearest(query, max_distance=max_distance, return_distance=True, all_matches=True)
+        if k < 1 or len(hits) == 0:
+            return FeatureList([])
+        # query_nearest only returns the nearest features and their ties, so the search radius is widened until it
+        # holds k features, starting from about the spacing of the features
+        limit = math.inf if max_distance is None else max_distance
+        min_x, min_y, max_x, max_y = shapely.total_bounds(np.append(geometries, query))
+        step = math.hypot(max_x - min_x, max_y - min_y) / math.sqrt(len(features))
+        radius = float(distances.max())
+        while len(hits) < min(k, len(features)) and radius < limit:
+            radius = min(limit, max(2 * radius, step))
+            hits = tree.query(query, predicate="dwithin", distance=radius)
+        distances = shapely.distance(geometries[hits], query)
+        nearest = hits[np.lexsort((hits, distances))][:k]
+        return FeatureList([features[i] for i in nearest.tolist()])
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+from cognite.client.data_classes.geospatial import Feature, _is_geometry_type
+from cognite.client.utils._importing import local_import
+from cognite.experimental._api.geospatial_streaming import build_feature_batch, default_json_decoder
+
+if TYPE_CHECKING:
+    from cognite.experimental._api.geospatial import ExperimentalGeospatialAPI
+
+# The GeoParquet names of the geometry property types, by their 2D type
+_GEOPARQUET_GEOMETRY_TYPES = {
+    "POINT": "Point",
+    "LINESTRING": "LineString",
+    "POLYGON": "Polygon",
+    "MULTIPOINT": "MultiPoint",
+    "MULTILINESTRING": "MultiLineString",
+    "MULTIPOLYGON": "MultiPolygon",
+    "GEOMETRYCOLLECTION": "GeometryCollection",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    cognite_domain TEXT NOT NULL,
+    feature_type TEXT NOT NULL,
+    selection TEXT NOT NULL,
+    high_water_mark INTEGER,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (cognite_domain, feature_type)
+);
+CREATE TABLE IF NOT EXISTS features (
+    cognite_domain TEXT NOT NULL,
+    feature_type TEXT NOT NULL,
+    external_id TEXT NOT NULL,
+    last_updated_time INTEGER,
+    feature TEXT NOT NULL,
+    PRIMARY KEY (cognite_domain, feature_type, external_id)
+);
+"""
+
+
+def geoparquet_column(spec: dict[str, Any]) -> dict[str, Any]:
+    """The GeoParquet metadata of a WKB column holding the values of a geometry property of a feature type."""
+    property_type = spec["type"]
+    if property_type in _GEOPARQUET_GEOMETRY_TYPES:
+        geometry_types = [_GEOPARQUET_GEOMETRY_TYPES[property_type]]
+    elif property_type.endswith("Z") and property_type[:-1] in _GEOPARQUET_GEOMETRY_TYPES:
+        geometry_types = [_GEOPARQUET_GEOMETRY_TYPES[property_type[:-1]] + " Z"]
+    else:
+        # GEOMETRY properties hold any type, and measured types have no GeoParquet name
+        geometry_types = []
+    srid = spec.get("srid")
+    # A missing crs means OGC:CRS84, and null an unknown one
+    crs = {"id": {"authority": "EPSG", "code": srid}} if srid is not None else None
+    return {"encoding": "WKB", "geometry_types": geometry_types, "crs": crs}
+
+
+class FeatureMirror:
+    """A local copy of feature types in a SQLite database, kept up to date by transferring only the changes.
+
+    Each :meth:`sync` streams the features with a `lastUpdatedTime` at or after the high-water mark of the previous
+    one, less an `overlap` covering features updated while it ran, and upserts them together with the new high-water
+    mark. A sync that fails is rolled back to the previous high-water mark, and repeats the same transfer when run
+    again. Deleted features aren't streamed, :meth:`prune` removes them by streaming only the external ids.
+
+    The features are stored as JSON in the `features` table, by cognite domain, feature type and external id, where
+    they can be queried with the SQLite JSON functions, read with :meth:`features`, or exported to a GeoParquet file
+    with :meth:`to_geoparquet`. Create it with :meth:`ExperimentalGeospatialAPI.feature_mirror`.
+
+    Args:
+        geospatial (ExperimentalGeospatialAPI): the API streaming the features.
+        path (str | Path): the SQLite database, created if missing.
+    """
+
+    def __init__(self, geospatial: ExperimentalGeospatialAPI, path: str | Path):
+        self._geospatial = geospatial
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"FeatureMirror(path={str(self.path)!r})"
+
+    def __enter__(self) -> FeatureMirror:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    @property
+    def _domain(self) -> str:
+        # The default domain is stored as an empty string, as NULL values are distinct in primary keys
+        return self._geospatial.get_current_cognite_domain() or ""
+
+    def _state(self, feature_type_external_id: str) -> tuple[str, int | None] | None:
+        row = self._connection.execute(
+            "SELECT selection, high_water_mark FROM sync_state WHERE cognite_domain = ? AND feature_type = ?",
+            (self._domain, feature_type_external_id),
+        ).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def high_water_mark(self, feature_type_external_id: str) -> int | None:
+        """The greatest `lastUpdatedTime` of the mirrored features, None if the feature type was never synced."""
+        state = self._state(feature_type_external_id)
+        return state[1] if state is not None else None
+
+    def sync(
+        self,
+        feature_type_external_id: str,
+        filter: dict[str, Any] | None = None,
+        properties: dict[str, Any] | None = None,
+        overlap: float = 60.0,
+        batch_size: int = 1000,
+    ) -> int:
+        """Copy the features changed since the previous sync of the feature type.
+
+        Changing the filter or the property selection of a feature type drops its mirrored features and copies all
+        the features again.
+
+        Args:
+            feature_type_external_id (str): the feature type to mirror.
+            filter (dict[str, Any] | None): the search filter of the features to mirror.
+            properties (dict[str, Any] | None): the output property selection, `lastUpdatedTime` is always selected.
+            overlap (float): number of seconds before the high-water mark from which features are streamed again.
+            batch_size (int): number of features upserted per statement.
+
+        Returns:
+            int: the number of features copied
+        """
+        if properties is not None:
+            properties = {**properties, "lastUpdatedTime": {}}
+        selection = json.dumps({"filter": filter, "properties": properties}, sort_keys=True)
+        domain = self._domain
+        with self._lock, self._connection:
+            state = self._state(feature_type_external_id)
+            high_water_mark = None
+            if state is not None and state[0] == selection:
+                high_water_mark = state[1]
+            elif state is not None:
+                self._connection.execute(
+                    "DELETE FROM features WHERE cognite_domain = ? AND feature_type = ?",
+                    (domain, feature_type_external_id),
+                )
+
+            search_filter = filter or {}
+            if high_water_mark is not None:
+                since = {"range": {"property": "lastUpdatedTime", "gte": high_water_mark - int(overlap * 1000)}}
+                search_filter = {"and": [search_filter, since]} if search_filter else since
+            features = self._geospatial.stream_features(
+                feature_type_external_id, search_filter, properties=properties, lazy=True
+            )
+
+            count = 0
+            rows: list[tuple[str, str, str, int | None, str]] = []
+            for feature in features:
+                last_updated_time = getattr(feature, "last_updated_time", None)
+                if last_updated_time is not None and (high_water_mark is None or last_updated_time > high_water_mark):
+                    high_water_mark = last_updated_time
+                rows.append(
+                    (
+                        domain,
+                        feature_type_external_id,
+                        feature.external_id,
+                        last_updated_time,
+                        feature.raw.decode("utf-8"),
+                    )
+                )
+                if len(rows) == batch_size:
+                    count += self._upsert(rows)
+                    rows = []
+            count += self._upsert(rows)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                (domain, feature_type_external_id, selection, high_water_mark, time.time()),
+            )
+        return count
+
+    def _upsert(self, rows: list[tuple[str, str, str, int | None, str]]) -> int:
+        self._connection.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def prune(self, feature_type_external_id: str) -> int:
+        """Remove the mirrored features which no longer exist, or no longer match the filter of the mirror.
+
+        Args:
+            feature_type_external_id (str): the mirrored feature type.
+
+        Returns:
+            int: the number of features removed
+        """
+        domain = self._domain
+        state = self._state(feature_type_external_id)
+        if state is None:
+            return 0
+        search_filter = json.loads(state[0])["filter"] or {}
+        external_ids = {
+            feature.external_id
+            for feature in self._geospatial.stream_features(
+                feature_type_external_id, search_filter, properties={"lastUpdatedTime": {}}, lazy=True
+            )
+        }
+        with self._lock, self._connection:
+            mirrored = [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT external_id FROM features WHERE cognite_domain = ? AND feature_type = ?",
+                    (domain, feature_type_external_id),
+                )
+            ]
+            removed = [(domain, feature_type_external_id, ext_id) for ext_id in mirrored if ext_id not in external_ids]
+            self._connection.executemany(
+                "DELETE FROM features WHERE cognite_domain = ? AND feature_type = ? AND external_id = ?", removed
+            )
+        return len(removed)
+
+    def _rows(self, feature_type_external_id: str) -> Iterator[Any]:
+        decode = default_json_decoder()
+        cursor = self._connection.execute(
+            "SELECT feature FROM features WHERE cognite_domain = ? AND feature_type = ? ORDER BY external_id",
+            (self._domain, feature_type_external_id),
+        )
+        for (feature,) in cursor:
+            yield decode(feature)
+
+    def features(self, feature_type_external_id: str) -> Iterator[Feature]:
+        """Read the mirrored features of a feature type, by external id.
+
+        Args:
+            feature_type_external_id (str): the mirrored feature type.
+
+        Yields:
+            Feature: the mirrored features
+        """
+        for resource in self._rows(feature_type_external_id):
+            yield Feature._load(resource)
+
+    def _batches(self, feature_type_external_id: str, batch_size: int, geometry_format: str) -> Iterator[Any]:
+        rows = self._rows(feature_type_external_id)
+        while resources := list(itertools.islice(rows, batch_size)):
+            yield build_feature_batch(resources, "arrow", geometry_format)
+
+    def to_geoparquet(self, feature_type_external_id: str, path: str | Path, batch_size: int = 10_000) -> int:
+        """Export the mirrored features of a feature type to a GeoParquet file, with WKB encoded geometries.
+
+        The features are read and written `batch_size` at a time, in two passes over the mirror: the first finds the
+        columns and their types, the second writes the features. The file is only replaced once complete. The
+        coordinate reference system and geometry type of each geometry column are those of its property, read from
+        the feature type. Requires pyarrow and shapely.
+
+        Args:
+            feature_type_external_id (str): the mirrored feature type.
+            path (str | Path): the GeoParquet file to write.
+            batch_size (int): number of features per row group of the file.
+
+        Returns:
+            int: the number of features written
+        """
+        pa, pq = local_import("pyarrow", "pyarrow.parquet")
+        properties = self._geospatial.retrieve_feature_types(external_id=feature_type_external_id).properties
+        # Geometries are kept as WKT in the first pass, as only their column matters
+        schemas = [batch.schema for batch in self._batches(feature_type_external_id, batch_size, "wkt")]
+        schema = pa.unify_schemas(schemas, promote_options="permissive") if schemas else pa.schema([])
+        geometry_columns = [
+            name for name in schema.names if name in properties and _is_geometry_type(properties[name]["type"])
+        ]
+        for name in geometry_columns:
+            schema = schema.set(schema.get_field_index(name), pa.field(name, pa.binary()))
+        if geometry_columns:
+            geo = {
+                "version": "1.0.0",
+                "primary_column": geometry_columns[0],
+                "columns": {name: geoparquet_column(properties[name]) for name in geometry_columns},
+            }
+            schema = schema.with_metadata({"geo": json.dumps(geo)})
+
+        path = Path(path)
+        partial = path.with_name(path.name + ".partial")
+        count = 0
+        with pq.ParquetWriter(partial, schema) as writer:
+            for batch in self._batches(feature_type_external_id, batch_size, "wkb"):
+                # Columns missing from the batch are null, and the others are cast to the types of all the batches
+                columns = [
+                    batch.column(field.name).cast(field.type)
+                    if field.name in batch.schema.names
+                    else pa.nulls(batch.num_rows, field.type)
+                    for field in schema
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+                count += batch.num_rows
+        os.replace(partial, path)
+        return count
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Full, Queue
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from cognite.client.utils._importing import local_import
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
+T = TypeVar("T")
+
+DEFAULT_READ_CHUNK_SIZE = 256 * 1024
+
+_OUTPUT_FORMATS = ("numpy", "arrow")
+_GEOMETRY_FORMATS = ("wkt", "wkb")
+
+
+def default_json_decoder() -> Callable[[bytes], Any]:
+    """The fastest available JSON decoder accepting bytes: orjson, then ujson, then the standard library."""
+    try:
+        import orjson
+
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import ujson
+
+        return ujson.loads
+    except ImportError:
+        return json.loads
+
+
+def iter_ndjson_line_batches(chunks: Iterable[bytes]) -> Iterator[list[bytes]]:
+    """Split a new-line delimited byte stream into lines, yielding all complete lines of each read chunk at once."""
+    remainder = b""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (remainder + chunk).split(b"\n") if remainder else chunk.split(b"\n")
+        remainder = lines.pop()
+        yield [line for line in lines if line]
+    if remainder:
+        yield [remainder]
+
+
+def validate_batch_formats(output_format: str, geometry_format: str) -> None:
+    if output_format not in _OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {_OUTPUT_FORMATS}, got {output_format!r}")
+    if geometry_format not in _GEOMETRY_FORMATS:
+        raise ValueError(f"geometry_format must be one of {_GEOMETRY_FORMATS}, got {geometry_format!r}")
+
+
+def _is_wkt_geometry(value: Any) -> bool:
+    return isinstance(value, dict) and "wkt" in value
+
+
+def features_to_columns(features: list[dict[str, Any]]) -> tuple[dict[str, list[Any]], set[str]]:
+    """Pivot decoded features into one list per property, padding missing properties with None.
+
+    Geometries are unwrapped to their WKT string. Returns the columns and the names of the geometry columns.
+    """
+    columns: dict[str, list[Any]] = {}
+    geometry_columns: set[str] = set()
+    for row, feature in enumerate(features):
+        for key, value in feature.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * row
+            if _is_wkt_geometry(value):
+                geometry_columns.add(key)
+                value = value["wkt"]
+            column.append(value)
+        for column in columns.values():
+            if len(column) == row:
+                column.append(None)
+    return columns, geometry_columns
+
+
+# The external id of a streamed line, when it is the first member of the feature as output by the service
+_LEADING_EXTERNAL_ID = re.compile(rb'^\s*\{\s*"externalId"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def leading_external_id(line: bytes) -> str | None:
+    """The external id of a streamed feature read without decoding the line, or None if it isn't the first member."""
+    match = _LEADING_EXTERNAL_ID.match(line)
+    if match is None:
+        return None
+    external_id = match.group(1)
+    if b"\\" in external_id:
+        return json.loads(b'"' + external_id + b'"')
+    return external_id.decode("utf-8")
+
+
+class FeatureStreamCheckpoint:
+    """Keeps track of the progress of a resumable feature stream, partition by partition.
+
+    Partitions are streamed one after the other. A completed partition is not streamed again, and the external ids of
+    its features are forgotten. The order of streamed features is not deterministic, so the progress within the
+    current partition is the set of its delivered external ids rather than a single position. When a path is given,
+    the progress is appended to that file, one JSON value per line: the external id of each delivered feature, and
+    `{"completed": index}` when a partition is complete, so that a new process can pick up where a crashed one
+    stopped. The file is rewritten with only the completed partitions each time a partition completes.
+
+    Args:
+        path (str | Path | None): optional file to persist the checkpoint to.
+        flush_interval (int): number of delivered features between each write to the checkpoint file.
+    """
+
+    def __init__(self, path: str | Path | None = None, flush_interval: int = 1000):
+        self.path = Path(path) if path is not None else None
+        self._flush_interval = flush_interval
+        self.completed: set[int] = set()
+        self._delivered: set[str] = set()
+        self._pending: list[str] = []
+        if self.path is not None and self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    value = json.loads(line)
+                    if isinstance(value, dict):
+                        self.completed.add(value["completed"])
+                        self._delivered.clear()
+                    else:
+                        self._delivered.add(value)
+
+    def __contains__(self, external_id: str) -> bool:
+        return external_id in self._delivered
+
+    def __len__(self) -> int:
+        return len(self._delivered)
+
+    def add(self, external_id: str) -> None:
+        self._delivered.add(external_id)
+        if self.path is not None:
+            self._pending.append(external_id)
+            if len(self._pending) >= self._flush_interval:
+                self.flush()
+
+    def complete(self, partition: int) -> None:
+        """Record that all the features of the current partition were delivered."""
+        self.completed.add(partition)
+        self._delivered.clear()
+        self._pending = []
+        if self.path is not None:
+            partial = self.path.with_name(self.path.name + ".partial")
+            partial.write_text("".join(json.dumps({"completed": index}) + "\n" for index in sorted(self.completed)))
+            partial.replace(self.path)
+
+    def flush(self) -> None:
+        if self.path is None or not self._pending:
+            return
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(external_id) + "\n" for external_id in self._pending)
+        self._pending = []
+
+
+def _wkt_to_wkb(values: list[Any]) -> list[bytes | None]:
+    np, shapely = local_import("numpy", "shapely")
+    wkb = shapely.to_wkb(shapely.from_wkt(np.array(values, dtype=object)))
+    return list(wkb)
+
+
+def _to_numpy_column(values: list[Any]) -> np.ndarray:
+    np = local_import("numpy")
+    value_types = {type(value) for value in values}
+    if value_types == {bool}:
+        return np.array(values, dtype=bool)
+    if value_types == {int}:
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    elif value_types and value_types <= {int, float, type(None)} and value_types != {type(None)}:
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def build_feature_batch(
+    features: list[dict[str, Any]], output_format: str, geometry_format: str
+) -> dict[str, np.ndarray] | pa.RecordBatch:
+    columns, geometry_columns = features_to_columns(features)
+    if geometry_format == "wkb":
+        for name in geometry_columns:
+            columns[name] = _wkt_to_wkb(columns[name])
+
+    if output_format == "arrow":
+        pa = local_import("pyarrow")
+        binary_columns = geometry_columns if geometry_format == "wkb" else set()
+        return pa.RecordBatch.from_pydict(
+            {
+                name: pa.array(values, type=pa.binary() if name in binary_columns else None)
+                for name, values in columns.items()
+            }
+        )
+    return {name: _to_numpy_column(values) for name, values in columns.items()}
+
+
+class _StreamFailure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_STREAM_DONE = object()
+
+
+def merge_streams(streams: Sequence[Callable[[], Iterable[T]]], max_workers: int, max_buffered: int) -> Iterator[T]:
+    """Consume the given streams concurrently and merge them into one iterator.
+
+    At most `max_buffered` items are held between the producing threads and the consumer. Items from one stream keep
+    their relative order, there is no ordering across streams. The first error raised by a stream is re-raised to the
+    consumer, and the remaining streams are abandoned.
+    """
+    queue: Queue = Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce(stream: Callable[[], Iterable[T]]) -> None:
+        if stop.is_set():
+            return
+        try:
+            for item in stream():
+                if not put(item):
+                    return
+        except Exception as e:
+            put(_StreamFailure(e))
+            return
+        put(_STREAM_DONE)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(streams))))
+    for stream in streams:
+        executor.submit(produce, stream)
+    remaining = len(streams)
+    try:
+        while remaining:
+            item = queue.get()
+            if item is _STREAM_DONE:
+                remaining -= 1
+            elif isinstance(item, _StreamFailure):
+                raise item.error
+            else:
+                yield item
+    finally:
+        stop.set()
+        # Don't block the consumer on producers that are waiting for the network, they stop on their next item
+        executor.shutdown(wait=False)
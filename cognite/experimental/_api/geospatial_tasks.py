@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING, Collection, Iterable, Iterator
+
+from cognite.experimental.data_classes.geospatial import GeospatialTask, GeospatialTaskList
+
+if TYPE_CHECKING:
+    from cognite.experimental._api.geospatial import ExperimentalGeospatialAPI
+
+TERMINAL_TASK_STATES = frozenset({"SUCCEEDED", "FAILED", "CANCELLED"})
+
+
+class GeospatialTaskWaiter:
+    """Waits for many geospatial tasks to reach a terminal state.
+
+    Each poll retrieves all the pending tasks at once. The delay between polls grows exponentially from
+    `poll_interval` up to `max_poll_interval`, and each delay is drawn at random from its upper half, so that many
+    waiters started together don't poll in step. Create it with :meth:`ExperimentalGeospatialAPI.task_waiter`.
+
+    Args:
+        geospatial (ExperimentalGeospatialAPI): the API retrieving the tasks.
+        external_ids (Iterable[str]): the external ids of the tasks to wait for.
+        poll_interval (float): number of seconds before the second poll, the first one is immediate.
+        max_poll_interval (float): maximum number of seconds between polls.
+        backoff_factor (float): factor by which the delay between polls grows.
+        terminal_states (Collection[str]): the states in which a task is done.
+    """
+
+    def __init__(
+        self,
+        geospatial: ExperimentalGeospatialAPI,
+        external_ids: Iterable[str],
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        backoff_factor: float = 2.0,
+        terminal_states: Collection[str] = TERMINAL_TASK_STATES,
+    ):
+        if poll_interval <= 0 or max_poll_interval < poll_interval:
+            raise ValueError("poll_interval must be strictly positive and not exceed max_poll_interval")
+        if backoff_factor < 1:
+            raise ValueError("backoff_factor must be at least 1")
+        self._geospatial = geospatial
+        self._external_ids = list(dict.fromkeys(external_ids))
+        self._pending = dict.fromkeys(self._external_ids)
+        self._done: dict[str, GeospatialTask] = {}
+        self._delay = poll_interval
+        self._max_delay = max_poll_interval
+        self._backoff_factor = backoff_factor
+        self._terminal_states = frozenset(terminal_states)
+        self.polls = 0
+
+    def __repr__(self) -> str:
+        return f"GeospatialTaskWaiter(pending={len(self._pending)}, done={len(self._done)})"
+
+    @property
+    def pending(self) -> list[str]:
+        """The external ids of the tasks not done yet."""
+        return list(self._pending)
+
+    @property
+    def done(self) -> GeospatialTaskList:
+        """The tasks done so far, in the order they were done."""
+        return GeospatialTaskList(list(self._done.values()), cognite_client=self._geospatial._cognite_client)
+
+    def poll(self) -> list[GeospatialTask]:
+        """Retrieve the pending tasks once, and return those which are now done."""
+        if not self._pending:
+            return []
+        self.polls += 1
+        tasks = self._geospatial.get_tasks(list(self._pending))
+        finished = [task for task in tasks if task.state in self._terminal_states]
+        for task in finished:
+            del self._pending[task.external_id]
+            self._done[task.external_id] = task
+        return finished
+
+    def _sleep(self, deadline: float | None) -> None:
+        delay = random.uniform(self._delay / 2, self._delay)
+        self._delay = min(self._delay * self._backoff_factor, self._max_delay)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{len(self._pending)} geospatial task(s) still pending: {self.pending[:10]}")
+            delay = min(delay, remaining)
+        time.sleep(delay)
+
+    def as_completed(self, timeout: float | None = None) -> Iterator[GeospatialTask]:
+        """Yield the tasks as they are done.
+
+        Args:
+            timeout (float | None): number of seconds after which to raise a `TimeoutError` if tasks are still
+                pending, wait forever if None.
+
+        Yields:
+            GeospatialTask: each task, once in a terminal state
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        if self._pending:
+            yield from self.poll()
+        while self._pending:
+            self._sleep(deadline)
+            yield from self.poll()
+
+    def __iter__(self) -> Iterator[GeospatialTask]:
+        return self.as_completed()
+
+    def wait_all(self, timeout: float | None = None) -> GeospatialTaskList:
+        """Block until all the tasks are done.
+
+        Args:
+            timeout (float | None): number of seconds after which to raise a `TimeoutError` if tasks are still
+                pending, wait forever if None.
+
+        Returns:
+            GeospatialTaskList: the tasks, in the order they were given
+        """
+        for _ in self.as_completed(timeout):
+            pass
+        return GeospatialTaskList(
+            [self._done[external_id] for external_id in self._external_ids],
+            cognite_client=self._geospatial._cognite_client,
+        )
@@ -0,0 +1,631 @@
+from __future__ import annotations
+
+import gzip
+import itertools
+import json
+import math
+import os
+import pickle
+import re
+import sqlite3
+import struct
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from cognite.client.data_classes.geospatial import Feature, _to_feature_property_name
+from cognite.experimental._api.geospatial_upload import iter_chunks, submit_bounded
+
+# Geometry types of the Mapbox Vector Tile specification 2.1
+POINT = 1
+LINESTRING = 2
+POLYGON = 3
+
+_MOVE_TO = 1
+_LINE_TO = 2
+_CLOSE_PATH = 7
+
+_MAX_LATITUDE = 85.0511287798066
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_WKT_COORDINATES = re.compile(rf"{_NUMBER}(?:\s+{_NUMBER})+")
+_WKT_HEADER = re.compile(r"\s*(?:SRID=\d+\s*;)?\s*([A-Za-z]+)\s*(?:ZM|Z|M)?\s*", re.IGNORECASE)
+
+_KINDS = {
+    "POINT": POINT,
+    "MULTIPOINT": POINT,
+    "LINESTRING": LINESTRING,
+    "MULTILINESTRING": LINESTRING,
+    "POLYGON": POLYGON,
+    "MULTIPOLYGON": POLYGON,
+}
+# Depth of the coordinate lists of collections of each type, down to the [x, y] pairs
+_DEPTHS = {POINT: 1, LINESTRING: 2, POLYGON: 3}
+
+Fragment = Tuple[int, List[int], Tuple[Tuple[str, Any], ...]]
+
+
+def _split_collection(body: str) -> list[str]:
+    # The members of a GEOMETRYCOLLECTION body, split on the commas outside of parentheses
+    members, depth, start = [], 0, 1
+    for index, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                members.append(body[start:index])
+        elif char == "," and depth == 1:
+            members.append(body[start:index])
+            start = index + 1
+    return [member for member in members if member.strip()]
+
+
+def parse_wkt(wkt: str) -> list[tuple[int, list]]:
+    """Parse a (E)WKT geometry into (MVT geometry type, coordinates) pairs, dropping Z and M values.
+
+    Points are lists of [x, y], lines lists of lists of points, and polygons lists of lists of rings.
+    """
+    header = _WKT_HEADER.match(wkt)
+    if header is None:
+        raise ValueError(f"Invalid WKT {wkt[:30]!r}")
+    kind = header.group(1).upper()
+    body = wkt[header.end() :]
+    if body.strip().upper() == "EMPTY":
+        return []
+    if kind == "GEOMETRYCOLLECTION":
+        return [geometry for member in _split_collection(body) for geometry in parse_wkt(member)]
+    if kind not in _KINDS:
+        raise ValueError(f"Unsupported WKT geometry type {kind}")
+    # "(0 0,1 1)" becomes "[[0,0],[1,1]]"
+    as_json = _WKT_COORDINATES.sub(lambda m: "[" + ",".join(m.group().split()[:2]) + "]", body)
+    coordinates = json.loads(as_json.replace("(", "[").replace(")", "]"))
+    if kind == "MULTIPOINT" and coordinates and isinstance(coordinates[0][0], list):
+        # MULTIPOINT((0 0),(1 1)) has one more level than MULTIPOINT(0 0,1 1)
+        coordinates = [point[0] for point in coordinates]
+    return _normalize(kind, coordinates[0] if kind == "POINT" else coordinates)
+
+
+def _normalize(kind: str, coordinates: list) -> list[tuple[int, list]]:
+    geometry_type = _KINDS[kind]
+    # Single geometries are turned into collections of one
+    if not kind.startswith("MULTI"):
+        coordinates = [coordinates]
+    return [(geometry_type, coordinates)] if coordinates else []
+
+
+def parse_geometry(value: Any) -> list[tuple[int, list]]:
+    """Parse a geometry given as WKT, {"wkt": ...}, {"ewkt": ...} or GeoJSON, see `parse_wkt`."""
+    if isinstance(value, str):
+        return parse_wkt(value)
+    if isinstance(value, dict):
+        if "wkt" in value:
+            return parse_wkt(value["wkt"])
+        if "ewkt" in value:
+            return parse_wkt(value["ewkt"])
+        if value.get("type") == "GeometryCollection":
+            return [geometry for member in value["geometries"] for geometry in parse_geometry(member)]
+        if "type" in value and "coordinates" in value:
+            return _normalize(str(value["type"]).upper(), value["coordinates"])
+    raise ValueError(f"Unsupported geometry {str(value)[:30]}")
+
+
+def _to_mercator(coordinates: Any, depth: int) -> Any:
+    # Longitudes and latitudes to Web Mercator, normalized to [0, 1] with y growing southwards
+    if depth == 0:
+        lon, lat = coordinates[0], max(-_MAX_LATITUDE, min(_MAX_LATITUDE, coordinates[1]))
+        sin_lat = math.sin(math.radians(lat))
+        return (lon + 180) / 360, 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return [_to_mercator(item, depth - 1) for item in coordinates]
+
+
+def _iter_points(coordinates: Any, depth: int) -> Iterator[tuple[float, float]]:
+    if depth == 0:
+        yield coordinates
+    else:
+        for item in coordinates:
+            yield from _iter_points(item, depth - 1)
+
+
+def _clip_segment(x0: float, y0: float, x1: float, y1: float, low: float, high: float) -> tuple[float, float] | None:
+    # Liang-Barsky: the parameters of the part of the segment in the square, or None
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0 - low), (dx, high - x0), (-dy, y0 - low), (dy, high - y0)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        r = q / p
+        if p < 0:
+            if r > t1:
+                return None
+            t0 = max(t0, r)
+        else:
+            if r < t0:
+                return None
+            t1 = min(t1, r)
+    return t0, t1
+
+
+def clip_line(points: Sequence[tuple[float, float]], low: float, high: float) -> list[list[tuple[float, float]]]:
+    """The parts of a line inside the square [low, high]²."""
+    parts: list[list[tuple[float, float]]] = []
+    current: list[tuple[float, float]] = []
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        clipped = _clip_segment(x0, y0, x1, y1, low, high)
+        if clipped is None:
+            if current:
+                parts.append(current)
+                current = []
+            continue
+        t0, t1 = clipped
+        if t0 > 0 and current:
+            parts.append(current)
+            current = []
+        if not current:
+            current = [(x0 + t0 * (x1 - x0), y0 + t0 * (y1 - y0)) if t0 > 0 else (x0, y0)]
+        if t1 < 1:
+            current.append((x0 + t1 * (x1 - x0), y0 + t1 * (y1 - y0)))
+            parts.append(current)
+            current = []
+        else:
+            current.append((x1, y1))
+    if current:
+        parts.append(current)
+    return parts
+
+
+def clip_ring(ring: Sequence[tuple[float, float]], low: float, high: float) -> list[tuple[float, float]]:
+    """Sutherland-Hodgman clipping of an open ring to the square [low, high]²."""
+    output = list(ring)
+    for axis in (0, 1):
+        for bound, keep_above in ((low, True), (high, False)):
+            if not output:
+                return output
+            points, output = output, []
+            previous = points[-1]
+            previous_inside = previous[axis] >= bound if keep_above else previous[axis] <= bound
+            for point in points:
+                inside = point[axis] >= bound if keep_above else point[axis] <= bound
+                if inside != previous_inside:
+                    t = (bound - previous[axis]) / (point[axis] - previous[axis])
+                    other = previous[1 - axis] + t * (point[1 - axis] - previous[1 - axis])
+                    output.append((bound, other) if axis == 0 else (other, bound))
+                if inside:
+                    output.append(point)
+                previous, previous_inside = point, inside
+    return output
+
+
+def _quantize(points: Iterable[tuple[float, float]]) -> list[tuple[int, int]]:
+    quantized: list[tuple[int, int]] = []
+    for x, y in points:
+        point = (round(x), round(y))
+        if not quantized or quantized[-1] != point:
+            quantized.append(point)
+    return quantized
+
+
+def _ring_area(ring: Sequence[tuple[int, int]]) -> int:
+    # Twice the signed area, positive for the exterior rings of MVT (clockwise, with y growing downwards)
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, [*ring[1:], ring[0]]))
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def encode_geometry(geometry_type: int, parts: Sequence[Sequence[Any]]) -> list[int]:
+    """The MVT command integers of points, lines or polygons in tile coordinates."""
+    commands: list[int] = []
+    cursor_x = cursor_y = 0
+
+    def move(points: Iterable[tuple[int, int]]) -> None:
+        nonlocal cursor_x, cursor_y
+        for x, y in points:
+            commands.extend((_zigzag(x - cursor_x), _zigzag(y - cursor_y)))
+            cursor_x, cursor_y = x, y
+
+    if geometry_type == POINT:
+        commands.append(_command(_MOVE_TO, len(parts)))
+        move(parts)
+        return commands
+    paths = parts if geometry_type == LINESTRING else [ring for polygon in parts for ring in polygon]
+    for path in paths:
+        commands.append(_command(_MOVE_TO, 1))
+        move(path[:1])
+        commands.append(_command(_LINE_TO, len(path) - 1))
+        move(path[1:])
+        if geometry_type == POLYGON:
+            commands.append(_command(_CLOSE_PATH, 1))
+    return commands
+
+
+def _tile_parts(
+    geometry_type: int,
+    mercator: list,
+    bbox: tuple[float, float, float, float],
+    scale: int,
+    tile_x: int,
+    tile_y: int,
+    extent: int,
+    buffer: int,
+) -> list:
+    low, high = -buffer, extent + buffer
+
+    factor = scale * extent
+    offset_x, offset_y = tile_x * extent, tile_y * extent
+
+    def local(points: Iterable[tuple[float, float]]) -> list[tuple[float, float]]:
+        return [(x * factor - offset_x, y * factor - offset_y) for x, y in points]
+
+    # Geometries within the buffered tile, such as most geometries at low zoom levels, need no clipping
+    (min_x, min_y), (max_x, max_y) = local([bbox[:2], bbox[2:]])
+    inside = low <= min_x and max_x <= high and low <= min_y and max_y <= high
+
+    if geometry_type == POINT:
+        points = local(mercator)
+        return _quantize(point for point in points if low <= point[0] <= high and low <= point[1] <= high)
+    if geometry_type == LINESTRING:
+        lines = []
+        for line in mercator:
+            points = local(line)
+            for part in [points] if inside else clip_line(points, low, high):
+                quantized = _quantize(part)
+                if len(quantized) >= 2:
+                    lines.append(quantized)
+        return lines
+    polygons = []
+    for polygon in mercator:
+        rings = []
+        for index, ring in enumerate(polygon):
+            open_ring = local(ring)
+            if len(open_ring) > 1 and open_ring[0] == open_ring[-1]:
+                open_ring.pop()
+            quantized = _quantize(open_ring if inside else clip_ring(open_ring, low, high))
+            if len(quantized) > 1 and quantized[0] == quantized[-1]:
+                quantized.pop()
+            area = _ring_area(quantized) if len(quantized) >= 3 else 0
+            if area == 0:
+                if index == 0:
+                    break
+                continue
+            # Exterior rings have a positive area and holes a negative one
+            if (area > 0) != (index == 0):
+                quantized.reverse()
+            rings.append(quantized)
+        if rings:
+            polygons.append(rings)
+    return polygons
+
+
+def _tile_range(low: float, high: float, scale: int, margin: float) -> range:
+    # The tiles of a zoom level within the margin (in tiles) of the interval [low, high] of normalized coordinates
+    return range(max(0, math.floor(low * scale - margin)), min(scale - 1, math.floor(high * scale + margin)) + 1)
+
+
+def _tile_rows(
+    job: tuple[int, int, list[tuple[tuple[int, ...], Any, tuple[tuple[str, Any], ...]]]],
+) -> tuple[list[tuple[int, int, int, Fragment]], tuple[float, float, float, float] | None]:
+    # Runs in the worker processes: cut the geometries of a batch into tile fragments at each of their zoom levels
+    extent, buffer, rows = job
+    fragments: list[tuple[int, int, int, Fragment]] = []
+    west = south = math.inf
+    east = north = -math.inf
+    margin = buffer / extent
+    for levels, geometry, properties in rows:
+        for geometry_type, coordinates in parse_geometry(geometry):
+            depth = _DEPTHS[geometry_type]
+            for point in _iter_points(coordinates, depth):
+                lon, lat = point[0], point[1]
+                west, east, south, north = min(west, lon), max(east, lon), min(south, lat), max(north, lat)
+            mercator = _to_mercator(coordinates, depth)
+            xs, ys = zip(*_iter_points(mercator, depth))
+            bbox = (min(xs), min(ys), max(xs), max(ys))
+            for zoom in levels:
+                scale = 1 << zoom
+                for tile_x in _tile_range(bbox[0], bbox[2], scale, margin):
+                    for tile_y in _tile_range(bbox[1], bbox[3], scale, margin):
+                        parts = _tile_parts(geometry_type, mercator, bbox, scale, tile_x, tile_y, extent, buffer)
+                        if parts:
+                            fragment = (geometry_type, encode_geometry(geometry_type, parts), properties)
+                            fragments.append((zoom, tile_x, tile_y, fragment))
+    bounds = (west, south, east, north) if west <= east else None
+    return fragments, bounds
+
+
+def _varint(out: bytearray, value: int) -> None:
+    if value < 0x80:
+        out.append(value)
+        return
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _varint_field(out: bytearray, field: int, value: int) -> None:
+    _varint(out, field << 3)
+    _varint(out, value)
+
+
+def _bytes_field(out: bytearray, field: int, payload: bytes | bytearray) -> None:
+    _varint(out, (field << 3) | 2)
+    _varint(out, len(payload))
+    out += payload
+
+
+def _packed_field(out: bytearray, field: int, values: Sequence[int]) -> None:
+    if not values or max(values) < 0x80:
+        # Varints of a single byte
+        payload = bytearray(values)
+    else:
+        payload = bytearray()
+        for value in values:
+            _varint(payload, value)
+    _bytes_field(out, field, payload)
+
+
+def _encode_value(value: Any) -> bytearray:
+    # A Tile.Value message: strings, doubles, signed integers or booleans, other values as JSON strings
+    out = bytearray()
+    if isinstance(value, bool):
+        _varint_field(out, 7, int(value))
+    elif isinstance(value, int) and -(2**63) <= value < 2**63:
+        _varint_field(out, 6, _zigzag(value))
+    elif isinstance(value, float):
+        _varint(out, (3 << 3) | 1)
+        out += struct.pack("<d", value)
+    else:
+        _bytes_field(out, 1, (value if isinstance(value, str) else json.dumps(value)).encode())
+    return out
+
+
+def encode_layer(name: str, fragments: Iterable[Fragment], extent: int) -> bytearray:
+    """A Tile.Layer message of the features cut into a tile, sharing the property keys and values."""
+    keys: dict[str, int] = {}
+    values: dict[tuple[type, Any], int] = {}
+    layer = bytearray()
+    _varint_field(layer, 15, 2)
+    _bytes_field(layer, 1, name.encode())
+    for geometry_type, geometry, properties in fragments:
+        tags = []
+        for key, value in properties:
+            value_key = (type(value), value if isinstance(value, (str, int, float)) else json.dumps(value))
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault(value_key, len(values)))
+        feature = bytearray()
+        if tags:
+            _packed_field(feature, 2, tags)
+        _varint_field(feature, 3, geometry_type)
+        _packed_field(feature, 4, geometry)
+        _bytes_field(layer, 2, feature)
+    for key in keys:
+        _bytes_field(layer, 3, key.encode())
+    for _, value in values:
+        _bytes_field(layer, 4, _encode_value(value))
+    _varint_field(layer, 5, extent)
+    return layer
+
+
+def _encode_tile(job: tuple[tuple[int, int, int], dict[str, list[Fragment]], int]) -> tuple[int, int, int, bytes]:
+    # Runs in the worker processes: the gzipped Tile message of the fragments of each layer
+    (zoom, tile_x, tile_y), layers, extent = job
+    tile = bytearray()
+    for name, fragments in layers.items():
+        _bytes_field(tile, 3, encode_layer(name, fragments, extent))
+    return zoom, tile_x, tile_y, gzip.compress(bytes(tile))
+
+
+def write_mbtiles(path: str | Path, tiles: Iterable[tuple[int, int, int, bytes]], metadata: dict[str, str]) -> int:
+    """Write tiles in XYZ order to an MBTiles 1.3 file, replaced only once complete. Returns the number of tiles."""
+    path = Path(path)
+    partial_path = path.with_name(path.name + ".partial")
+    partial_path.unlink(missing_ok=True)
+    count = 0
+
+    def rows() -> Iterator[tuple[int, int, int, bytes]]:
+        nonlocal count
+        for zoom, tile_x, tile_y, data in tiles:
+            count += 1
+            # MBTiles rows follow the TMS scheme, counted from the south
+            yield zoom, tile_x, (1 << zoom) - 1 - tile_y, data
+
+    try:
+        connection = sqlite3.connect(partial_path)
+        try:
+            with connection:
+                connection.executescript(
+                    "CREATE TABLE metadata (name TEXT, value TEXT);"
+                    "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);"
+                )
+                connection.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", rows())
+                connection.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+                connection.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+        finally:
+            connection.close()
+        partial_path.replace(path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+    return count
+
+
+def _property(feature: Feature | dict[str, Any], name: str) -> Any:
+    if isinstance(feature, dict):
+        return feature.get(name)
+    return getattr(feature, _to_feature_property_name(name), None)
+
+
+def _field_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "Boolean"
+    return "Number" if isinstance(value, (int, float)) else "String"
+
+
+class VectorTiler:
+    """Encodes features into Mapbox Vector Tiles locally, following the mappings of an MVT mappings definition.
+
+    Each mapping gives the zoom `levels` at which the features of its feature type (`featureTypeExternalId`) are
+    drawn, their `geometryProperty` and the `featureProperties` kept in the tiles, in one layer named after the
+    feature type. Geometries are read as longitudes and latitudes (SRID 4326), projected to Web Mercator, clipped to
+    each tile with a buffer, and encoded with `extent` units per tile side. The clipping and the encoding of the
+    tiles run on a process pool.
+
+    Any feature can add to any tile, so tiles are only complete once all the features are added. Until then, the
+    clipped fragments of the tiles are kept in a temporary SQLite database, removed by :meth:`close`, and the tiles are
+    read back one at a time to be encoded: memory holds a few batches of features and tiles, whatever the size of the
+    dataset.
+
+    Args:
+        mappings (Sequence[dict[str, Any]]): the mappings, as in `MvpMappingsDefinition.mappings`.
+        extent (int): number of units per tile side.
+        buffer (int): number of units around each tile in which geometries are kept.
+        max_workers (int | None): number of worker processes, defaults to the number of CPUs.
+        batch_size (int): number of features sent to a worker at a time.
+    """
+
+    def __init__(
+        self,
+        mappings: Sequence[dict[str, Any]],
+        extent: int = 4096,
+        buffer: int = 64,
+        max_workers: int | None = None,
+        batch_size: int = 1000,
+    ):
+        self._mappings = list(mappings)
+        self.extent = extent
+        self.buffer = buffer
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._batch_size = batch_size
+        self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        descriptor, staging_path = tempfile.mkstemp(prefix="vector-tiles-", suffix=".sqlite")
+        os.close(descriptor)
+        self._staging_path = Path(staging_path)
+        self._staging = sqlite3.connect(self._staging_path)
+        self._staging.execute(
+            "CREATE TABLE fragments (zoom INTEGER, tile_x INTEGER, tile_y INTEGER, layer TEXT, fragment BLOB)"
+        )
+        self._fields: dict[str, dict[str, str]] = {}
+        self._bounds = [math.inf, math.inf, -math.inf, -math.inf]
+
+    def __enter__(self) -> VectorTiler:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes and remove the fragments of the tiles."""
+        self._executor.shutdown()
+        self._staging.close()
+        self._staging_path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        query = "SELECT COUNT(*) FROM (SELECT DISTINCT zoom, tile_x, tile_y FROM fragments)"
+        return self._staging.execute(query).fetchone()[0]
+
+    def add_features(self, feature_type_external_id: str, features: Iterable[Feature | dict[str, Any]]) -> None:
+        """Cut features of a feature type into the tiles of its mappings, reading them as the workers keep up.
+
+        Args:
+            feature_type_external_id (str): the feature type of the features.
+            features (Iterable[Feature | dict[str, Any]]): the features, such as the output of `stream_features`.
+        """
+        mappings = [
+            mapping for mapping in self._mappings if mapping["featureTypeExternalId"] == feature_type_external_id
+        ]
+        if not mappings:
+            raise ValueError(f"No mapping for the feature type {feature_type_external_id!r}")
+        fields = self._fields.setdefault(feature_type_external_id, {})
+
+        def rows() -> Iterator[tuple[tuple[int, ...], Any, tuple[tuple[str, Any], ...]]]:
+            for feature in features:
+                for mapping in mappings:
+                    geometry = _property(feature, mapping["geometryProperty"])
+                    if geometry is None:
+                        continue
+                    properties = tuple(
+                        (name, value)
+                        for name in mapping.get("featureProperties", ())
+                        if (value := _property(feature, name)) is not None
+                    )
+                    for name, value in properties:
+                        fields.setdefault(name, _field_type(value))
+                    yield tuple(mapping["levels"]), geometry, properties
+
+        jobs = ((self.extent, self.buffer, batch) for batch in iter_chunks(rows(), self._batch_size))
+        for fragments, bounds in submit_bounded(self._executor, _tile_rows, jobs, 2 * self._max_workers):
+            with self._staging:
+                self._staging.executemany(
+                    "INSERT INTO fragments VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (zoom, tile_x, tile_y, feature_type_external_id, pickle.dumps(fragment))
+                        for zoom, tile_x, tile_y, fragment in fragments
+                    ),
+                )
+            if bounds is not None:
+                self._bounds = [
+                    min(self._bounds[0], bounds[0]),
+                    min(self._bounds[1], bounds[1]),
+                    max(self._bounds[2], bounds[2]),
+                    max(self._bounds[3], bounds[3]),
+                ]
+
+    def _tile_jobs(self) -> Iterator[tuple[tuple[int, int, int], dict[str, list[Fragment]], int]]:
+        self._staging.execute("CREATE INDEX IF NOT EXISTS fragment_tiles ON fragments (zoom, tile_x, tile_y)")
+        rows = self._staging.execute(
+            "SELECT zoom, tile_x, tile_y, layer, fragment FROM fragments ORDER BY zoom, tile_x, tile_y, rowid"
+        )
+        for key, tile_rows in itertools.groupby(rows, key=lambda row: row[:3]):
+            layers: dict[str, list[Fragment]] = {}
+            for *_, layer, fragment in tile_rows:
+                layers.setdefault(layer, []).append(pickle.loads(fragment))
+            yield key, layers, self.extent
+
+    def tiles(self) -> Iterator[tuple[int, int, int, bytes]]:
+        """Encode the tiles, yielding the zoom, column, row (XYZ scheme) and gzipped MVT data of each."""
+        # Executor.map submits all its jobs at once, so the tiles are read and encoded a bounded number at a time
+        for jobs in iter_chunks(self._tile_jobs(), 64 * self._max_workers):
+            yield from self._executor.map(_encode_tile, jobs, chunksize=64)
+
+    def metadata(self, name: str) -> dict[str, str]:
+        """The MBTiles metadata of the tiles."""
+        vector_layers = []
+        for mapping in self._mappings:
+            layer = mapping["featureTypeExternalId"]
+            if layer in self._fields and all(item["id"] != layer for item in vector_layers):
+                levels = [
+                    level
+                    for other in self._mappings
+                    if other["featureTypeExternalId"] == layer
+                    for level in other["levels"]
+                ]
+                vector_layers.append(
+                    {"id": layer, "fields": self._fields[layer], "minzoom": min(levels), "maxzoom": max(levels)}
+                )
+        metadata = {"name": name, "format": "pbf", "type": "overlay", "version": "1"}
+        if vector_layers:
+            metadata["minzoom"] = str(min(layer["minzoom"] for layer in vector_layers))
+            metadata["maxzoom"] = str(max(layer["maxzoom"] for layer in vector_layers))
+            metadata["json"] = json.dumps({"vector_layers": vector_layers})
+        if self._bounds[0] <= self._bounds[2]:
+            metadata["bounds"] = ",".join(f"{bound:.6f}" for bound in self._bounds)
+        return metadata
+
+    def write_mbtiles(self, path: str | Path, name: str) -> int:
+        """Encode the tiles into an MBTiles file, replaced only once complete.
+
+        Args:
+            path (str | Path): the MBTiles file to write.
+            name (str): the name of the tileset in the metadata.
+
+        Returns:
+            int: the number of tiles written
+        """
+        return write_mbtiles(path, self.tiles(), self.metadata(name))
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterable, Callable, Iterable, Iterator, TypeVar
+
+from cognite.client.data_classes.geospatial import Feature
+from cognite.client.exceptions import CogniteAPIError, CogniteConnectionError, CogniteReadTimeout
+from cognite.client.utils import _json
+from cognite.client.utils._retry import Backoff
+
+T = TypeVar("T")
+T_Result = TypeVar("T_Result")
+
+
+def iter_chunks(items: Iterable[T], chunk_size: int) -> Iterator[list[T]]:
+    """Lazily split an iterable into lists of at most chunk_size items."""
+    iterator = iter(items)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+class AdaptiveChunker:
+    """Splits features into chunks bounded by their number and their serialized size.
+
+    Each chunk holds at most `max_items` features and `max_bytes` bytes of JSON, except a single feature larger
+    than `max_bytes` which is sent alone. When adaptive, the byte budget of the next chunks follows the throughput
+    observed on the completed ones, so that a request takes about `target_latency` seconds: point features are sent
+    `max_items` at a time while large multipolygons get small chunks.
+
+    Args:
+        max_items (int): maximum number of features in a chunk.
+        max_bytes (int): maximum serialized size of a chunk.
+        adaptive (bool): adjust the byte budget to the observed latency, otherwise it is `max_bytes`.
+        target_latency (float): the latency of a request aimed at, in seconds.
+        initial_bytes (int): the byte budget of the first chunks, when adaptive.
+        min_bytes (int): the lowest byte budget, when adaptive.
+    """
+
+    def __init__(
+        self,
+        max_items: int,
+        max_bytes: int,
+        adaptive: bool = True,
+        target_latency: float = 2.0,
+        initial_bytes: int = 1024 * 1024,
+        min_bytes: int = 64 * 1024,
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.min_bytes = min(min_bytes, max_bytes)
+        self.byte_budget = max(self.min_bytes, min(initial_bytes, max_bytes)) if adaptive else max_bytes
+        self._lock = threading.Lock()
+
+    def split(self, features: Iterable[Feature | dict[str, Any]]) -> Iterator[tuple[list[dict[str, Any]], int]]:
+        """Dump the features and yield them in chunks, along with the serialized size of each chunk."""
+        chunk: list[dict[str, Any]] = []
+        chunk_bytes = 0
+        for feature in features:
+            item = feature if isinstance(feature, dict) else feature.dump(camel_case=True)
+            # One byte for the separating comma
+            item_bytes = len(_json.dumps(item)) + 1
+            if chunk and chunk_bytes + item_bytes > self.byte_budget:
+                yield chunk, chunk_bytes
+                chunk, chunk_bytes = [], 0
+            chunk.append(item)
+            chunk_bytes += item_bytes
+            # Don't read ahead of a chunk that can't grow anymore
+            if len(chunk) >= self.max_items:
+                yield chunk, chunk_bytes
+                chunk, chunk_bytes = [], 0
+        if chunk:
+            yield chunk, chunk_bytes
+
+    def record(self, chunk_bytes: int, latency: float) -> None:
+        """Adjust the byte budget to the latency of a completed request."""
+        if not self.adaptive or latency <= 0:
+            return
+        desired = chunk_bytes * self.target_latency / latency
+        with self._lock:
+            # Smooth the estimate, the latency of a single request is noisy
+            budget = (self.byte_budget + desired) / 2
+            self.byte_budget = int(max(self.min_bytes, min(budget, self.max_bytes)))
+
+
+def iter_async(items: AsyncIterable[T]) -> Iterator[T]:
+    """Iterate over an async iterable from synchronous code, driving it on a private event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("Async iterables can't be consumed from a thread running an event loop")
+    loop = asyncio.new_event_loop()
+    iterator = items.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def is_transient_error(error: Exception) -> bool:
+    if isinstance(error, CogniteAPIError):
+        return error.code is not None and (error.code == 429 or error.code >= 500)
+    return isinstance(error, (CogniteConnectionError, CogniteReadTimeout))
+
+
+def call_with_retries(func: Callable[[], T_Result], max_retries: int) -> tuple[T_Result | None, Exception | None, int]:
+    """Call func, retrying transient errors with exponential backoff.
+
+    Returns the result, the last error if all attempts failed, and the number of attempts.
+    """
+    backoff = Backoff(max_wait=30)
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            return func(), None, attempts
+        except Exception as e:
+            if attempts > max_retries or not is_transient_error(e):
+                return None, e, attempts
+            time.sleep(next(backoff))
+
+
+def map_bounded(
+    func: Callable[[T], T_Result], items: Iterable[T], max_workers: int, max_in_flight: int
+) -> Iterator[T_Result]:
+    """Apply func to the items on a thread pool, yielding results as they complete.
+
+    Items are pulled from the iterable only when fewer than max_in_flight of them are submitted and not yet
+    completed, so a lazy iterable is never consumed faster than the workers can keep up with.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from submit_bounded(executor, func, items, max_in_flight)
+
+
+def submit_bounded(
+    executor: Executor, func: Callable[[T], T_Result], items: Iterable[T], max_in_flight: int
+) -> Iterator[T_Result]:
+    """Like map_bounded, on an executor owned by the caller, such as a process pool."""
+    in_flight: set[Future] = set()
+    try:
+        for item in items:
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            in_flight.add(executor.submit(func, item))
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+    finally:
+        for future in in_flight:
+            future.cancel()
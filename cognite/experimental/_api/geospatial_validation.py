@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import functools
+import json
+import numbers
+import re
+from typing import Any, Callable, Iterable
+
+from cognite.client.data_classes.geospatial import Feature, _is_geometry_type
+from cognite.client.utils._importing import local_import
+from cognite.experimental.data_classes.geospatial import ArrayGeometry, FeatureRejection
+
+# Properties filled in by the service, they are part of the feature type but must not be sent
+_GENERATED_PROPERTIES = ("createdTime", "lastUpdatedTime")
+
+_INT_RANGE = (-(2**31), 2**31 - 1)
+_LONG_RANGE = (-(2**63), 2**63 - 1)
+_SRID_PREFIX = re.compile(r"^\s*SRID=(\d+)\s*;", re.IGNORECASE)
+_WKT_KIND = re.compile(r"^\s*([A-Za-z]+)\s*(ZM|Z|M)?\b", re.IGNORECASE)
+
+Check = Callable[[Any], "str | None"]
+
+
+def _bool_types() -> tuple[type, ...]:
+    # Booleans are integers to Python, the NumPy scalars of features read from files are accepted as numbers
+    np = local_import("numpy")
+    return bool, np.bool_
+
+
+def _integer_check(type_name: str, bounds: tuple[int, int]) -> Check:
+    low, high = bounds
+    bool_types = _bool_types()
+
+    def check(value: Any) -> str | None:
+        if not isinstance(value, numbers.Integral) or isinstance(value, bool_types):
+            return f"expected a {type_name}, got {type(value).__name__}"
+        if not low <= value <= high:
+            return f"{value} is out of the {type_name} range"
+        return None
+
+    return check
+
+
+def _number_check(type_name: str) -> Check:
+    bool_types = _bool_types()
+
+    def check(value: Any) -> str | None:
+        if not isinstance(value, numbers.Real) or isinstance(value, bool_types):
+            return f"expected a {type_name}, got {type(value).__name__}"
+        return None
+
+    return check
+
+
+def _string_check(size: int | None) -> Check:
+    def check(value: Any) -> str | None:
+        if not isinstance(value, str):
+            return f"expected a STRING, got {type(value).__name__}"
+        if size is not None and len(value) > size:
+            return f"string of length {len(value)} exceeds the size {size}"
+        return None
+
+    return check
+
+
+def _boolean_check(value: Any) -> str | None:
+    return None if isinstance(value, bool) else f"expected a BOOLEAN, got {type(value).__name__}"
+
+
+def _array_check(element_check: Check) -> Check:
+    def check(value: Any) -> str | None:
+        if not isinstance(value, list):
+            return f"expected an array, got {type(value).__name__}"
+        for element in value:
+            error = element_check(element)
+            if error is not None:
+                return f"invalid array element: {error}"
+        return None
+
+    return check
+
+
+def _geometry_check(type_name: str, srid: int | None, allow_crs_transformation: bool) -> Check:
+    # Generic geometry types accept any kind of geometry, POINTZ accepts "POINT Z (...)" and GeoJSON "Point"
+    expected_kind = None if type_name.startswith("GEOMETRY") else type_name
+
+    def check_kind(kind: str) -> str | None:
+        if expected_kind is not None and kind != expected_kind and kind.rstrip("ZM") != expected_kind.rstrip("ZM"):
+            return f"expected a {type_name} geometry, got {kind}"
+        return None
+
+    def check_wkt(wkt: Any) -> str | None:
+        if not isinstance(wkt, str):
+            return f"expected a WKT string, got {type(wkt).__name__}"
+        srid_match = _SRID_PREFIX.match(wkt)
+        if srid_match is not None:
+            if srid is not None and int(srid_match.group(1)) != srid and not allow_crs_transformation:
+                return f"SRID {srid_match.group(1)} does not match the SRID {srid} of the property"
+            wkt = wkt[srid_match.end() :]
+        kind_match = _WKT_KIND.match(wkt)
+        if kind_match is None:
+            return f"invalid WKT {wkt[:30]!r}"
+        return check_kind("".join(group for group in kind_match.groups() if group).upper())
+
+    def check(value: Any) -> str | None:
+        if isinstance(value, ArrayGeometry):
+            if srid is not None and value.srid is not None and value.srid != srid and not allow_crs_transformation:
+                return f"SRID {value.srid} does not match the SRID {srid} of the property"
+            return check_kind(value.geometry_type.upper() + ("Z" if value.coordinates.shape[1] == 3 else ""))
+        if not isinstance(value, dict):
+            return f"expected a geometry, got {type(value).__name__}"
+        if "wkt" in value:
+            return check_wkt(value["wkt"])
+        if "ewkt" in value:
+            return check_wkt(value["ewkt"])
+        if "wkb" in value:
+            return None
+        if "type" in value and ("coordinates" in value or "geometries" in value):
+            return check_kind(str(value["type"]).upper())
+        return "expected a geometry as wkt, ewkt, wkb or GeoJSON"
+
+    return check
+
+
+def _property_check(spec: dict[str, Any], allow_crs_transformation: bool) -> Check | None:
+    type_name = spec["type"]
+    if type_name == "STRING":
+        return _string_check(spec.get("size"))
+    if type_name == "INT":
+        return _integer_check(type_name, _INT_RANGE)
+    if type_name == "LONG":
+        return _integer_check(type_name, _LONG_RANGE)
+    if type_name in ("DOUBLE", "FLOAT"):
+        return _number_check(type_name)
+    if type_name == "BOOLEAN":
+        return _boolean_check
+    if type_name in ("DATE", "TIMESTAMP"):
+        return _string_check(None)
+    if type_name.endswith("ARRAY"):
+        element_check = _property_check({"type": type_name[: -len("ARRAY")]}, allow_crs_transformation)
+        return _array_check(element_check) if element_check is not None else None
+    if _is_geometry_type(type_name):
+        return _geometry_check(type_name, spec.get("srid"), allow_crs_transformation)
+    # JSON and types unknown to this version of the SDK are left to the service
+    return None
+
+
+class FeatureValidator:
+    """Validates features against the properties of a feature type before they are sent.
+
+    The property specifications are compiled once into one check per property. Use :func:`feature_validator` to
+    reuse the validator of a feature type.
+
+    Args:
+        properties (dict[str, Any]): the properties of the feature type.
+        allow_crs_transformation (bool): accept geometries in another SRID than the one of the property.
+    """
+
+    def __init__(self, properties: dict[str, Any], allow_crs_transformation: bool = False):
+        self._checks: dict[str, Check | None] = {}
+        self._required: list[str] = []
+        self._optional: set[str] = set()
+        for name, spec in properties.items():
+            if name in _GENERATED_PROPERTIES:
+                continue
+            self._checks[name] = _property_check(spec, allow_crs_transformation)
+            if spec.get("optional"):
+                self._optional.add(name)
+            else:
+                self._required.append(name)
+        self._checks.setdefault("externalId", _string_check(255))
+        if "externalId" not in self._required:
+            self._required.append("externalId")
+
+    def validate(self, item: dict[str, Any]) -> str | None:
+        """Returns the reason why a feature in the API format is invalid, or None if it is valid."""
+        for name in self._required:
+            if item.get(name) is None:
+                return f"missing required property {name!r}"
+        checks = self._checks
+        for name, value in item.items():
+            if name not in checks:
+                return f"unknown property {name!r}"
+            if value is None:
+                if name not in self._optional:
+                    return f"property {name!r} can't be null"
+                continue
+            check = checks[name]
+            if check is not None:
+                error = check(value)
+                if error is not None:
+                    return f"property {name!r}: {error}"
+        return None
+
+    def encode(
+        self, features: Iterable[Feature | dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[FeatureRejection]]:
+        """Dump and validate features in one pass, returning the valid items and the rejected features."""
+        items: list[dict[str, Any]] = []
+        rejected: list[FeatureRejection] = []
+        for feature in features:
+            item = feature if isinstance(feature, dict) else feature.dump(camel_case=True)
+            reason = self.validate(item)
+            if reason is None:
+                items.append(item)
+            else:
+                rejected.append(FeatureRejection(external_id=item.get("externalId"), item=item, reason=reason))
+        return items, rejected
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled_feature_validator(properties: str, allow_crs_transformation: bool) -> FeatureValidator:
+    return FeatureValidator(json.loads(properties), allow_crs_transformation)
+
+
+def feature_validator(properties: dict[str, Any], allow_crs_transformation: bool = False) -> FeatureValidator:
+    """The validator for the given feature type properties, compiled once per distinct schema."""
+    return _compiled_feature_validator(json.dumps(properties, sort_keys=True), allow_crs_transformation)
@@ -8,6 +8,7 @@ from cognite.client.credentials import OAuthClientCredentials
 from cognite.experimental._api.alerts import AlertsAPI
 from cognite.experimental._api.extractionpipelines import ExperimentalExtractionPipelinesAPI
 from cognite.experimental._api.geospatial import ExperimentalGeospatialAPI
+from cognite.experimental._api.geospatial_async import AsyncExperimentalGeospatialAPI
 from cognite.experimental._api.hosted_extractors import HostedExtractorsAPI
 from cognite.experimental._api.simulators import SimulatorsAPI
 
@@ -44,6 +45,7 @@ class CogniteClient(Client):
         self._config = client_config
         super().__init__(self._config)
         self.geospatial = ExperimentalGeospatialAPI(self._config, api_version="v1", cognite_client=self)
+        self.geospatial_async = AsyncExperimentalGeospatialAPI(self.geospatial)
         self.alerts = AlertsAPI(self._config, api_version="v1", cognite_client=self)
         self.simulators = SimulatorsAPI(self._config, api_version="v1", cognite_client=self)
 
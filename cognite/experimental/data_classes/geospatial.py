@@ -1,21 +1,36 @@
 from __future__ import annotations
 
+import functools
+import json
+import re
 from abc import ABC
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Callable, Sequence, cast
 
 from cognite.client import utils
 from cognite.client.data_classes._base import (
+    CogniteObject,
     CogniteResource,
     CogniteResourceList,
     ExternalIDTransformerMixin,
     WriteableCogniteResource,
     WriteableCogniteResourceList,
 )
+from cognite.client.data_classes.geospatial import Feature
+from cognite.client.utils._importing import local_import
 
 if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
     from cognite.experimental import CogniteClient
 
 
+@functools.lru_cache(maxsize=1024)
+def _to_snake_case(key: str) -> str:
+    # Computed results repeat the same few keys on every row
+    return utils._auxiliary.to_snake_case(key)
+
+
 class FeatureTypeCore(WriteableCogniteResource["FeatureTypeWrite"], ABC):
     def __init__(
         self,
@@ -201,8 +216,7 @@ class ComputedItem(CogniteResource):
     def _load(cls, resource: dict, cognite_client=None):
         instance = cls(cognite_client=cognite_client)
         for key, value in resource.items():
-            snake_case_key = utils._auxiliary.to_snake_case(key)
-            setattr(instance, snake_case_key, value)
+            setattr(instance, _to_snake_case(key), value)
         return instance
 
 
@@ -211,6 +225,41 @@ class ComputedItemList(CogniteResourceList):
     _ASSERT_CLASSES = False
 
 
+class ComputedColumns:
+    """Columnar representation of computed items, with one NumPy array per output property.
+
+    Property names are converted to snake case, like the attributes of `ComputedItem`. Numbers and booleans are
+    stored in typed arrays (missing numbers as NaN), WKT geometries as their WKT string, and other values in object
+    arrays.
+
+    Args:
+        columns (dict[str, np.ndarray]): the values of each output property.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def keys(self) -> list[str]:
+        return list(self.columns)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={len(self)}, columns={self.keys()})"
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Wrap the columns in a DataFrame without copying them."""
+        pd = local_import("pandas")
+        return pd.DataFrame({name: pd.Series(values, copy=False) for name, values in self.columns.items()}, copy=False)
+
+
 class ComputeOrder:
     """An order specification with respect to an expression."""
 
@@ -219,6 +268,492 @@ class ComputeOrder:
         self.direction = direction
 
 
+class ComputeParameter:
+    """A placeholder for a value substituted on each call of a compiled compute, see
+    :meth:`ExperimentalGeospatialAPI.compile_compute`.
+
+    Args:
+        name (str): the keyword argument providing the value. Letters, digits and underscores only.
+    """
+
+    def __init__(self, name: str):
+        if not name.isidentifier():
+            raise ValueError(f"Invalid compute parameter name {name!r}")
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"ComputeParameter({self.name!r})"
+
+
+class FeaturePartitioning:
+    """A split of a feature stream into disjoint partitions that can be streamed concurrently.
+
+    Each partition is a filter that is combined with the stream filter.
+
+    Args:
+        filters (list[dict[str, Any]]): one filter per partition.
+        deduplicate (bool): whether the same feature can match several partitions and must be deduplicated on
+            external id when the partitions are merged. The external ids of all the features yielded so far are then
+            kept in memory until the end of the stream, which grows with the stream unlike the bounded buffer of
+            the merge.
+    """
+
+    def __init__(self, filters: list[dict[str, Any]], deduplicate: bool = False):
+        self.filters = filters
+        self.deduplicate = deduplicate
+
+    @classmethod
+    def by_external_id_ranges(cls, boundaries: Sequence[str]) -> FeaturePartitioning:
+        """Partition on external id, splitting at each of the given (sorted) boundaries.
+
+        Args:
+            boundaries (Sequence[str]): the external ids where one partition ends and the next one starts.
+
+        Returns:
+            FeaturePartitioning: len(boundaries) + 1 partitions covering all external ids.
+
+        Examples:
+
+            Stream features in four partitions, for external ids that are evenly spread hex strings:
+
+                >>> partitioning = FeaturePartitioning.by_external_id_ranges(["4", "8", "c"])
+        """
+        boundaries = sorted(boundaries)
+        bounds: list[dict[str, str]] = [{}] + [{"gte": boundary} for boundary in boundaries]
+        for i, boundary in enumerate(boundaries):
+            bounds[i]["lt"] = boundary
+        return cls([{"range": {"property": "externalId", **bound}} if bound else {} for bound in bounds])
+
+    @classmethod
+    def by_bbox_grid(
+        cls,
+        property: str,
+        bbox: tuple[float, float, float, float],
+        rows: int,
+        columns: int,
+        srid: int | None = None,
+    ) -> FeaturePartitioning:
+        """Partition on a regular grid over a bounding box, using `stIntersects` on a geometry property.
+
+        Geometries crossing cell borders intersect several cells, so the partitions are deduplicated when merged, at
+        the cost of holding the external ids of the streamed features in memory.
+        Features outside the bounding box are not part of any partition.
+
+        Args:
+            property (str): the geometry property to partition on.
+            bbox (tuple[float, float, float, float]): the bounding box as (min x, min y, max x, max y).
+            rows (int): number of grid rows.
+            columns (int): number of grid columns.
+            srid (int | None): the srid of the bounding box coordinates, if not the one of the property.
+
+        Returns:
+            FeaturePartitioning: rows * columns partitions.
+
+        Examples:
+
+            Stream features in 16 partitions over Norway:
+
+                >>> partitioning = FeaturePartitioning.by_bbox_grid("position", (4.0, 57.0, 32.0, 72.0), 4, 4)
+        """
+        if rows < 1 or columns < 1:
+            raise ValueError("The grid must have at least one row and one column")
+        min_x, min_y, max_x, max_y = bbox
+        width, height = (max_x - min_x) / columns, (max_y - min_y) / rows
+        key, prefix = ("ewkt", f"SRID={srid};") if srid is not None else ("wkt", "")
+        filters = []
+        for row in range(rows):
+            for column in range(columns):
+                x0, y0 = min_x + column * width, min_y + row * height
+                x1, y1 = x0 + width, y0 + height
+                polygon = f"POLYGON(({x0} {y0},{x1} {y0},{x1} {y1},{x0} {y1},{x0} {y0}))"
+                filters.append({"stIntersects": {"property": property, "value": {key: prefix + polygon}}})
+        return cls(filters, deduplicate=True)
+
+
+_EWKT_SRID = re.compile(r"^\s*SRID=(\d+)\s*;", re.IGNORECASE)
+_WKT_HEADER = re.compile(r"^\s*([A-Za-z]+)\s*(ZM|Z|M)?\s*", re.IGNORECASE)
+_WKT_INNERMOST = re.compile(r"\(([^()]*)\)")
+_GEOMETRY_TYPES = {
+    name.upper(): name for name in ("Point", "LineString", "Polygon", "MultiPoint", "MultiLineString", "MultiPolygon")
+}
+# Number of offset arrays of each geometry type, from the outermost parts to the innermost
+_OFFSET_LEVELS = {"Point": 0, "LineString": 0, "MultiPoint": 0, "Polygon": 1, "MultiLineString": 1, "MultiPolygon": 2}
+
+
+def _format_coordinates(coordinates: np.ndarray) -> str:
+    # A single printf-style formatting of all the coordinates, with the shortest round-tripping float representation
+    point = " ".join(["%r"] * coordinates.shape[1])
+    return ", ".join([point] * len(coordinates)) % tuple(coordinates.ravel().tolist())
+
+
+class ArrayGeometry(CogniteObject):
+    """A geometry holding its coordinates in a NumPy array, instead of nested lists or a WKT string.
+
+    The coordinates of all the points are in one array of shape (n, 2) or (n, 3), and the parts are delimited by
+    offsets into it, as in the GeoArrow layout: the ring offsets of a Polygon, the line offsets of a MultiLineString,
+    and for a MultiPolygon the offsets of the polygons into the rings followed by the ring offsets. It can be given
+    as a geometry property of features to upsert, where it is sent as WKT, and streamed features can hold their
+    geometries as array geometries, see :meth:`ExperimentalGeospatialAPI.stream_features`. The arrays must not be
+    modified, as the WKT is computed once.
+
+    Args:
+        geometry_type (str): the GeoJSON type: Point, LineString, Polygon, MultiPoint, MultiLineString or MultiPolygon.
+        coordinates (np.ndarray): the coordinates, of shape (n, 2) or (n, 3).
+        offsets (Sequence[np.ndarray]): the offsets of the parts, from the outermost to the innermost.
+        srid (int | None): the SRID of the coordinates, sent with the geometry if set.
+    """
+
+    def __init__(
+        self,
+        geometry_type: str,
+        coordinates: np.ndarray,
+        offsets: Sequence[np.ndarray] = (),
+        srid: int | None = None,
+    ):
+        np = local_import("numpy")
+        geometry_type = _GEOMETRY_TYPES.get(geometry_type.upper(), geometry_type)
+        if geometry_type not in _OFFSET_LEVELS:
+            raise ValueError(f"Unsupported geometry type {geometry_type!r}")
+        if len(offsets) != _OFFSET_LEVELS[geometry_type]:
+            raise ValueError(f"A {geometry_type} has {_OFFSET_LEVELS[geometry_type]} offset array(s)")
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        if coordinates.ndim != 2 or coordinates.shape[1] not in (2, 3):
+            raise ValueError("The coordinates must be of shape (n, 2) or (n, 3)")
+        self.geometry_type = geometry_type
+        self.coordinates = coordinates
+        self.offsets = tuple(np.asarray(offset, dtype=np.int64) for offset in offsets)
+        self.srid = srid
+        self._wkt: str | None = None
+
+    def __repr__(self) -> str:
+        return f"ArrayGeometry({self.geometry_type}, coordinates={len(self.coordinates)}, srid={self.srid})"
+
+    @classmethod
+    def from_wkt(cls, wkt: str, srid: int | None = None) -> ArrayGeometry:
+        """Parse a WKT or EWKT geometry, its SRID prefix taking precedence over `srid`."""
+        np = local_import("numpy")
+        srid_match = _EWKT_SRID.match(wkt)
+        if srid_match is not None:
+            srid, wkt = int(srid_match.group(1)), wkt[srid_match.end() :]
+        header = _WKT_HEADER.match(wkt)
+        geometry_type = _GEOMETRY_TYPES.get(header.group(1).upper()) if header is not None else None
+        if header is None or geometry_type is None or (header.group(2) or "Z").upper() != "Z":
+            raise ValueError(f"Unsupported WKT geometry {wkt[:30]!r}")
+        body = wkt[header.end() :]
+        # Each innermost group is a run of coordinates: a point, a line or a ring
+        groups = _WKT_INNERMOST.findall(body)
+        if not groups or body.strip().upper() == "EMPTY":
+            dimensions = 3 if header.group(2) and header.group(2).upper() == "Z" else 2
+            coordinates = np.empty((0, dimensions))
+            counts: list[int] = []
+        else:
+            dimensions = len(groups[0].split(",", 1)[0].split())
+            flat = np.array(" ".join(groups).replace(",", " ").split(), dtype=float)
+            coordinates = flat.reshape(-1, dimensions)
+            counts = [group.count(",") + 1 for group in groups]
+        run_offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+        if geometry_type == "MultiPolygon":
+            # The groups replaced by a letter leave the rings of each polygon in its parentheses
+            skeleton = _WKT_INNERMOST.sub("r", body)
+            rings = [polygon.count("r") for polygon in _WKT_INNERMOST.findall(skeleton)]
+            offsets: tuple[np.ndarray, ...] = (np.concatenate([[0], np.cumsum(rings, dtype=np.int64)]), run_offsets)
+        elif _OFFSET_LEVELS[geometry_type]:
+            offsets = (run_offsets,)
+        else:
+            offsets = ()
+        geometry = cls(geometry_type, coordinates, offsets, srid=srid)
+        geometry._wkt = wkt.strip()
+        return geometry
+
+    @classmethod
+    def from_geojson(cls, geojson: dict[str, Any], srid: int | None = None) -> ArrayGeometry:
+        """Read a GeoJSON geometry."""
+        np = local_import("numpy")
+        geometry_type = geojson["type"]
+        nested = geojson["coordinates"]
+        levels = _OFFSET_LEVELS.get(geometry_type)
+        if levels is None:
+            raise ValueError(f"Unsupported geometry type {geometry_type!r}")
+        # Flatten the nesting levels above the runs of coordinates, counting the parts of each level
+        runs = [nested] if geometry_type in ("Point", "LineString", "MultiPoint") else nested
+        if geometry_type == "Point":
+            runs = [[nested]]
+        offsets: list[np.ndarray] = []
+        if geometry_type == "MultiPolygon":
+            offsets.append(np.concatenate([[0], np.cumsum([len(polygon) for polygon in nested], dtype=np.int64)]))
+            runs = [ring for polygon in nested for ring in polygon]
+        if levels:
+            offsets.append(np.concatenate([[0], np.cumsum([len(run) for run in runs], dtype=np.int64)]))
+        points = [point for run in runs for point in run]
+        coordinates = np.array(points, dtype=np.float64) if points else np.empty((0, 2))
+        return cls(geometry_type, coordinates, offsets, srid=srid)
+
+    @classmethod
+    def _load(cls, resource: dict[str, Any], cognite_client: CogniteClient | None = None) -> ArrayGeometry:
+        if "wkt" in resource or "ewkt" in resource:
+            return cls.from_wkt(resource.get("wkt", resource.get("ewkt")))
+        return cls.from_geojson(resource)
+
+    def _runs(self) -> list[np.ndarray]:
+        # The coordinates of each point, line or ring
+        if not self.offsets:
+            return [self.coordinates]
+        ring_offsets = self.offsets[-1].tolist()
+        return [self.coordinates[start:end] for start, end in zip(ring_offsets[:-1], ring_offsets[1:])]
+
+    def _nest(self, runs: list[Any], wrap: Callable[[list[Any]], Any]) -> Any:
+        if self.geometry_type == "MultiPolygon":
+            polygon_offsets = self.offsets[0].tolist()
+            return [wrap(runs[start:end]) for start, end in zip(polygon_offsets[:-1], polygon_offsets[1:])]
+        return runs
+
+    def _shapely_wkt(self) -> str | None:
+        # shapely formats the coordinates several times faster, when installed
+        try:
+            import shapely
+        except ImportError:
+            return None
+        np = local_import("numpy")
+        parts = len(self.offsets[0]) - 1 if self.offsets else len(self.coordinates)
+        geometry_offsets = () if self.geometry_type == "Point" else (np.array([0, parts]),)
+        geometry = shapely.from_ragged_array(
+            getattr(shapely.GeometryType, self.geometry_type.upper()),
+            self.coordinates,
+            tuple(reversed(self.offsets)) + geometry_offsets,
+        )[0]
+        return shapely.to_wkt(geometry, rounding_precision=-1)
+
+    def to_wkt(self) -> str:
+        """The WKT of the geometry, without SRID."""
+        if self._wkt is None:
+            name = self.geometry_type.upper() + (" Z" if self.coordinates.shape[1] == 3 else "")
+            if not len(self.coordinates):
+                self._wkt = f"{name} EMPTY"
+            elif (wkt := self._shapely_wkt()) is not None:
+                self._wkt = wkt
+            else:
+                runs = [f"({_format_coordinates(run)})" for run in self._runs()]
+                if self.geometry_type == "MultiPolygon":
+                    body = ", ".join(self._nest(runs, lambda rings: f"({', '.join(rings)})"))
+                else:
+                    body = (
+                        runs[0][1:-1]
+                        if self.geometry_type in ("Point", "LineString", "MultiPoint")
+                        else ", ".join(runs)
+                    )
+                self._wkt = f"{name} ({body})"
+        return self._wkt
+
+    def to_geojson(self) -> dict[str, Any]:
+        """The GeoJSON geometry, without SRID."""
+        runs = [run.tolist() for run in self._runs()]
+        if self.geometry_type in ("Point", "LineString", "MultiPoint"):
+            coordinates = runs[0][0] if self.geometry_type == "Point" and runs[0] else runs[0]
+        else:
+            coordinates = self._nest(runs, lambda rings: rings)
+        return {"type": self.geometry_type, "coordinates": coordinates}
+
+    @property
+    def __geo_interface__(self) -> dict[str, Any]:
+        return self.to_geojson()
+
+    def dump(self, camel_case: bool = True) -> dict[str, Any]:
+        """The geometry as sent to the API, its WKT prefixed by its SRID if set."""
+        return {"wkt": f"SRID={self.srid};{self.to_wkt()}" if self.srid is not None else self.to_wkt()}
+
+    def with_coordinates(self, coordinates: np.ndarray, srid: int | None = None) -> ArrayGeometry:
+        """A geometry with the same parts and other coordinates, such as the coordinates transformed to `srid`."""
+        return ArrayGeometry(self.geometry_type, coordinates, self.offsets, srid=srid)
+
+
+class LazyFeature:
+    """A streamed feature that keeps its raw JSON line and is only decoded when one of its properties is accessed.
+
+    Properties are read as attributes, like on `Feature`. Geometries are returned as they were streamed, and can be
+    decoded into shapely geometries on demand with `geometry`.
+
+    Args:
+        raw (bytes): the JSON encoded feature.
+        json_decoder (Callable[[bytes], Any]): the function used to decode the feature.
+        cognite_client (CogniteClient | None): the client to associate with the feature.
+    """
+
+    def __init__(
+        self,
+        raw: bytes,
+        json_decoder: Callable[[bytes], Any] = json.loads,
+        cognite_client: CogniteClient | None = None,
+    ):
+        self.raw = raw
+        self._json_decoder = json_decoder
+        self._resource: dict[str, Any] | None = None
+        self._geometries: dict[str, Any] = {}
+        self._cognite_client = cognite_client
+
+    def _decoded(self) -> dict[str, Any]:
+        if self._resource is None:
+            self._resource = self._json_decoder(self.raw)
+        return self._resource
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for names that are not instance attributes, so the raw line is decoded on first property access
+        if name.startswith("_"):
+            raise AttributeError(name)
+        key = utils._auxiliary.to_camel_case(name) if name in Feature.PRE_DEFINED_SNAKE_CASE_NAMES else name
+        try:
+            return self._decoded()[key]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no property {name!r}") from None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.raw!r})"
+
+    def geometry(self, property: str) -> Any:
+        """Decode a geometry property into a shapely geometry. Requires shapely.
+
+        Args:
+            property (str): the name of the geometry property.
+
+        Returns:
+            shapely.Geometry: the decoded geometry, or None if the property is not set.
+        """
+        if property not in self._geometries:
+            value = getattr(self, property)
+            if value is None:
+                geometry = None
+            elif "wkt" in value:
+                geometry = local_import("shapely.wkt").loads(value["wkt"])
+            else:
+                geometry = local_import("shapely.geometry").shape(value)
+            self._geometries[property] = geometry
+        return self._geometries[property]
+
+    def dump(self, camel_case: bool = True) -> dict[str, Any]:
+        return self.to_feature().dump(camel_case=camel_case)
+
+    def to_feature(self) -> Feature:
+        """Decode all properties into a `Feature`."""
+        return Feature._load(self._decoded(), cognite_client=self._cognite_client)
+
+
+class FeatureRejection:
+    """A feature rejected by the client side validation of a bulk feature upsert.
+
+    Args:
+        external_id (str | None): external id of the feature.
+        item (dict[str, Any]): the dumped feature.
+        reason (str): why the feature does not match its feature type.
+    """
+
+    def __init__(self, external_id: str | None, item: dict[str, Any], reason: str):
+        self.external_id = external_id
+        self.item = item
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(external_id={self.external_id!r}, reason={self.reason!r})"
+
+
+class FeatureUpsertChunk:
+    """The outcome of upserting one chunk of features.
+
+    Args:
+        index (int): position of the chunk in the upserted sequence of chunks.
+        external_ids (list[str]): external ids of the features sent in the chunk.
+        attempts (int): number of requests made for the chunk, including retries.
+        error (Exception | None): the error of the last attempt, if the chunk failed.
+        items (list[dict[str, Any]] | None): the dumped features of a failed chunk, so that they can be retried.
+        rejected (list[FeatureRejection] | None): the features of the chunk rejected before sending.
+        byte_size (int | None): serialized size of the features of the chunk.
+        latency (float | None): duration in seconds of the last request made for the chunk.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        external_ids: list[str],
+        attempts: int,
+        error: Exception | None = None,
+        items: list[dict[str, Any]] | None = None,
+        rejected: list[FeatureRejection] | None = None,
+        byte_size: int | None = None,
+        latency: float | None = None,
+    ):
+        self.index = index
+        self.external_ids = external_ids
+        self.attempts = attempts
+        self.error = error
+        self.items = items
+        self.rejected = rejected or []
+        self.byte_size = byte_size
+        self.latency = latency
+
+    def __repr__(self) -> str:
+        status = "failed" if self.error is not None else "succeeded"
+        return f"{type(self).__name__}(index={self.index}, size={len(self.external_ids)}, {status})"
+
+
+class FeatureUpsertReport:
+    """A report of the chunks of a bulk feature upsert.
+
+    Args:
+        succeeded (list[FeatureUpsertChunk] | None): the chunks that were upserted.
+        failed (list[FeatureUpsertChunk] | None): the chunks that failed after all retries.
+        rejected (list[FeatureRejection] | None): the dead-letter list of features rejected by the validation.
+    """
+
+    def __init__(
+        self,
+        succeeded: list[FeatureUpsertChunk] | None = None,
+        failed: list[FeatureUpsertChunk] | None = None,
+        rejected: list[FeatureRejection] | None = None,
+    ):
+        self.succeeded = succeeded or []
+        self.failed = failed or []
+        self.rejected = rejected or []
+
+    @property
+    def upserted_count(self) -> int:
+        return sum(len(chunk.external_ids) for chunk in self.succeeded)
+
+    @property
+    def failed_count(self) -> int:
+        return sum(len(chunk.external_ids) for chunk in self.failed)
+
+    @property
+    def failed_external_ids(self) -> list[str]:
+        return [external_id for chunk in self.failed for external_id in chunk.external_ids]
+
+    @property
+    def rejected_count(self) -> int:
+        return len(self.rejected)
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """The minimum, mean and maximum number of features, bytes and latency of the chunks sent so far."""
+        sent = [chunk for chunk in self.succeeded + self.failed if chunk.attempts]
+        samples = {
+            "items": [len(chunk.external_ids) for chunk in sent],
+            "bytes": [chunk.byte_size for chunk in sent if chunk.byte_size is not None],
+            "latency": [chunk.latency for chunk in sent if chunk.latency is not None],
+        }
+        return {
+            name: {"min": min(values), "mean": sum(values) / len(values), "max": max(values)}
+            for name, values in samples.items()
+            if values
+        }
+
+    def add(self, chunk: FeatureUpsertChunk) -> None:
+        (self.failed if chunk.error is not None else self.succeeded).append(chunk)
+        self.rejected.extend(chunk.rejected)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(upserted={self.upserted_count}, failed={self.failed_count}, "
+            f"failed_chunks={len(self.failed)}, rejected={self.rejected_count})"
+        )
+
+
 class GeospatialTask(CogniteResource):
     """A geospatial background task."""
 
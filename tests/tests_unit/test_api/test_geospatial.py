@@ -0,0 +1,1682 @@
+import asyncio
+import gzip
+import io
+import json
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from cognite.client._api.geospatial import GeospatialAPI
+from cognite.client.data_classes.geospatial import Feature, FeatureTypePatch, Patches
+from cognite.client.exceptions import CogniteAPIError, CogniteConnectionError
+from cognite.experimental import CogniteClient
+from cognite.experimental._api.geospatial import ExperimentalGeospatialAPI
+from cognite.experimental._api.geospatial_crs import transform_coordinates
+from cognite.experimental._api.geospatial_index import FeatureIndex
+from cognite.experimental._api.geospatial_mirror import geoparquet_column
+from cognite.experimental._api.geospatial_streaming import iter_ndjson_line_batches
+from cognite.experimental._api.geospatial_tiles import (
+    LINESTRING,
+    POINT,
+    POLYGON,
+    VectorTiler,
+    clip_line,
+    clip_ring,
+    encode_geometry,
+    parse_wkt,
+)
+from cognite.experimental._api.geospatial_upload import AdaptiveChunker, is_transient_error
+from cognite.experimental._api.geospatial_validation import FeatureValidator, feature_validator
+from cognite.experimental.data_classes.geospatial import (
+    ArrayGeometry,
+    ComputedColumns,
+    ComputeOrder,
+    ComputeParameter,
+    FeaturePartitioning,
+    GeospatialTask,
+    GeospatialTaskList,
+    LazyFeature,
+    MvpMappingsDefinition,
+)
+
+COGNITE_CLIENT = CogniteClient()
+TEST_API = COGNITE_CLIENT.geospatial
+
+STREAMED_FEATURES = [
+    {"externalId": "f1", "position": {"wkt": "POINT(1 2)"}, "temperature": 12.5, "volume": 3},
+    {"externalId": "f2", "position": {"wkt": "POINT(3 4)"}, "temperature": None, "volume": 4},
+    {"externalId": "f3", "position": {"wkt": "POINT(5 6)"}, "volume": 5, "tag": "abc"},
+]
+
+
+@pytest.fixture
+def mock_stream_features(rsps):
+    url_pattern = re.compile(
+        re.escape(TEST_API._get_base_url_with_base_path())
+        + r"/geospatial/featuretypes/my_type/features/search-streaming"
+    )
+    rsps.add(rsps.POST, url_pattern, status=200, body="\n".join(json.dumps(f) for f in STREAMED_FEATURES))
+    yield rsps
+
+
+@pytest.fixture
+def mock_stream_partitions(rsps):
+    url_pattern = re.compile(
+        re.escape(TEST_API._get_base_url_with_base_path())
+        + r"/geospatial/featuretypes/my_type/features/search-streaming"
+    )
+
+    def stream_partition(request):
+        # Each partition gets the features whose external id is in its range, the unbounded partitions get all
+        bounds = json.loads(gzip.decompress(request.body))["filter"]["and"][1].get("range", {})
+        features = [
+            f
+            for f in STREAMED_FEATURES
+            if bounds.get("gte", "") <= f["externalId"] and f["externalId"] < bounds.get("lt", "~")
+        ]
+        return 200, {}, "\n".join(json.dumps(f) for f in features)
+
+    rsps.add_callback(rsps.POST, url_pattern, callback=stream_partition)
+    yield rsps
+
+
+class TestStreamFeatures:
+    def test_stream_features(self, mock_stream_features):
+        features = list(TEST_API.stream_features("my_type", filter={}))
+        assert [f.external_id for f in features] == ["f1", "f2", "f3"]
+
+    def test_stream_features_lazy(self, mock_stream_features):
+        features = list(TEST_API.stream_features("my_type", filter={}, lazy=True))
+        assert all(isinstance(f, LazyFeature) for f in features)
+        assert all(f._resource is None for f in features)
+        assert features[0].external_id == "f1"
+        assert features[0].temperature == 12.5
+        assert features[2].tag == "abc"
+        with pytest.raises(AttributeError):
+            features[0].tag
+        assert features[1]._resource is None
+        assert features[2].to_feature().dump() == STREAMED_FEATURES[2]
+
+    def test_lazy_feature_geometry(self):
+        shapely = pytest.importorskip("shapely")
+        feature = LazyFeature(json.dumps(STREAMED_FEATURES[0]).encode())
+        assert feature.geometry("position").equals(shapely.Point(1, 2))
+        assert feature.geometry("position") is feature.geometry("position")
+
+    def test_stream_features_custom_decoder(self, mock_stream_features):
+        decoded = []
+
+        def decoder(line):
+            decoded.append(line)
+            return json.loads(line)
+
+        features = list(TEST_API.stream_features("my_type", filter={}, json_decoder=decoder, read_chunk_size=7))
+        assert [f.external_id for f in features] == ["f1", "f2", "f3"]
+        assert decoded == [json.dumps(f).encode() for f in STREAMED_FEATURES]
+
+    @pytest.mark.parametrize(
+        "chunks, expected",
+        [
+            ([b'{"a": 1}\n{"b"', b": 2}\n", b'{"c": 3}'], [[b'{"a": 1}'], [b'{"b": 2}'], [], [b'{"c": 3}']]),
+            ([b"x\n\ny\n", b"", b"z"], [[b"x", b"y"], [], [b"z"]]),
+            ([b"ab", b"cd", b"\n"], [[], [], [b"abcd"]]),
+        ],
+    )
+    def test_iter_ndjson_line_batches(self, chunks, expected):
+        assert list(iter_ndjson_line_batches(chunks)) == expected
+
+    def test_stream_features_partitioned(self, mock_stream_partitions):
+        partitioning = FeaturePartitioning.by_external_id_ranges(["f2", "f3"])
+        features = TEST_API.stream_features("my_type", filter={"not": {}}, partitioning=partitioning, max_buffered=1)
+        assert sorted(f.external_id for f in features) == ["f1", "f2", "f3"]
+        assert len(mock_stream_partitions.calls) == 3
+
+    def test_stream_features_partitioned_deduplicates(self, mock_stream_partitions):
+        partitioning = FeaturePartitioning([{"range": {}}, {"range": {}}], deduplicate=True)
+        features = TEST_API.stream_features("my_type", filter={"not": {}}, partitioning=partitioning)
+        assert sorted(f.external_id for f in features) == ["f1", "f2", "f3"]
+
+    def test_stream_feature_batches_numpy(self, mock_stream_features):
+        batches = list(TEST_API.stream_feature_batches("my_type", filter={}, batch_size=2))
+        assert [len(batch["externalId"]) for batch in batches] == [2, 1]
+        first, second = batches
+        assert first["position"].tolist() == ["POINT(1 2)", "POINT(3 4)"]
+        assert first["temperature"].dtype == np.float64
+        assert np.isnan(first["temperature"][1])
+        assert first["volume"].dtype == np.int64
+        assert "tag" not in first
+        assert second["tag"].tolist() == ["abc"]
+
+    def test_stream_feature_batches_arrow_wkb(self, mock_stream_features):
+        pa = pytest.importorskip("pyarrow")
+        shapely = pytest.importorskip("shapely")
+        (batch,) = TEST_API.stream_feature_batches("my_type", filter={}, output_format="arrow", geometry_format="wkb")
+        assert isinstance(batch, pa.RecordBatch)
+        assert batch.num_rows == 3
+        assert batch.schema.field("position").type == pa.binary()
+        assert shapely.from_wkb(batch.column("position")[2].as_py()).equals(shapely.Point(5, 6))
+        assert batch.column("tag").to_pylist() == [None, None, "abc"]
+
+    def test_stream_feature_batches_invalid_format(self):
+        with pytest.raises(ValueError, match="output_format"):
+            next(TEST_API.stream_feature_batches("my_type", filter={}, output_format="csv"))
+
+
+class TestStreamFeaturesResumable:
+    @staticmethod
+    def flaky_stream(monkeypatch, failures):
+        calls = []
+
+        def stream_feature_lines(*args, **kwargs):
+            calls.append(args)
+            for i, feature in enumerate(STREAMED_FEATURES):
+                if len(calls) <= failures and i == len(calls):
+                    raise CogniteConnectionError("connection lost")
+                yield json.dumps(feature).encode()
+
+        monkeypatch.setattr(TEST_API, "_stream_feature_lines", stream_feature_lines)
+        monkeypatch.setattr("cognite.experimental._api.geospatial.time.sleep", lambda _: None)
+        return calls
+
+    def test_reconnects_without_duplicates(self, monkeypatch):
+        calls = self.flaky_stream(monkeypatch, failures=2)
+        features = list(TEST_API.stream_features_resumable("my_type", filter={}))
+        assert [f.external_id for f in features] == ["f1", "f2", "f3"]
+        assert len(calls) == 3
+
+    def test_gives_up_after_max_reconnects(self, monkeypatch):
+        self.flaky_stream(monkeypatch, failures=2)
+        with pytest.raises(CogniteConnectionError):
+            list(TEST_API.stream_features_resumable("my_type", filter={}, max_reconnects=0))
+
+    def test_resumes_from_checkpoint_file(self, monkeypatch, tmp_path):
+        self.flaky_stream(monkeypatch, failures=0)
+        checkpoint_path = tmp_path / "checkpoint"
+        stream = TEST_API.stream_features_resumable("my_type", filter={}, checkpoint_path=checkpoint_path)
+        assert next(stream).external_id == "f1"
+        assert next(stream).external_id == "f2"
+        stream.close()
+
+        features = list(TEST_API.stream_features_resumable("my_type", filter={}, checkpoint_path=checkpoint_path))
+        assert [f.external_id for f in features] == ["f2", "f3"]
+
+    def test_skips_delivered_features_without_decoding(self, monkeypatch, tmp_path):
+        self.flaky_stream(monkeypatch, failures=0)
+        checkpoint_path = tmp_path / "checkpoint"
+        checkpoint_path.write_text('"f1"\n"f2"\n')
+        decoded = []
+
+        def decode(line):
+            decoded.append(line)
+            return json.loads(line)
+
+        features = list(
+            TEST_API.stream_features_resumable(
+                "my_type", filter={}, checkpoint_path=checkpoint_path, json_decoder=decode
+            )
+        )
+        assert [f.external_id for f in features] == ["f3"]
+        assert len(decoded) == 1
+
+    def test_resumes_only_unfinished_partitions(self, monkeypatch, tmp_path):
+        filters = []
+
+        def stream_feature_lines(feature_type_external_id, filter, *args):
+            filters.append(filter)
+            bounds = filter.get("range", {})
+            for feature in STREAMED_FEATURES:
+                external_id = feature["externalId"]
+                if bounds.get("gte", external_id) <= external_id and external_id < bounds.get("lt", "~"):
+                    yield json.dumps(feature).encode()
+
+        monkeypatch.setattr(TEST_API, "_stream_feature_lines", stream_feature_lines)
+        checkpoint_path = tmp_path / "checkpoint"
+        partitioning = FeaturePartitioning.by_external_id_ranges(["f2", "f3"])
+        stream = TEST_API.stream_features_resumable(
+            "my_type", filter={}, checkpoint_path=checkpoint_path, partitioning=partitioning
+        )
+        assert next(stream).external_id == "f1"
+        assert next(stream).external_id == "f2"
+        stream.close()
+        assert checkpoint_path.read_text() == '{"completed": 0}\n'
+
+        filters.clear()
+        features = list(
+            TEST_API.stream_features_resumable(
+                "my_type", filter={}, checkpoint_path=checkpoint_path, partitioning=partitioning
+            )
+        )
+        assert [f.external_id for f in features] == ["f2", "f3"]
+        assert filters == partitioning.filters[1:]
+        assert checkpoint_path.read_text() == '{"completed": 0}\n{"completed": 1}\n{"completed": 2}\n'
+
+    def test_rejects_overlapping_partitions(self):
+        partitioning = FeaturePartitioning.by_bbox_grid("position", (0, 0, 1, 1), rows=2, columns=2)
+        with pytest.raises(ValueError, match="disjoint"):
+            next(TEST_API.stream_features_resumable("my_type", filter={}, partitioning=partitioning))
+
+
+@pytest.fixture
+def mock_upsert_features(rsps, monkeypatch):
+    monkeypatch.setattr("cognite.experimental._api.geospatial_upload.time.sleep", lambda _: None)
+    url_pattern = re.compile(
+        re.escape(TEST_API._get_base_url_with_base_path()) + r"/geospatial/featuretypes/my_type/features/upsert"
+    )
+    attempts = {}
+
+    def upsert(request):
+        items = json.loads(gzip.decompress(request.body))["items"]
+        external_ids = tuple(item["externalId"] for item in items)
+        attempts[external_ids] = attempts.get(external_ids, 0) + 1
+        if "bad" in external_ids:
+            return 400, {}, json.dumps({"error": {"code": 400, "message": "Invalid feature"}})
+        if "flaky" in external_ids and attempts[external_ids] == 1:
+            return 503, {}, json.dumps({"error": {"code": 503, "message": "Service unavailable"}})
+        return 200, {}, json.dumps({"items": items})
+
+    rsps.add_callback(rsps.POST, url_pattern, callback=upsert)
+    yield attempts
+
+
+class TestUpsertFeaturesBulk:
+    def test_upsert_features_bulk_report(self, mock_upsert_features):
+        external_ids = ["f1", "f2", "flaky", "f4", "bad", "f6", "f7"]
+        progress = []
+        report = TEST_API.upsert_features_bulk(
+            "my_type",
+            (Feature(external_id=external_id, temperature=1.0) for external_id in external_ids),
+            chunk_size=2,
+            max_workers=2,
+            progress_callback=lambda r: progress.append(len(r.succeeded) + len(r.failed)),
+        )
+        assert report.upserted_count == 5
+        assert report.failed_external_ids == ["bad", "f6"]
+        assert report.failed[0].index == 2
+        assert report.failed[0].attempts == 1
+        assert report.failed[0].items == [
+            {"externalId": "bad", "temperature": 1.0},
+            {"externalId": "f6", "temperature": 1.0},
+        ]
+        assert {chunk.index: chunk.attempts for chunk in report.succeeded} == {0: 1, 1: 2, 3: 1}
+        assert progress == [1, 2, 3, 4]
+
+    def test_upsert_features_bulk_consumes_lazily(self, mock_upsert_features):
+        consumed = []
+
+        def features():
+            for i in range(100):
+                consumed.append(i)
+                yield Feature(external_id=f"f{i}")
+
+        report_stream = TEST_API.upsert_features_bulk(
+            "my_type",
+            features(),
+            chunk_size=10,
+            max_workers=1,
+            progress_callback=lambda r: consumed.append(("done", r.upserted_count)),
+        )
+        assert report_stream.upserted_count == 100
+        # With one worker, at most two chunks are read ahead of the completed uploads
+        assert consumed.index(("done", 10)) < consumed.index(30)
+
+    def test_transient_errors(self):
+        assert is_transient_error(CogniteAPIError("Too many requests", code=429))
+        assert is_transient_error(CogniteAPIError("Service unavailable", code=503))
+        assert is_transient_error(CogniteConnectionError("connection lost"))
+        assert not is_transient_error(CogniteAPIError("Invalid feature", code=400))
+        assert not is_transient_error(CogniteAPIError("No response status", code=None))
+
+
+class TestAdaptiveChunker:
+    def test_split_by_items_and_bytes(self):
+        features = [{"externalId": "a" * size} for size in (10, 10, 10, 100, 10)]
+        chunker = AdaptiveChunker(max_items=2, max_bytes=60, adaptive=False)
+        chunks = [chunk for chunk, _ in chunker.split(features)]
+        assert [len(chunk) for chunk in chunks] == [2, 1, 1, 1]
+        assert [size for _, size in chunker.split(features)] == [58, 29, 119, 29]
+
+    def test_byte_budget_follows_latency(self):
+        chunker = AdaptiveChunker(max_items=1000, max_bytes=10_000_000, initial_bytes=1_000_000, min_bytes=1000)
+        chunker.record(chunk_bytes=1_000_000, latency=8.0)
+        assert chunker.byte_budget == 625_000
+        for _ in range(20):
+            chunker.record(chunk_bytes=1_000_000, latency=0.01)
+        assert chunker.byte_budget == 10_000_000
+
+    def test_fixed_chunker_ignores_latency(self):
+        chunker = AdaptiveChunker(max_items=10, max_bytes=5000, adaptive=False)
+        chunker.record(chunk_bytes=5000, latency=100.0)
+        assert chunker.byte_budget == 5000
+
+    def test_upsert_features_bulk_caps_chunk_bytes(self, mock_upsert_features):
+        features = [Feature(external_id=f"f{i}", description="x" * 100) for i in range(10)]
+        report = TEST_API.upsert_features_bulk("my_type", features, max_chunk_bytes=300, max_workers=1)
+        assert report.upserted_count == 10
+        assert [len(external_ids) for external_ids in mock_upsert_features] == [2, 2, 2, 2, 2]
+        stats = report.stats
+        assert stats["items"] == {"min": 2, "mean": 2, "max": 2}
+        assert stats["bytes"]["max"] <= 300
+        assert stats["latency"]["min"] > 0
+
+
+class TestUpsertFeatures:
+    def test_upsert_features_from_generator(self, mock_upsert_features):
+        features = (Feature(external_id=f"f{i}", temperature=float(i)) for i in range(5))
+        res = TEST_API.upsert_features("my_type", features, chunk_size=2)
+        assert sorted(f.external_id for f in res) == ["f0", "f1", "f2", "f3", "f4"]
+        assert sorted(mock_upsert_features) == [("f0", "f1"), ("f2", "f3"), ("f4",)]
+
+    def test_upsert_features_from_async_generator(self, mock_upsert_features):
+        async def features():
+            for i in range(3):
+                yield Feature(external_id=f"f{i}")
+
+        assert TEST_API.upsert_features("my_type", features(), return_features=False) is None
+        assert list(mock_upsert_features) == [("f0", "f1", "f2")]
+
+
+@pytest.fixture
+def mock_retrieve_feature_type(rsps):
+    rsps.add(
+        rsps.POST,
+        TEST_API._get_base_url_with_base_path() + "/geospatial/featuretypes/byids",
+        status=200,
+        json={
+            "items": [
+                {
+                    "externalId": "my_type",
+                    "properties": {
+                        "position": {"type": "POINT", "srid": 4326},
+                        "temperature": {"type": "DOUBLE", "optional": True},
+                        "volume": {"type": "LONG", "optional": True},
+                        "active": {"type": "BOOLEAN", "optional": True},
+                        "depths": {"type": "LONGARRAY", "optional": True},
+                        "externalId": {"type": "STRING", "size": 255},
+                        "createdTime": {"type": "LONG"},
+                        "lastUpdatedTime": {"type": "LONG"},
+                    },
+                    "searchSpec": {},
+                    "createdTime": 0,
+                    "lastUpdatedTime": 0,
+                }
+            ]
+        },
+    )
+    yield rsps
+
+
+def upserted_items(rsps):
+    return [
+        item
+        for call in rsps.calls
+        if call.request.url.endswith("/upsert")
+        for item in json.loads(gzip.decompress(call.request.body))["items"]
+    ]
+
+
+EXPECTED_FILE_FEATURES = [
+    {"externalId": "f1", "position": {"wkt": "POINT(1 2)"}, "temperature": 12.5, "volume": 3, "active": True},
+    {"externalId": "f2", "position": {"ewkt": "SRID=4326;POINT(3 4)"}, "volume": 4, "active": False},
+]
+
+
+class TestUpsertFeaturesFromFile:
+    def test_upsert_csv(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        path = tmp_path / "features.csv"
+        path.write_text(
+            "id,wkt,temperature,volume,active\n" "f1,POINT(1 2),12.5,3,true\n" "f2,SRID=4326;POINT(3 4),,4,false\n"
+        )
+        report = TEST_API.upsert_features_from_file("my_type", path, external_id_column="id")
+        assert report.upserted_count == 2
+        assert upserted_items(mock_retrieve_feature_type) == EXPECTED_FILE_FEATURES
+
+    def test_upsert_geojson(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        path = tmp_path / "features.geojson"
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "id": "f1",
+                    "geometry": {"type": "Point", "coordinates": [1, 2]},
+                    "properties": {"temperature": 12, "volume": 3},
+                },
+                {"type": "Feature", "geometry": None, "properties": {"externalId": "f2", "temperature": None}},
+            ],
+        }
+        path.write_text(json.dumps(collection))
+        report = TEST_API.upsert_features_from_file("my_type", path, chunk_size=1, validate=False)
+        assert report.upserted_count == 2
+        assert sorted(upserted_items(mock_retrieve_feature_type), key=lambda item: item["externalId"]) == [
+            {
+                "externalId": "f1",
+                "temperature": 12.0,
+                "volume": 3,
+                "position": {"type": "Point", "coordinates": [1, 2]},
+            },
+            {"externalId": "f2"},
+        ]
+
+    def test_upsert_file_rejects_invalid_features(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        path = tmp_path / "features.csv"
+        path.write_text("externalId,wkt,volume\nf1,POINT(1 2),3\nf2,,4\n")
+        report = TEST_API.upsert_features_from_file("my_type", path)
+        assert report.upserted_count == 1
+        assert [(r.external_id, r.reason) for r in report.rejected] == [("f2", "missing required property 'position'")]
+
+    def test_upsert_csv_rejects_bad_cells(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        path = tmp_path / "features.csv"
+        path.write_text(
+            "externalId,wkt,temperature,volume\nf1,POINT(1 2),x,3\nf2,POINT(3 4),1.5,2.5\nf3,POINT(5 6),2,4\n"
+        )
+        report = TEST_API.upsert_features_from_file("my_type", path)
+        assert report.upserted_count == 1
+        assert [(r.external_id, r.reason) for r in report.rejected] == [
+            ("f1", "property 'temperature': expected a DOUBLE, got str"),
+            ("f2", "property 'volume': expected a LONG, got str"),
+        ]
+        assert upserted_items(mock_retrieve_feature_type) == [
+            {"externalId": "f3", "position": {"wkt": "POINT(5 6)"}, "temperature": 2.0, "volume": 4}
+        ]
+
+    def test_upsert_ndjson_rejects_bad_values(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        path = tmp_path / "features.ndjson"
+        lines = [
+            {"externalId": "f1", "position": {"wkt": "POINT(1 2)"}, "volume": "many"},
+            {"externalId": "f2", "position": {"wkt": "POINT(3 4)"}, "volume": 4.0, "temperature": "12"},
+        ]
+        path.write_text("\n".join(json.dumps(line) for line in lines))
+        report = TEST_API.upsert_features_from_file("my_type", path)
+        assert [(r.external_id, r.reason) for r in report.rejected] == [
+            ("f1", "property 'volume': expected a LONG, got str")
+        ]
+        assert upserted_items(mock_retrieve_feature_type) == [
+            {"externalId": "f2", "position": {"wkt": "POINT(3 4)"}, "volume": 4, "temperature": 12.0}
+        ]
+
+    def test_upsert_ndjson(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        path = tmp_path / "features.ndjson"
+        path.write_text("\n".join(json.dumps(f) for f in STREAMED_FEATURES[:2]) + "\n\n")
+        report = TEST_API.upsert_features_from_file("my_type", path)
+        assert report.upserted_count == 2
+        assert upserted_items(mock_retrieve_feature_type) == [
+            {"externalId": "f1", "position": {"wkt": "POINT(1 2)"}, "temperature": 12.5, "volume": 3},
+            {"externalId": "f2", "position": {"wkt": "POINT(3 4)"}, "volume": 4},
+        ]
+
+    def test_upsert_geoparquet(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        shapely = pytest.importorskip("shapely")
+        table = pa.table(
+            {
+                "externalId": ["f1", "f2"],
+                "geom": shapely.to_wkb(shapely.points([[1, 2], [3, 4]])),
+                "volume": [3, None],
+            }
+        ).replace_schema_metadata({"geo": json.dumps({"primary_column": "geom"})})
+        path = tmp_path / "features.parquet"
+        pq.write_table(table, path)
+        report = TEST_API.upsert_features_from_file("my_type", path)
+        assert report.upserted_count == 2
+        assert upserted_items(mock_retrieve_feature_type) == [
+            {"externalId": "f1", "volume": 3, "position": {"wkt": "POINT (1 2)"}},
+            {"externalId": "f2", "position": {"wkt": "POINT (3 4)"}},
+        ]
+
+    def test_upsert_geoparquet_with_array_column(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        shapely = pytest.importorskip("shapely")
+        table = pa.table(
+            {
+                "externalId": ["f1", "f2", "f3"],
+                "geometry": shapely.to_wkb(shapely.points([[1, 2], [3, 4], [5, 6]])),
+                "depths": [[1, 2, 3], None, []],
+            }
+        )
+        path = tmp_path / "features.parquet"
+        pq.write_table(table, path)
+        report = TEST_API.upsert_features_from_file("my_type", path)
+        assert report.upserted_count == 3
+        assert [item.get("depths") for item in upserted_items(mock_retrieve_feature_type)] == [[1, 2, 3], None, []]
+
+    def test_upsert_geoparquet_keeps_full_precision(self, mock_retrieve_feature_type, mock_upsert_features, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        shapely = pytest.importorskip("shapely")
+        table = pa.table(
+            {"externalId": ["f1"], "geometry": shapely.to_wkb(shapely.points([[1.123456789, 2.987654321]]))}
+        )
+        path = tmp_path / "features.parquet"
+        pq.write_table(table, path)
+        TEST_API.upsert_features_from_file("my_type", path)
+        (item,) = upserted_items(mock_retrieve_feature_type)
+        assert shapely.get_coordinates(shapely.from_wkt(item["position"]["wkt"])).tolist() == [
+            [1.123456789, 2.987654321]
+        ]
+
+    def test_unknown_file_format(self, tmp_path):
+        with pytest.raises(ValueError, match="file_format"):
+            TEST_API.upsert_features_from_file("my_type", tmp_path / "features.txt")
+
+
+VALIDATED_PROPERTIES = {
+    "position": {"type": "POINT", "srid": 4326},
+    "name": {"type": "STRING", "size": 3, "optional": True},
+    "volume": {"type": "INT", "optional": True},
+    "temperature": {"type": "DOUBLE", "optional": True},
+    "tags": {"type": "LONGARRAY", "optional": True},
+    "externalId": {"type": "STRING", "size": 255},
+    "createdTime": {"type": "LONG"},
+    "lastUpdatedTime": {"type": "LONG"},
+}
+
+
+class TestFeatureValidator:
+    @pytest.mark.parametrize(
+        "item, reason",
+        [
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "temperature": 3}, None),
+            ({"externalId": "f", "position": {"ewkt": "SRID=4326;POINT Z (1 2 3)"}, "tags": [1, 2]}, None),
+            ({"externalId": "f", "position": {"type": "Point", "coordinates": [1, 2]}, "name": None}, None),
+            ({"externalId": "f"}, "missing required property 'position'"),
+            ({"position": {"wkt": "POINT(1 2)"}}, "missing required property 'externalId'"),
+            ({"externalId": "f", "position": {"wkt": "LINESTRING(1 2, 3 4)"}}, "expected a POINT geometry"),
+            ({"externalId": "f", "position": {"ewkt": "SRID=3857;POINT(1 2)"}}, "does not match the SRID 4326"),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "name": "abcd"}, "exceeds the size 3"),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "volume": 2**40}, "out of the INT range"),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "volume": True}, "expected a INT"),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "volume": np.bool_(True)}, "expected a INT"),
+            (
+                {"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "temperature": np.bool_(True)},
+                "expected a DOUBLE",
+            ),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "volume": np.int64(2**40)}, "out of the INT range"),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "volume": np.int32(7)}, None),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "temperature": np.float32(1.5)}, None),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "tags": [np.int64(1), np.uint8(2)]}, None),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "tags": [1, "a"]}, "invalid array element"),
+            ({"externalId": "f", "position": {"wkt": "POINT(1 2)"}, "color": "red"}, "unknown property 'color'"),
+        ],
+    )
+    def test_validate(self, item, reason):
+        error = FeatureValidator(VALIDATED_PROPERTIES).validate(item)
+        if reason is None:
+            assert error is None
+        else:
+            assert reason in error
+
+    def test_allow_crs_transformation(self):
+        validator = FeatureValidator(VALIDATED_PROPERTIES, allow_crs_transformation=True)
+        assert validator.validate({"externalId": "f", "position": {"ewkt": "SRID=3857;POINT(1 2)"}}) is None
+
+    def test_validator_is_cached(self):
+        assert feature_validator(dict(VALIDATED_PROPERTIES)) is feature_validator(VALIDATED_PROPERTIES)
+        assert feature_validator(VALIDATED_PROPERTIES) is not feature_validator(VALIDATED_PROPERTIES, True)
+
+    def test_upsert_features_bulk_rejects_invalid_features(self, mock_retrieve_feature_type, mock_upsert_features):
+        features = [
+            Feature(external_id="f1", position={"wkt": "POINT(1 2)"}, volume=3),
+            Feature(external_id="f2", position={"wkt": "POINT(3 4)"}, volume="3"),
+            Feature(external_id="f3", volume=3),
+            {"externalId": "f4", "position": {"wkt": "POINT(5 6)"}},
+            {"externalId": "f5", "position": {"wkt": "POINT(5 6)"}, "temperature": "hot"},
+        ]
+        report = TEST_API.upsert_features_bulk("my_type", features, chunk_size=2, validate=True)
+        assert report.upserted_count == 2
+        assert report.failed_count == 0
+        assert sorted((r.external_id, r.reason) for r in report.rejected) == [
+            ("f2", "property 'volume': expected a LONG, got str"),
+            ("f3", "missing required property 'position'"),
+            ("f5", "property 'temperature': expected a DOUBLE, got str"),
+        ]
+        # The chunk with only rejected features is not sent
+        assert sorted(mock_upsert_features) == [("f1",), ("f4",)]
+
+
+class TestCogniteDomain:
+    @pytest.fixture
+    def mock_list_feature_types(self, rsps):
+        def list_feature_types(request):
+            domain = request.headers.get("x-cognite-domain")
+            return 200, {}, json.dumps({"items": [{"externalId": str(domain), "properties": {}, "searchSpec": {}}]})
+
+        rsps.add_callback(
+            rsps.POST,
+            TEST_API._get_base_url_with_base_path() + "/geospatial/featuretypes/list",
+            callback=list_feature_types,
+        )
+        yield rsps
+
+    @pytest.fixture
+    def api(self):
+        return CogniteClient().geospatial
+
+    def test_inherited_methods_are_wrapped_once(self):
+        delete_features = ExperimentalGeospatialAPI.delete_features
+        CogniteClient()
+        assert ExperimentalGeospatialAPI.delete_features is delete_features
+        assert delete_features.__wrapped__ is GeospatialAPI.delete_features
+        assert ExperimentalGeospatialAPI.list_coordinate_reference_systems is (
+            GeospatialAPI.list_coordinate_reference_systems
+        )
+
+    def test_domain_header_does_not_leak_into_config(self, api, mock_list_feature_types):
+        api.set_current_cognite_domain("my_domain")
+        assert api.list_feature_types()[0].external_id == "my_domain"
+        assert "x-cognite-domain" not in api._config.headers
+        api.set_current_cognite_domain(None)
+        assert api.list_feature_types()[0].external_id == "None"
+
+    def test_scopes_are_thread_local(self, api, mock_list_feature_types):
+        api.set_current_cognite_domain("default")
+        barrier = threading.Barrier(4)
+
+        def list_in_domain(domain):
+            with api.cognite_domain_scope(domain):
+                barrier.wait()
+                return api.list_feature_types()[0].external_id, api.get_current_cognite_domain()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(list_in_domain, ["a", "b", "c", "d"]))
+        assert results == [(domain, domain) for domain in "abcd"]
+        assert api.list_feature_types()[0].external_id == "default"
+
+    def test_domain_is_used_by_worker_threads(self, api, mock_upsert_features, rsps):
+        with api.cognite_domain_scope("my_domain"):
+            report = api.upsert_features_bulk("my_type", [Feature(external_id=f"f{i}") for i in range(6)], chunk_size=1)
+        assert report.upserted_count == 6
+        upserts = [call for call in rsps.calls if call.request.url.endswith("/upsert")]
+        assert {call.request.headers["x-cognite-domain"] for call in upserts} == {"my_domain"}
+
+    @pytest.mark.parametrize("as_generator", [False, True])
+    def test_upsert_features_chunks_use_the_scope(self, api, mock_upsert_features, rsps, as_generator):
+        features = [Feature(external_id=f"f{i}") for i in range(5)]
+        with api.cognite_domain_scope("my_domain"):
+            res = api.upsert_features("my_type", iter(features) if as_generator else features, chunk_size=2)
+        assert len(res) == 5
+        upserts = [call for call in rsps.calls if call.request.url.endswith("/upsert")]
+        assert len(upserts) == 3
+        assert [call.request.headers.get("x-cognite-domain") for call in upserts] == ["my_domain"] * 3
+
+
+class TestAsyncGeospatial:
+    def test_compute(self, rsps):
+        rsps.add(
+            rsps.POST,
+            TEST_API._get_base_url_with_base_path() + "/geospatial/compute",
+            status=200,
+            json={"items": [{"result": 42}]},
+        )
+        res = asyncio.run(COGNITE_CLIENT.geospatial_async.compute(output={"result": {"value": 42}}))
+        assert res.dump() == [{"result": 42}]
+
+    def test_stream_features(self, mock_stream_features):
+        async def collect():
+            stream = COGNITE_CLIENT.geospatial_async.stream_features("my_type", filter={}, batch_size=2)
+            return [feature.external_id async for feature in stream]
+
+        assert asyncio.run(collect()) == ["f1", "f2", "f3"]
+
+    def test_upsert_features_from_async_generator(self, mock_upsert_features):
+        async def features():
+            for i in range(7):
+                yield Feature(external_id=f"f{i}")
+
+        res = asyncio.run(
+            COGNITE_CLIENT.geospatial_async.upsert_features("my_type", features(), chunk_size=2, max_concurrency=2)
+        )
+        assert sorted(f.external_id for f in res) == [f"f{i}" for i in range(7)]
+        assert sorted(mock_upsert_features) == [("f0", "f1"), ("f2", "f3"), ("f4", "f5"), ("f6",)]
+
+    def test_upsert_features_keeps_input_order(self, rsps):
+        last_chunk_done = threading.Event()
+
+        def upsert(request):
+            items = json.loads(gzip.decompress(request.body))["items"]
+            # The first chunk completes after the last one
+            if items[0]["externalId"] == "f0":
+                assert last_chunk_done.wait(5)
+            if items[-1]["externalId"] == "f5":
+                last_chunk_done.set()
+            return 200, {}, json.dumps({"items": items})
+
+        rsps.add_callback(
+            rsps.POST,
+            TEST_API._get_base_url_with_base_path() + "/geospatial/featuretypes/my_type/features/upsert",
+            upsert,
+        )
+        features = [Feature(external_id=f"f{i}") for i in range(6)]
+        res = asyncio.run(
+            COGNITE_CLIENT.geospatial_async.upsert_features("my_type", features, chunk_size=2, max_concurrency=3)
+        )
+        assert [feature.external_id for feature in res] == [f"f{i}" for i in range(6)]
+
+    def test_upsert_feature_and_failures(self, mock_upsert_features):
+        api = COGNITE_CLIENT.geospatial_async
+        assert asyncio.run(api.upsert_features("my_type", Feature(external_id="f1"))).external_id == "f1"
+        with pytest.raises(CogniteAPIError, match="Invalid feature"):
+            asyncio.run(api.upsert_features("my_type", [Feature(external_id="bad")]))
+
+    def test_domain_scope_is_task_local(self, mock_upsert_features, rsps):
+        api = COGNITE_CLIENT.geospatial
+
+        async def upsert_in_domain(domain):
+            with api.cognite_domain_scope(domain):
+                await asyncio.sleep(0)
+                await COGNITE_CLIENT.geospatial_async.upsert_features("my_type", [Feature(external_id=domain)])
+
+        async def upsert_all():
+            await asyncio.gather(*(upsert_in_domain(domain) for domain in ("a", "b", "c")))
+
+        asyncio.run(upsert_all())
+        headers = {
+            json.loads(gzip.decompress(call.request.body))["items"][0]["externalId"]: call.request.headers.get(
+                "x-cognite-domain"
+            )
+            for call in rsps.calls
+            if call.request.url.endswith("/upsert")
+        }
+        assert headers == {"a": "a", "b": "b", "c": "c"}
+
+
+@pytest.fixture
+def mock_compute(rsps):
+    def compute(request):
+        body = json.loads(gzip.decompress(request.body))
+        if "binaryOutput" in body:
+            return 200, {"Content-Type": "image/tiff"}, b"II*\x00" + json.dumps(body).encode()
+        return 200, {"Content-Type": "application/json"}, json.dumps({"items": [{"body": body}]})
+
+    rsps.add_callback(rsps.POST, TEST_API._get_base_url_with_base_path() + "/geospatial/compute", callback=compute)
+    yield rsps
+
+
+def compute_calls(rsps):
+    return [call for call in rsps.calls if call.request.url.endswith("/compute")]
+
+
+class TestComputeCache:
+    @pytest.fixture
+    def api(self):
+        api = CogniteClient().geospatial
+        yield api
+        api.disable_compute_cache()
+
+    def test_identical_bodies_hit_the_cache(self, api, mock_compute):
+        cache = api.enable_compute_cache()
+        first = api.compute(output={"a": {"stArea": {"geometry": {"ref": "g"}}}, "b": 1})
+        second = api.compute(output={"b": 1, "a": {"stArea": {"geometry": {"ref": "g"}}}})
+        assert first.dump() == second.dump()
+        assert first is not second
+        assert len(compute_calls(mock_compute)) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_results_are_not_shared(self, api, mock_compute):
+        api.enable_compute_cache()
+        for _ in range(2):
+            res = api.compute(output={"x": {"value": 1}})
+            assert res[0].body["output"]["x"] == {"value": 1}
+            res[0].body["output"]["x"]["value"] = 2
+        assert len(compute_calls(mock_compute)) == 1
+
+    def test_domain_is_part_of_the_key(self, api, mock_compute):
+        api.enable_compute_cache()
+        with api.cognite_domain_scope("a"):
+            api.compute(output={"x": 1})
+        with api.cognite_domain_scope("b"):
+            api.compute(output={"x": 1})
+        assert len(compute_calls(mock_compute)) == 2
+
+    def test_into_feature_type_is_not_cached(self, api, mock_compute):
+        cache = api.enable_compute_cache()
+        for _ in range(2):
+            assert api.compute(from_feature_type="a", output={"x": 1}, into_feature_type="b") is None
+        assert len(compute_calls(mock_compute)) == 2
+        assert len(cache) == 0
+
+    def test_invalidate_by_feature_type(self, api, mock_compute):
+        api.enable_compute_cache()
+        api.compute(from_feature_type="wells", output={"x": 1})
+        api.compute(left_joins=[{"featureType": "pipes"}], output={"x": 1})
+        assert api.invalidate_compute_cache("wells") == 1
+        api.compute(from_feature_type="wells", output={"x": 1})
+        api.compute(left_joins=[{"featureType": "pipes"}], output={"x": 1})
+        assert len(compute_calls(mock_compute)) == 3
+
+    def test_ttl_and_byte_cap(self, api, mock_compute, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("cognite.experimental._api.geospatial_cache.time.time", lambda: now[0])
+        cache = api.enable_compute_cache(ttl=10, max_bytes=100)
+        for x in range(3):
+            api.compute(output={"x": x})
+        assert cache.size_bytes <= 100
+        assert len(cache) < 3
+        api.compute(output={"x": 2})
+        assert len(compute_calls(mock_compute)) == 3
+        now[0] += 11
+        api.compute(output={"x": 2})
+        assert len(compute_calls(mock_compute)) == 4
+
+    def test_binary_results_persist_on_disk(self, api, mock_compute, tmp_path):
+        binary_output = {"stAsGeotiff": {"raster": {"property": "rast"}}}
+        api.enable_compute_cache(directory=tmp_path)
+        res = api.compute(from_feature_type="rasters", binary_output=binary_output)
+        assert res.startswith(b"II*\x00")
+        assert len(list(tmp_path.glob("*.tiff"))) == 1
+
+        other = CogniteClient().geospatial
+        cache = other.enable_compute_cache(directory=tmp_path)
+        assert other.compute(from_feature_type="rasters", binary_output=binary_output) == res
+        assert len(compute_calls(mock_compute)) == 1
+        assert other.invalidate_compute_cache("rasters") == 1
+        assert list(tmp_path.iterdir()) == []
+        assert len(cache) == 0
+
+
+@pytest.fixture
+def mock_compute_resolving_refs(rsps):
+    # Evaluates the output by substituting the references to sub computes
+    def resolve(expression, sub_computes):
+        if isinstance(expression, dict):
+            if set(expression) == {"ref"}:
+                return resolve(sub_computes[expression["ref"]], sub_computes)
+            return {key: resolve(value, sub_computes) for key, value in expression.items()}
+        return expression
+
+    def compute(request):
+        body = json.loads(gzip.decompress(request.body))
+        sub_computes = body.get("subComputes", {})
+        item = {name: resolve(expression, sub_computes) for name, expression in body["output"].items()}
+        return 200, {"Content-Type": "application/json"}, json.dumps({"items": [item]})
+
+    rsps.add_callback(rsps.POST, TEST_API._get_base_url_with_base_path() + "/geospatial/compute", callback=compute)
+    yield rsps
+
+
+class TestComputeBatch:
+    def test_results_are_in_input_order(self, mock_compute_resolving_refs):
+        points = [f"SRID=4326;POINT({i} {i})" for i in range(25)]
+        res = TEST_API.compute_batch(
+            [{"stTransform": {"geometry": {"ref": "point"}, "srid": {"ref": "srid"}}} for _ in points],
+            sub_computes=[{"point": {"ewkt": point}} for point in points],
+            shared_sub_computes={"srid": 3857},
+            batch_size=10,
+        )
+        assert res == [{"stTransform": {"geometry": {"ewkt": point}, "srid": 3857}} for point in points]
+        assert len(compute_calls(mock_compute_resolving_refs)) == 3
+
+    def test_sub_computes_referencing_each_other(self, mock_compute_resolving_refs):
+        res = TEST_API.compute_batch(
+            [{"stArea": {"ref": "b"}}, {"stArea": {"ref": "b"}}],
+            sub_computes=[{"a": 1, "b": {"stBuffer": {"ref": "a"}}}, {"a": 2, "b": {"stBuffer": {"ref": "a"}}}],
+        )
+        assert res == [{"stArea": {"stBuffer": 1}}, {"stArea": {"stBuffer": 2}}]
+        (call,) = compute_calls(mock_compute_resolving_refs)
+        assert json.loads(gzip.decompress(call.request.body))["subComputes"] == {
+            "s0_a": 1,
+            "s0_b": {"stBuffer": {"ref": "s0_a"}},
+            "s1_a": 2,
+            "s1_b": {"stBuffer": {"ref": "s1_a"}},
+        }
+
+    def test_mismatched_sub_computes(self):
+        with pytest.raises(ValueError, match="one item per output"):
+            TEST_API.compute_batch([{"x": 1}], sub_computes=[])
+
+
+GEOTIFF_OUTPUT = {"stAsGeotiff": {"raster": {"property": "rast"}}}
+
+
+class TestComputeBinaryOutputFile:
+    def test_stream_to_path(self, mock_compute, tmp_path):
+        path = tmp_path / "raster.tiff"
+        res = TEST_API.compute(
+            from_feature_type="rasters", binary_output=GEOTIFF_OUTPUT, binary_output_file=path, read_chunk_size=7
+        )
+        assert res is None
+        content = path.read_bytes()
+        assert content.startswith(b"II*\x00")
+        assert json.loads(content[4:])["binaryOutput"] == GEOTIFF_OUTPUT
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_stream_to_buffer(self, mock_compute):
+        buffer = io.BytesIO()
+        assert TEST_API.compute(binary_output=GEOTIFF_OUTPUT, binary_output_file=buffer) is None
+        assert buffer.getvalue() == TEST_API.compute(binary_output=GEOTIFF_OUTPUT)
+
+    def test_requires_binary_output(self):
+        with pytest.raises(ValueError, match="binary_output"):
+            TEST_API.compute(output={"x": 1}, binary_output_file=io.BytesIO())
+
+
+class TestComputeColumnar:
+    @pytest.fixture
+    def mock_group_by(self, rsps):
+        items = [
+            {"tagName": f"t{i}", "myCount": i, "mean": i / 2 if i % 2 else None, "centroid": {"wkt": f"POINT({i} 0)"}}
+            for i in range(5)
+        ]
+        rsps.add(
+            rsps.POST,
+            TEST_API._get_base_url_with_base_path() + "/geospatial/compute",
+            status=200,
+            json={"items": items},
+        )
+        yield rsps
+
+    def test_columns(self, mock_group_by):
+        res = TEST_API.compute(from_feature_type="a", output={}, columnar=True)
+        assert isinstance(res, ComputedColumns)
+        assert len(res) == 5
+        assert res.keys() == ["tag_name", "my_count", "mean", "centroid"]
+        assert res["my_count"].dtype == np.int64
+        assert res["mean"].dtype == np.float64
+        assert np.isnan(res["mean"][0])
+        assert res["centroid"][2] == "POINT(2 0)"
+
+    def test_to_pandas_does_not_copy(self, mock_group_by):
+        res = TEST_API.compute(from_feature_type="a", output={}, columnar=True)
+        df = res.to_pandas()
+        assert list(df.columns) == res.keys()
+        assert np.shares_memory(df["my_count"].to_numpy(), res["my_count"])
+
+    def test_items_use_the_same_names(self, mock_group_by):
+        (item, *_) = TEST_API.compute(from_feature_type="a", output={})
+        assert item.tag_name == "t0"
+        assert item.my_count == 0
+
+
+class TestComputeTemplate:
+    @pytest.fixture
+    def api(self):
+        api = CogniteClient().geospatial
+        yield api
+        api.disable_compute_cache()
+
+    def test_same_body_as_compute(self, api, mock_compute):
+        query = dict(
+            from_feature_type="wells",
+            filter={"and": [{"equals": {"property": "tag", "value": "SWE"}}, {"range": {"property": "depth"}}]},
+            group_by=[{"property": "tag"}],
+            order_by=[ComputeOrder({"property": "tag"}, "DESC")],
+            output={"tag": {"property": "tag"}, "count": {"count": {"property": "tag"}}},
+        )
+        template = api.compile_compute(
+            **{**query, "filter": {"equals": {"property": "tag", "value": ComputeParameter("tag")}}}
+        )
+        (compiled,) = template(tag="SWE")
+        (built,) = api.compute(**{**query, "filter": {"equals": {"property": "tag", "value": "SWE"}}})
+        assert compiled.body == built.body
+
+    def test_parameters_are_json_encoded(self, api, mock_compute):
+        template = api.compile_compute(
+            sub_computes={"g": {"ewkt": ComputeParameter("geometry")}},
+            output={"x": ComputeParameter("x"), "y": [ComputeParameter("x"), 1]},
+        )
+        assert template.parameters == {"geometry", "x"}
+        value = {"nested": ['quote " and \\u0000', np.int64(2)]}
+        (item,) = template(geometry="SRID=4326;POINT(1 1)", x=value)
+        assert item.body == {
+            "subComputes": {"g": {"ewkt": "SRID=4326;POINT(1 1)"}},
+            "output": {"x": {"nested": ['quote " and \\u0000', 2]}, "y": [{"nested": ['quote " and \\u0000', 2]}, 1]},
+        }
+
+    def test_parameters_must_match(self, api):
+        template = api.compile_compute(output={"x": ComputeParameter("x")})
+        with pytest.raises(ValueError, match=r"missing: \['x'\], unknown: \['y'\]"):
+            template(y=1)
+
+    def test_sent_to_the_current_domain(self, api, mock_compute):
+        template = api.compile_compute(output={"x": ComputeParameter("x")})
+        with api.cognite_domain_scope("d1"):
+            template(x=1)
+        template(x=2)
+        domains = [call.request.headers.get(api.X_COGNITE_DOMAIN) for call in compute_calls(mock_compute)]
+        assert domains == ["d1", None]
+
+    def test_cached(self, api, mock_compute):
+        cache = api.enable_compute_cache()
+        template = api.compile_compute(from_feature_type="wells", output={"x": ComputeParameter("x")})
+        for x in [1, 2, 1]:
+            template(x=x)
+        assert len(compute_calls(mock_compute)) == 2
+        assert cache.hits == 1
+        assert api.invalidate_compute_cache("wells") == 2
+
+
+class TestTaskWaiter:
+    @pytest.fixture
+    def mock_tasks(self, rsps):
+        # Task "t{i}" is done at the i-th poll, "t3" fails
+        polls = []
+
+        def get_tasks(request):
+            external_ids = [item["externalId"] for item in json.loads(gzip.decompress(request.body))["items"]]
+            polls.append(external_ids)
+            items = [
+                {
+                    "externalId": external_id,
+                    "state": ("FAILED" if external_id == "t3" else "SUCCEEDED")
+                    if int(external_id[1:]) <= len(polls)
+                    else "RUNNING",
+                }
+                for external_id in external_ids
+            ]
+            return 200, {}, json.dumps({"items": items})
+
+        rsps.add_callback(
+            rsps.POST, TEST_API._get_base_url_with_base_path() + "/geospatial/tasks/byids", callback=get_tasks
+        )
+        yield polls
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("cognite.experimental._api.geospatial_tasks.time.sleep", sleeps.append)
+        yield sleeps
+
+    def test_as_completed(self, mock_tasks, sleeps):
+        waiter = TEST_API.task_waiter(["t3", "t1", "t2", GeospatialTask(external_id="t1")])
+        done = [(task.external_id, task.state) for task in waiter]
+        assert done == [("t1", "SUCCEEDED"), ("t2", "SUCCEEDED"), ("t3", "FAILED")]
+        # One request per poll, for the pending tasks only
+        assert mock_tasks == [["t3", "t1", "t2"], ["t3", "t2"], ["t3"]]
+        assert waiter.pending == []
+
+    def test_backoff_with_jitter(self, mock_tasks, sleeps):
+        TEST_API.task_waiter([f"t{i}" for i in range(1, 7)], poll_interval=1, max_poll_interval=4).wait_all()
+        assert len(sleeps) == 5
+        for delay, upper in zip(sleeps, [1, 2, 4, 4, 4]):
+            assert upper / 2 <= delay <= upper
+
+    def test_wait_all_keeps_the_order(self, mock_tasks, sleeps):
+        tasks = TEST_API.task_waiter(["t2", "t1"]).wait_all()
+        assert isinstance(tasks, GeospatialTaskList)
+        assert [task.external_id for task in tasks] == ["t2", "t1"]
+
+    def test_timeout(self, mock_tasks, monkeypatch):
+        monkeypatch.setattr("cognite.experimental._api.geospatial_tasks.time.sleep", lambda _: None)
+        waiter = TEST_API.task_waiter(["t1", "t9"])
+        with pytest.raises(TimeoutError, match=r"1 geospatial task\(s\) still pending: \['t9'\]"):
+            waiter.wait_all(timeout=0)
+        assert [task.external_id for task in waiter.done] == ["t1"]
+
+
+def decode_protobuf(data):
+    """The (field, value) pairs of a protobuf message, with length-delimited values as bytes."""
+    fields, position = [], 0
+
+    def varint():
+        nonlocal position
+        value = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                return value
+
+    while position < len(data):
+        key = varint()
+        if key & 7 == 0:
+            fields.append((key >> 3, varint()))
+        elif key & 7 == 1:
+            fields.append((key >> 3, data[position : position + 8]))
+            position += 8
+        else:
+            length = varint()
+            fields.append((key >> 3, data[position : position + length]))
+            position += length
+    return fields
+
+
+class TestVectorTiler:
+    MAPPINGS = MvpMappingsDefinition(
+        external_id="wells",
+        mappings=[
+            {
+                "featureTypeExternalId": "my_type",
+                "levels": [0, 1],
+                "geometryProperty": "position",
+                "featureProperties": ["volume", "tag"],
+            },
+        ],
+    )
+
+    def test_parse_wkt(self):
+        assert parse_wkt("SRID=4326;POINT Z(1 2 3)") == [(POINT, [[1, 2]])]
+        assert parse_wkt("MULTIPOINT((0 0),(1 1))") == parse_wkt("MULTIPOINT(0 0, 1 1)") == [(POINT, [[0, 0], [1, 1]])]
+        assert parse_wkt("POLYGON((0 0,0 1,1 1,0 0))") == [(POLYGON, [[[[0, 0], [0, 1], [1, 1], [0, 0]]]])]
+        assert parse_wkt("GEOMETRYCOLLECTION(POINT(1 2),LINESTRING(0 0,1e1 1))") == [
+            (POINT, [[1, 2]]),
+            (LINESTRING, [[[0, 0], [10, 1]]]),
+        ]
+        assert parse_wkt("LINESTRING EMPTY") == []
+
+    def test_encode_geometry(self):
+        # The examples of the vector tile specification
+        assert encode_geometry(POINT, [(25, 17)]) == [9, 50, 34]
+        assert encode_geometry(LINESTRING, [[(2, 2), (2, 10), (10, 10)]]) == [9, 4, 4, 18, 0, 16, 16, 0]
+        assert encode_geometry(POLYGON, [[[(3, 6), (8, 12), (20, 34)]]]) == [9, 6, 12, 18, 10, 12, 24, 44, 15]
+
+    def test_clip(self):
+        assert clip_line([(-10, 5), (5, 5), (5, 20), (20, 20)], 0, 10) == [[(0, 5), (5, 5), (5, 10)]]
+        assert clip_line([(1, 1), (20, 1), (20, 2), (2, 2)], 0, 10) == [[(1, 1), (10, 1)], [(10, 2), (2, 2)]]
+        assert sorted(clip_ring([(-5, -5), (15, -5), (15, 15), (-5, 15)], 0, 10)) == [
+            (0, 0),
+            (0, 10),
+            (10, 0),
+            (10, 10),
+        ]
+
+    def test_write_mbtiles(self, mock_stream_features, tmp_path):
+        path = tmp_path / "wells.mbtiles"
+        # Without a buffer, the points near the equator and the meridian don't spill into the neighbouring tiles
+        assert TEST_API.write_mbtiles(self.MAPPINGS, path, buffer=0, max_workers=2) == 2
+        requests = [call.request for call in mock_stream_features.calls if "search-streaming" in call.request.url]
+        (request,) = requests
+        assert json.loads(gzip.decompress(request.body))["output"]["properties"] == {
+            "volume": {},
+            "tag": {},
+            "position": {"srid": 4326},
+        }
+
+        with sqlite3.connect(path) as connection:
+            metadata = dict(connection.execute("SELECT name, value FROM metadata"))
+            tiles = {row[:3]: row[3] for row in connection.execute("SELECT * FROM tiles")}
+        assert metadata["format"] == "pbf"
+        assert metadata["bounds"] == "1.000000,2.000000,5.000000,6.000000"
+        assert json.loads(metadata["json"])["vector_layers"] == [
+            {"id": "my_type", "fields": {"volume": "Number", "tag": "String"}, "minzoom": 0, "maxzoom": 1}
+        ]
+        # All points are in the north east quarter, which is row 1 in the TMS scheme of MBTiles
+        assert set(tiles) == {(0, 0, 0), (1, 1, 1)}
+
+        ((field, layer),) = decode_protobuf(gzip.decompress(tiles[(1, 1, 1)]))
+        assert field == 3
+        layer = decode_protobuf(layer)
+        assert (1, b"my_type") in layer
+        assert [value for field, value in layer if field == 3] == [b"volume", b"tag"]
+        features = [decode_protobuf(value) for field, value in layer if field == 2]
+        assert len(features) == 3
+        assert all((3, POINT) in feature for feature in features)
+
+    def test_fragments_are_kept_on_disk(self):
+        with VectorTiler(self.MAPPINGS.mappings, buffer=0, max_workers=1) as tiler:
+            tiler.add_features("my_type", STREAMED_FEATURES[:2])
+            tiler.add_features("my_type", STREAMED_FEATURES[2:])
+            staging_path = tiler._staging_path
+            assert staging_path.stat().st_size > 0
+            assert len(tiler) == 2
+            assert [tile[:3] for tile in tiler.tiles()] == [(0, 0, 0), (1, 1, 0)]
+        assert not staging_path.exists()
+
+    def test_unmapped_feature_type(self):
+        with VectorTiler(self.MAPPINGS.mappings, max_workers=1) as tiler:
+            with pytest.raises(ValueError, match="No mapping for the feature type 'other'"):
+                tiler.add_features("other", [])
+
+
+class TestFeatureTypeCache:
+    @pytest.fixture
+    def api(self):
+        api = CogniteClient().geospatial
+        yield api
+        api.disable_feature_type_cache()
+
+    @pytest.fixture
+    def feature_types(self, rsps):
+        # The feature types of the service, by external id
+        feature_types = {
+            external_id: {"externalId": external_id, "properties": {}, "searchSpec": {}, "lastUpdatedTime": 1}
+            for external_id in ["a", "b", "c"]
+        }
+        base_url = TEST_API._get_base_url_with_base_path() + "/geospatial/featuretypes"
+
+        def by_ids(request):
+            items = json.loads(gzip.decompress(request.body))["items"]
+            return 200, {}, json.dumps({"items": [feature_types[item["externalId"]] for item in items]})
+
+        def update(request):
+            items = json.loads(gzip.decompress(request.body))["items"]
+            for item in items:
+                feature_types[item["externalId"]]["lastUpdatedTime"] += 1
+            return 200, {}, json.dumps({"items": [feature_types[item["externalId"]] for item in items]})
+
+        rsps.add_callback(rsps.POST, base_url + "/byids", callback=by_ids)
+        rsps.add_callback(rsps.POST, base_url + "/update", callback=update)
+        rsps.add_callback(
+            rsps.POST,
+            base_url + "/list",
+            callback=lambda _: (200, {}, json.dumps({"items": list(feature_types.values())})),
+        )
+        rsps.add(rsps.POST, base_url + "/delete", status=200, json={})
+        yield feature_types
+
+    @staticmethod
+    def calls(rsps, endpoint):
+        return [call for call in rsps.calls if call.request.url.endswith(f"/featuretypes/{endpoint}")]
+
+    def test_retrieve_once(self, api, rsps, feature_types):
+        cache = api.enable_feature_type_cache()
+        first = api.retrieve_feature_types(["a", "b"])
+        assert api.retrieve_feature_types("a") == first[0]
+        assert [it.external_id for it in api.retrieve_feature_types(["b", "c", "a"])] == ["b", "c", "a"]
+        # Only the feature types missing from the cache are retrieved
+        requested = [json.loads(gzip.decompress(call.request.body))["items"] for call in self.calls(rsps, "byids")]
+        assert requested == [[{"externalId": "a"}, {"externalId": "b"}], [{"externalId": "c"}]]
+        assert (cache.hits, cache.misses) == (3, 3)
+
+    def test_listing(self, api, rsps, feature_types):
+        api.enable_feature_type_cache()
+        assert len(api.list_feature_types()) == 3
+        assert len(api.list_feature_types()) == 3
+        api.retrieve_feature_types(["a", "c"])
+        assert len(self.calls(rsps, "list")) == 1
+        assert self.calls(rsps, "byids") == []
+
+    def test_revalidation(self, api, rsps, feature_types, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("cognite.experimental._api.geospatial_feature_types.time.time", lambda: now[0])
+        cache = api.enable_feature_type_cache(ttl=60)
+        a, b = api.retrieve_feature_types(["a", "b"])
+        feature_types["b"]["lastUpdatedTime"] = 2
+        now[0] += 61
+        a_again, b_again = api.retrieve_feature_types(["a", "b"])
+        assert a_again == a
+        assert b_again.last_updated_time == 2
+        assert cache.revalidations == 1
+        assert len(self.calls(rsps, "byids")) == 2
+
+    def test_returns_copies(self, api, rsps, feature_types):
+        api.enable_feature_type_cache()
+        retrieved = api.retrieve_feature_types("a")
+        retrieved.properties["added"] = {"type": "STRING"}
+        listed = api.list_feature_types()
+        listed[0].properties["added"] = {"type": "STRING"}
+        for feature_type in [api.retrieve_feature_types("a"), *api.list_feature_types()]:
+            assert feature_type.properties == {}
+        assert len(self.calls(rsps, "byids")) == 1
+
+    def test_domains_are_separate(self, api, rsps, feature_types):
+        api.enable_feature_type_cache()
+        for domain in ["d1", "d2", "d1"]:
+            with api.cognite_domain_scope(domain):
+                api.retrieve_feature_types("a")
+        assert len(self.calls(rsps, "byids")) == 2
+
+    def test_writes_update_the_cache(self, api, rsps, feature_types):
+        api.enable_feature_type_cache()
+        api.list_feature_types()
+        (patched,) = api.patch_feature_types(FeatureTypePatch(external_id="a", property_patches=Patches(add={})))
+        assert api.retrieve_feature_types("a").last_updated_time == patched.last_updated_time == 2
+        api.delete_feature_types("b")
+        api.retrieve_feature_types("b")
+        api.list_feature_types()
+        assert len(self.calls(rsps, "byids")) == 1
+        assert len(self.calls(rsps, "list")) == 2
+
+    def test_invalidate(self, api, rsps, feature_types):
+        api.enable_feature_type_cache()
+        api.retrieve_feature_types(["a", "b"])
+        assert api.invalidate_feature_type_cache("a") == 1
+        api.retrieve_feature_types(["a", "b"])
+        assert api.invalidate_feature_type_cache() == 2
+        assert len(self.calls(rsps, "byids")) == 2
+
+
+def square(x, y, size=1):
+    return {"wkt": f"POLYGON(({x} {y},{x + size} {y},{x + size} {y + size},{x} {y + size},{x} {y}))"}
+
+
+class TestFeatureIndex:
+    @pytest.fixture
+    def mock_stream_fields(self, rsps):
+        url_pattern = re.compile(
+            re.escape(TEST_API._get_base_url_with_base_path())
+            + r"/geospatial/featuretypes/fields/features/search-streaming"
+        )
+        fields = [{"externalId": f"f{i}", "outline": square(i * 2, 0), "lastUpdatedTime": 100 + i} for i in range(5)]
+
+        def stream(request):
+            if json.loads(gzip.decompress(request.body))["filter"]:
+                # The refresh streams the features updated since, a moved one and a new one
+                fields[:] = [
+                    {"externalId": "f4", "outline": square(8, 10), "lastUpdatedTime": 200},
+                    {"externalId": "f5", "outline": square(20, 0), "lastUpdatedTime": 201},
+                ]
+            return 200, {}, "\n".join(json.dumps(f) for f in fields)
+
+        rsps.add_callback(rsps.POST, url_pattern, callback=stream)
+        yield rsps
+
+    @staticmethod
+    def external_ids(features):
+        return sorted(feature.external_id for feature in features)
+
+    def test_nearest_matches_a_linear_scan(self):
+        rng = np.random.default_rng(42)
+        points = rng.uniform(0, 100, (500, 2))
+        index = FeatureIndex(
+            [Feature(external_id=i, location=f"POINT({x} {y})") for i, (x, y) in enumerate(points)], "location"
+        )
+        for x, y in rng.uniform(-20, 120, (20, 2)):
+            distances = np.hypot(points[:, 0] - x, points[:, 1] - y)
+            assert [f.external_id for f in index.nearest((x, y), k=10)] == np.argsort(distances)[:10].tolist()
+            within = np.argsort(distances)[: (distances <= 5).sum()][:10].tolist()
+            assert [f.external_id for f in index.nearest((x, y), k=10, max_distance=5)] == within
+        assert len(index.nearest((0, 0), k=1000)) == 500
+
+    def test_queries(self):
+        features = [Feature(external_id=f"f{i}", outline=square(i * 2, 0)) for i in range(50)]
+        index = FeatureIndex([*features, Feature(external_id="empty", outline=None)], "outline", node_capacity=4)
+        assert len(index) == 51
+        assert self.external_ids(index.intersects((4.5, 0.5))) == ["f2"]
+        assert self.external_ids(index.intersects("POINT(5 5)")) == []
+        assert self.external_ids(index.within({"wkt": "SRID=4326;POLYGON((0 0,6.5 0,6.5 2,0 2,0 0))"})) == [
+            "f0",
+            "f1",
+            "f2",
+        ]
+        assert self.external_ids(index.query_bbox(3, 0, 4, 0)) == ["f1", "f2"]
+        assert [f.external_id for f in index.nearest({"type": "Point", "coordinates": [20.5, 3]}, k=3)] == [
+            "f10",
+            "f9",
+            "f11",
+        ]
+        assert index.nearest((20.5, 3), max_distance=1) == []
+
+    def test_refresh(self, mock_stream_fields):
+        index = TEST_API.build_feature_index("fields", "outline", properties={"name": {}})
+        assert index.high_water_mark == 104
+        assert self.external_ids(index.intersects((8.5, 0.5))) == ["f4"]
+        assert index.refresh() == 2
+        assert len(index) == 6
+        assert index.high_water_mark == 201
+        assert self.external_ids(index.intersects((8.5, 0.5))) == []
+        assert self.external_ids(index.intersects((8.5, 10.5))) == ["f4"]
+
+        first, refresh = (
+            json.loads(gzip.decompress(call.request.body))
+            for call in mock_stream_fields.calls
+            if "search-streaming" in call.request.url
+        )
+        assert first["filter"] == {}
+        assert first["output"]["properties"] == {"name": {}, "outline": {}, "lastUpdatedTime": {}}
+        assert refresh["filter"] == {"range": {"property": "lastUpdatedTime", "gte": 104}}
+
+
+class TestFeatureMirror:
+    @pytest.fixture
+    def wells(self):
+        return {
+            f"w{i}": {"externalId": f"w{i}", "location": {"wkt": f"POINT({i} 1)"}, "depth": i, "lastUpdatedTime": t}
+            for i, t in enumerate([100, 1100, 2100])
+        }
+
+    @pytest.fixture
+    def mock_stream_wells(self, rsps, wells):
+        url_pattern = re.compile(
+            re.escape(TEST_API._get_base_url_with_base_path())
+            + r"/geospatial/featuretypes/wells/features/search-streaming"
+        )
+
+        def stream(request):
+            search_filter = json.loads(gzip.decompress(request.body))["filter"]
+            since = search_filter.get("range", {}).get("gte", 0)
+            streamed = [well for well in wells.values() if well["lastUpdatedTime"] >= since]
+            return 200, {}, "\n".join(json.dumps(well) for well in streamed)
+
+        rsps.add_callback(rsps.POST, url_pattern, callback=stream)
+        yield rsps
+
+    @staticmethod
+    def filters(rsps):
+        return [
+            json.loads(gzip.decompress(call.request.body))["filter"]
+            for call in rsps.calls
+            if "search-streaming" in call.request.url
+        ]
+
+    def test_sync_transfers_deltas(self, mock_stream_wells, wells, tmp_path):
+        with TEST_API.feature_mirror(tmp_path / "mirror.sqlite") as mirror:
+            assert mirror.high_water_mark("wells") is None
+            assert mirror.sync("wells") == 3
+            assert mirror.high_water_mark("wells") == 2100
+
+            wells["w1"] = {**wells["w1"], "depth": 10, "lastUpdatedTime": 5000}
+            wells["w3"] = {"externalId": "w3", "location": {"wkt": "POINT(3 1)"}, "depth": 3, "lastUpdatedTime": 5000}
+            # w0 is older than the overlap, w2 is streamed again
+            assert mirror.sync("wells", overlap=1) == 3
+            assert mirror.high_water_mark("wells") == 5000
+            assert [(f.external_id, f.depth) for f in mirror.features("wells")] == [
+                ("w0", 0),
+                ("w1", 10),
+                ("w2", 2),
+                ("w3", 3),
+            ]
+            assert self.filters(mock_stream_wells) == [{}, {"range": {"property": "lastUpdatedTime", "gte": 1100}}]
+
+    def test_selection_change_copies_everything(self, mock_stream_wells, tmp_path):
+        with TEST_API.feature_mirror(tmp_path / "mirror.sqlite") as mirror:
+            mirror.sync("wells")
+            assert mirror.sync("wells", properties={"location": {}}) == 3
+            assert self.filters(mock_stream_wells) == [{}, {}]
+
+    def test_domains_are_separate(self, mock_stream_wells, tmp_path):
+        with TEST_API.feature_mirror(tmp_path / "mirror.sqlite") as mirror:
+            mirror.sync("wells")
+        with TEST_API.cognite_domain_scope("other"):
+            mirror = TEST_API.feature_mirror(tmp_path / "mirror.sqlite")
+        with mirror:
+            assert mirror.high_water_mark("wells") is None
+            assert list(mirror.features("wells")) == []
+
+    def test_prune(self, mock_stream_wells, wells, tmp_path):
+        with TEST_API.feature_mirror(tmp_path / "mirror.sqlite") as mirror:
+            mirror.sync("wells")
+            del wells["w0"]
+            assert mirror.prune("wells") == 1
+            assert [f.external_id for f in mirror.features("wells")] == ["w1", "w2"]
+
+    @pytest.mark.parametrize(
+        "spec, geometry_types, crs",
+        [
+            ({"type": "POLYGONZ", "srid": 3857}, ["Polygon Z"], {"id": {"authority": "EPSG", "code": 3857}}),
+            ({"type": "GEOMETRY", "srid": 4326}, [], {"id": {"authority": "EPSG", "code": 4326}}),
+            ({"type": "POINTM"}, [], None),
+        ],
+    )
+    def test_geoparquet_column(self, spec, geometry_types, crs):
+        assert geoparquet_column(spec) == {"encoding": "WKB", "geometry_types": geometry_types, "crs": crs}
+
+    @pytest.fixture
+    def mock_retrieve_wells(self, rsps):
+        properties = {"location": {"type": "POINT", "srid": 32631}, "depth": {"type": "LONG"}}
+        rsps.add(
+            rsps.POST,
+            TEST_API._get_base_url_with_base_path() + "/geospatial/featuretypes/byids",
+            status=200,
+            json={"items": [{"externalId": "wells", "properties": properties, "searchSpec": {}}]},
+        )
+        yield rsps
+
+    def test_to_geoparquet(self, mock_stream_wells, mock_retrieve_wells, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        shapely = pytest.importorskip("shapely")
+        with TEST_API.feature_mirror(tmp_path / "mirror.sqlite") as mirror:
+            mirror.sync("wells")
+            assert mirror.to_geoparquet("wells", tmp_path / "wells.parquet") == 3
+        table = pq.read_table(tmp_path / "wells.parquet")
+        geo = json.loads(table.schema.metadata[b"geo"])
+        assert geo["primary_column"] == "location"
+        assert geo["columns"] == {
+            "location": {
+                "encoding": "WKB",
+                "geometry_types": ["Point"],
+                "crs": {"id": {"authority": "EPSG", "code": 32631}},
+            }
+        }
+        assert table.column("depth").to_pylist() == [0, 1, 2]
+        assert shapely.from_wkb(table.column("location").to_pylist()[2]).equals(shapely.Point(2, 1))
+
+    def test_to_geoparquet_in_batches(self, mock_stream_wells, mock_retrieve_wells, wells, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        wells["w3"] = {"externalId": "w3", "depth": 2.5, "lastUpdatedTime": 100}
+        wells["w4"] = {"externalId": "w4", "lastUpdatedTime": 100}
+        with TEST_API.feature_mirror(tmp_path / "mirror.sqlite") as mirror:
+            mirror.sync("wells")
+            assert mirror.to_geoparquet("wells", tmp_path / "wells.parquet", batch_size=2) == 5
+        parquet_file = pq.ParquetFile(tmp_path / "wells.parquet")
+        assert parquet_file.metadata.num_row_groups == 3
+        table = parquet_file.read()
+        assert table.column("depth").to_pylist() == [0.0, 1.0, 2.0, 2.5, None]
+        assert table.column("location").to_pylist()[3:] == [None, None]
+        assert not (tmp_path / "wells.parquet.partial").exists()
+
+
+class TestCrsTransformation:
+    @pytest.fixture
+    def mock_compute_transform(self, rsps):
+        def compute(request):
+            body = json.loads(gzip.decompress(request.body))
+            item = {name: {"wkt": "POINT(7 7)"} for name in body["output"]}
+            return 200, {"Content-Type": "application/json"}, json.dumps({"items": [item]})
+
+        rsps.add_callback(rsps.POST, TEST_API._get_base_url_with_base_path() + "/geospatial/compute", callback=compute)
+        yield rsps
+
+    def test_transform_coordinates(self):
+        # On the central meridian of zone 31, the northing is the meridian arc scaled by 0.9996
+        np.testing.assert_allclose(
+            transform_coordinates([[3, 0], [3, 45], [10, 60]], 4326, 32631)[:2], [[500000, 0], [500000, 4982950.400]]
+        )
+        np.testing.assert_allclose(
+            transform_coordinates([[10, 60]], 4326, 32632), [[555776.267, 6651832.735]], atol=1e-3
+        )
+        np.testing.assert_allclose(
+            transform_coordinates([[2.353295, 48.850908, 35]], 4326, 3857), [[261967.601, 6249601.361, 35]], atol=1e-3
+        )
+        rng = np.random.default_rng(3)
+        # Around the central meridian of zones 1 and 60, across the antimeridian
+        points = np.column_stack([rng.uniform(-179.9, -171, 1000), rng.uniform(-80, 0, 1000)])
+        for srid in [3857, 32701, 32601, 32660]:
+            np.testing.assert_allclose(
+                transform_coordinates(transform_coordinates(points, 4326, srid), srid, 4326), points, atol=1e-9
+            )
+
+    def test_transform_geometries(self, mock_compute_transform):
+        res = TEST_API.transform_geometries(
+            [
+                "SRID=4326;POINT Z (3 45 10)",
+                {"wkt": "POINT(1 2)"},
+                {"ewkt": "SRID=23031;POINT(1 2)"},
+                {"wkt": "SRID=4326;LINESTRING(3 0,3 45)"},
+            ],
+            32631,
+        )
+        assert res[1:3] == [{"wkt": "POINT(1 2)"}, {"wkt": "POINT(7 7)"}]
+        assert res[0]["wkt"].startswith("POINT Z (500000 4982950.4")
+        assert res[0]["wkt"].endswith(" 10)")
+        assert res[3]["wkt"].startswith("LINESTRING (500000 0, 500000 4982950.4")
+        (call,) = (call for call in mock_compute_transform.calls if call.request.url.endswith("/compute"))
+        assert "SRID=23031;POINT(1 2)" in gzip.decompress(call.request.body).decode()
+
+    def test_upsert_features(self, mock_retrieve_feature_type, mock_upsert_features, rsps):
+        features = [
+            Feature(external_id="f1", position={"wkt": "SRID=3857;POINT(261967.601 6249601.361)"}),
+            Feature(external_id="f2", position={"wkt": "POINT(1 2)"}),
+        ]
+        res = TEST_API.upsert_features("my_type", features, local_crs_transformation=True)
+        x, y = (float(value) for value in res[0].position["wkt"][len("POINT (") : -1].split())
+        assert x == pytest.approx(2.353295) and y == pytest.approx(48.850908)
+        assert res[1].position == {"wkt": "POINT(1 2)"}
+        assert features[0].position == {"wkt": "SRID=3857;POINT(261967.601 6249601.361)"}
+        assert not [call for call in rsps.calls if call.request.url.endswith("/compute")]
+
+
+ARRAY_GEOMETRY_WKTS = [
+    "POINT (1 2)",
+    "POINT Z (1 2 3)",
+    "LINESTRING (0 0, 1 1.5, 2 2)",
+    "POLYGON ((0 0, 10 0, 10 10, 0 0), (1 1, 2 1, 2 2, 1 1))",
+    "MULTIPOINT ((1 2), (3 4))",
+    "MULTILINESTRING ((0 0, 1 1), (2 2, 3 3, 4 4))",
+    "MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)), ((5 5, 6 5, 6 6, 5 5), (5.1 5.1, 5.2 5.1, 5.2 5.2, 5.1 5.1)))",
+]
+
+
+class TestArrayGeometry:
+    @pytest.mark.parametrize("wkt", ARRAY_GEOMETRY_WKTS)
+    def test_wkt_and_geojson(self, wkt):
+        shapely = pytest.importorskip("shapely")
+        geometry = ArrayGeometry.from_wkt(wkt)
+        expected = shapely.from_wkt(wkt)
+        assert shapely.geometry.shape(geometry).equals_exact(expected, 0)
+        from_geojson = ArrayGeometry.from_geojson(json.loads(json.dumps(geometry.to_geojson())))
+        assert from_geojson.to_wkt() == wkt
+        assert [offset.tolist() for offset in from_geojson.offsets] == [offset.tolist() for offset in geometry.offsets]
+
+    def test_layout(self):
+        geometry = ArrayGeometry.from_wkt("SRID=3857;" + ARRAY_GEOMETRY_WKTS[-1])
+        assert geometry.geometry_type == "MultiPolygon"
+        assert geometry.srid == 3857
+        assert geometry.coordinates.shape == (12, 2)
+        assert [offset.tolist() for offset in geometry.offsets] == [[0, 1, 3], [0, 4, 8, 12]]
+        assert geometry.dump() == {"wkt": "SRID=3857;" + ARRAY_GEOMETRY_WKTS[-1]}
+        assert ArrayGeometry("Polygon", np.zeros((0, 2)), [[0]]).to_wkt() == "POLYGON EMPTY"
+        with pytest.raises(ValueError, match="A Polygon has 1 offset array"):
+            ArrayGeometry("Polygon", np.zeros((4, 2)))
+
+    def test_stream_features(self, mock_stream_features):
+        features = list(TEST_API.stream_features("my_type", filter={}, array_geometries=True))
+        assert isinstance(features[0].position, ArrayGeometry)
+        assert features[2].position.coordinates.tolist() == [[5, 6]]
+        with pytest.raises(ValueError, match="can't be combined with lazy"):
+            next(TEST_API.stream_features("my_type", filter={}, array_geometries=True, lazy=True))
+
+    def test_stream_unsupported_geometries(self, rsps):
+        url_pattern = re.compile(
+            re.escape(TEST_API._get_base_url_with_base_path())
+            + r"/geospatial/featuretypes/my_type/features/search-streaming"
+        )
+        positions = ["GEOMETRYCOLLECTION (POINT (1 2))", "POINT M (1 2 3)", "POINT (1 2)"]
+        streamed = [{"externalId": f"f{i}", "position": {"wkt": wkt}} for i, wkt in enumerate(positions)]
+        rsps.add(rsps.POST, url_pattern, status=200, body="\n".join(json.dumps(f) for f in streamed))
+        features = list(TEST_API.stream_features("my_type", filter={}, array_geometries=True))
+        assert [f.position for f in features[:2]] == [{"wkt": wkt} for wkt in positions[:2]]
+        assert features[2].position.coordinates.tolist() == [[1, 2]]
+
+    def test_upsert_features(self, mock_retrieve_feature_type, mock_upsert_features, rsps):
+        position = ArrayGeometry("Point", [[261967.601, 6249601.361]], srid=3857)
+        TEST_API.upsert_features("my_type", [Feature(external_id="f1", position=position)])
+        TEST_API.upsert_features(
+            "my_type", [Feature(external_id="f2", position=position)], local_crs_transformation=True
+        )
+        items = [
+            json.loads(gzip.decompress(call.request.body))["items"][0]
+            for call in rsps.calls
+            if call.request.url.endswith("/upsert")
+        ]
+        assert items[0]["position"] == {"wkt": "SRID=3857;POINT (261967.601 6249601.361)"}
+        assert items[1]["position"]["wkt"].startswith("SRID=4326;POINT (2.35329")
+        assert position.srid == 3857
+
+    def test_validation(self):
+        validator = FeatureValidator({"position": {"type": "POLYGON", "srid": 4326}})
+        assert (
+            validator.validate({"externalId": "a", "position": ArrayGeometry.from_wkt(ARRAY_GEOMETRY_WKTS[3])}) is None
+        )
+        assert validator.validate({"externalId": "a", "position": ArrayGeometry.from_wkt(ARRAY_GEOMETRY_WKTS[0])}) == (
+            "property 'position': expected a POLYGON geometry, got POINT"
+        )
+        assert "SRID 3857 does not match" in validator.validate(
+            {"externalId": "a", "position": ArrayGeometry.from_wkt("SRID=3857;" + ARRAY_GEOMETRY_WKTS[3])}
+        )